@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark HS256 token encode/decode throughput.
+
+Compares PyJWT's generic jwt.encode/jwt.decode against the HS256Codec fast
+path used by JWTHandler, using the same claims the auth service puts in an
+access token.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the services directory to the Python path
+services_dir = Path(__file__).resolve().parent.parent / "services"
+sys.path.insert(0, str(services_dir))
+
+import jwt
+
+from shared.authentication.hs256 import HS256Codec
+
+ITERATIONS = 50000
+WARMUP = 2000
+SECRET = "benchmark-secret-key-of-at-least-32-bytes"
+
+
+def build_claims() -> dict:
+    return {
+        "sub": "123e4567-e89b-12d3-a456-426614174000",
+        "email": "user@example.com",
+        "permissions": ["user:read", "user:write", "agent:read"],
+        "exp": int(time.time()) + 1800,
+        "type": "access",
+    }
+
+
+def measure(func, iterations: int) -> float:
+    """Return calls per second for a zero-argument callable."""
+    for _ in range(WARMUP):
+        func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    print(f"HS256 JWT benchmark ({ITERATIONS} operations per case)\n")
+
+    claims = build_claims()
+    codec = HS256Codec(SECRET)
+    token = codec.encode(claims)
+    assert jwt.decode(token, SECRET, algorithms=["HS256"]) == codec.decode(token)
+
+    results = {
+        ("encode", "pyjwt"): measure(lambda: jwt.encode(claims, SECRET, algorithm="HS256"), ITERATIONS),
+        ("encode", "codec"): measure(lambda: codec.encode(claims), ITERATIONS),
+        ("decode", "pyjwt"): measure(lambda: jwt.decode(token, SECRET, algorithms=["HS256"]), ITERATIONS),
+        ("decode", "codec"): measure(lambda: codec.decode(token), ITERATIONS),
+    }
+
+    for operation in ("encode", "decode"):
+        pyjwt = results[(operation, "pyjwt")]
+        codec_rate = results[(operation, "codec")]
+        print(f"   {operation}  pyjwt {pyjwt:10.0f} ops/s   codec {codec_rate:10.0f} ops/s   {codec_rate / pyjwt:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
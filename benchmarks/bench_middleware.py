@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request overhead of the auth-service middleware stack.
+
+Compares the legacy BaseHTTPMiddleware stack (RequestLoggingMiddleware,
+ErrorHandlingMiddleware, VersionNegotiationMiddleware) against the fused
+RequestContextMiddleware, using a bare app as the baseline. Requests are
+driven straight through the ASGI interface so no network or client overhead
+is included in the numbers.
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Add the services directory to the Python path
+services_dir = Path(__file__).resolve().parent.parent / "services"
+sys.path.insert(0, str(services_dir))
+
+from fastapi import FastAPI
+
+from shared.core.middleware import (
+    RequestLoggingMiddleware,
+    ErrorHandlingMiddleware,
+    RequestContextMiddleware,
+)
+from shared.core.versioning import VersionNegotiationMiddleware, APIVersion
+
+ITERATIONS = 5000
+WARMUP = 500
+
+
+def build_app(stack: str) -> FastAPI:
+    """Build a minimal app with the requested middleware stack."""
+    app = FastAPI()
+
+    @app.get("/v1/api/ping")
+    async def ping():
+        return {"success": True}
+
+    if stack == "legacy":
+        app.add_middleware(VersionNegotiationMiddleware, default_version=APIVersion.V1)
+        app.add_middleware(RequestLoggingMiddleware)
+        app.add_middleware(ErrorHandlingMiddleware)
+    elif stack == "fused":
+        app.add_middleware(RequestContextMiddleware, default_version=APIVersion.V1)
+
+    return app
+
+
+async def run_requests(app: FastAPI, iterations: int) -> float:
+    """Send `iterations` GET requests through the ASGI app and return elapsed seconds."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/v1/api/ping",
+        "raw_path": b"/v1/api/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+
+async def bench(stack: str) -> float:
+    """Return the mean per-request time in microseconds for a stack."""
+    app = build_app(stack)
+    await run_requests(app, WARMUP)
+    elapsed = await run_requests(app, ITERATIONS)
+    return elapsed / ITERATIONS * 1_000_000
+
+
+def main():
+    print(f"Middleware overhead benchmark ({ITERATIONS} requests per stack)\n")
+
+    results = {stack: asyncio.run(bench(stack)) for stack in ("none", "legacy", "fused")}
+    baseline = results["none"]
+
+    for stack, per_request in results.items():
+        overhead = per_request - baseline
+        print(f"   {stack:<8} {per_request:8.1f} us/request   overhead {overhead:7.1f} us")
+
+    legacy_overhead = results["legacy"] - baseline
+    fused_overhead = results["fused"] - baseline
+    if fused_overhead > 0:
+        print(f"\n   Fused middleware overhead is {legacy_overhead / fused_overhead:.1f}x lower than the legacy stack")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark user repository lookups.
+
+Compares the in-memory repository with the pooled SQL repository on the
+SQLite driver, issuing concurrent lookups by email and by ID the way
+concurrent logins and refreshes do, and prints the pool's wait and query
+latency metrics.
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the auth service and services directories to the Python path
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root / "services"))
+sys.path.insert(0, str(root / "services" / "auth-service" / "src"))
+
+from app.authentication.v1.authentication_models import User
+from app.authentication.v1.sql_repository import SQLUserRepository, create_schema
+from app.authentication.v1.user_repository import InMemoryUserRepository
+from shared.core.database import Database
+
+USERS = 10000
+LOOKUPS = 20000
+CONCURRENCY = 32
+
+
+def build_users():
+    now = datetime.utcnow()
+    return [
+        User(
+            id=f"user-{index}",
+            email=f"user{index}@example.com",
+            password_hash="$2b$12$" + "x" * 53,
+            first_name="Bench",
+            last_name=str(index),
+            permissions=["user:read"],
+            created_at=now
+        )
+        for index in range(USERS)
+    ]
+
+
+async def measure(repository) -> float:
+    """Return lookups per second, alternating email and ID lookups."""
+    async def worker(offset: int):
+        for index in range(offset, LOOKUPS, CONCURRENCY):
+            if index % 2:
+                await repository.get_by_email(f"USER{index % USERS}@example.com")
+            else:
+                await repository.get_by_id(f"user-{index % USERS}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(offset) for offset in range(CONCURRENCY)))
+    return LOOKUPS / (time.perf_counter() - start)
+
+
+async def run():
+    users = build_users()
+
+    memory = InMemoryUserRepository()
+    for user in users:
+        await memory.add(user)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Database(f"sqlite:///{directory}/bench.db", size=8)
+        await database.start()
+        await create_schema(database)
+        sql = SQLUserRepository(database)
+        for user in users:
+            await sql.add(user)
+
+        print(f"User repository benchmark ({USERS} users, {LOOKUPS} lookups, {CONCURRENCY} concurrent)\n")
+        print(f"   in-memory  {await measure(memory):10.0f} lookups/s")
+        print(f"   sqlite     {await measure(sql):10.0f} lookups/s\n")
+
+        stats = database.stats()
+        print(f"   pool wait      {stats['acquire_wait']}")
+        for name in ("user_by_email", "user_by_id"):
+            print(f"   {name:<14} {stats['queries'][name]}")
+        await database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -5,12 +5,23 @@ import httpx
 import json
 from typing import Dict, Any, List
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 
+from shared.core.compression import CompressionMiddleware
 from shared.utils.logger import setup_logger
 from shared.utils.config import config
 from .docs.docs_controller import router as docs_router
 from .health.health_controller import router as health_router
+from .identity.identity_controller import identity_controller, router as identity_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keeps the JWK set warm when verifying asymmetric tokens
+    await identity_controller.jwt_handler.start()
+    yield
+    await identity_controller.jwt_handler.stop()
 
 
 def create_app() -> FastAPI:
@@ -21,8 +32,10 @@ def create_app() -> FastAPI:
         description="Centralized API Gateway with unified Swagger documentation for all microservices",
         version=config.get("APP_VERSION", "1.0.0"),
         debug=config.is_debug(),
+        openapi_url="/gateway/openapi.json",  # Keep /openapi.json free for the unified spec
         docs_url="/gateway/docs",  # Gateway's own docs
-        redoc_url="/gateway/redoc"
+        redoc_url="/gateway/redoc",
+        lifespan=lifespan
     )
 
     # Add CORS middleware
@@ -34,6 +47,9 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # The unified spec and docs page are hundreds of KB uncompressed
+    app.add_middleware(CompressionMiddleware, minimum_size=config.get("COMPRESSION_MIN_SIZE"))
+
     # Include routers
     app.include_router(
         health_router,
@@ -41,6 +57,12 @@ def create_app() -> FastAPI:
         tags=["Health"]
     )
     
+    app.include_router(
+        identity_router,
+        prefix="/identity",
+        tags=["Identity"]
+    )
+    
     app.include_router(
         docs_router,
         prefix="",
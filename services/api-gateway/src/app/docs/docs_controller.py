@@ -16,6 +16,11 @@ logger = get_logger(__name__)
 class DocsController(BaseController):
     """Controller for aggregated documentation endpoints."""
     
+    cache_policies = {
+        "get_unified_openapi_spec": "public, max-age=60",
+        "get_services_info": "public, max-age=60",
+    }
+    
     def __init__(self):
         super().__init__()
         self.services = {
@@ -42,7 +47,7 @@ async def get_unified_docs():
     """Serve unified Swagger UI with all microservices."""
     try:
         # Generate the unified OpenAPI spec
-        unified_spec = await get_unified_openapi_spec()
+        unified_spec = await build_unified_openapi_spec()
         
         # Create Swagger UI HTML
         html_content = f"""
@@ -186,8 +191,14 @@ async def get_unified_docs():
 
 
 @router.get("/openapi.json")
-async def get_unified_openapi_spec():
+async def get_unified_openapi_spec(request: Request):
     """Get unified OpenAPI specification for all microservices."""
+    unified_spec = await build_unified_openapi_spec()
+    return docs_controller.json_response(unified_spec, request=request)
+
+
+async def build_unified_openapi_spec() -> Dict[str, Any]:
+    """Merge the OpenAPI specifications of all microservices."""
     try:
         service_specs = {}
         
@@ -295,7 +306,7 @@ async def get_unified_openapi_spec():
 
 
 @router.get("/services")
-async def get_services_info():
+async def get_services_info(request: Request):
     """Get information about all available services."""
     try:
         services_info = []
@@ -310,7 +321,8 @@ async def get_services_info():
                 "openapi_url": config["openapi_url"]
             })
         
-        return docs_controller.success_response(
+        return docs_controller.envelope_response(
+            request=request,
             data={
                 "services": services_info,
                 "total_services": len(services_info),
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from datetime import datetime
 import httpx
 import asyncio
@@ -12,10 +12,15 @@ router = APIRouter()
 class HealthController(BaseController):
     """Controller for health check endpoints."""
     
+    cache_policies = {
+        "health_check": "no-cache",
+        "services_health_check": "no-cache",
+    }
+    
     def __init__(self):
         super().__init__()
         self.services = {
-            "auth-service": "http://auth-service:8000/api/health",
+            "auth-service": "http://auth-service:8000/api/health/",
             "organization-service": "http://organization-service:8000/health"
         }
 
@@ -24,17 +29,18 @@ health_controller = HealthController()
 
 
 @router.get("/")
-async def health_check():
+async def health_check(request: Request):
     """Basic health check endpoint."""
     try:
-        return health_controller.success_response(
+        return health_controller.envelope_response(
             data={
                 "service": "api-gateway",
                 "status": "healthy",
                 "timestamp": datetime.utcnow().isoformat(),
                 "version": config.get("APP_VERSION", "1.0.0")
             },
-            message="API Gateway is healthy"
+            message="API Gateway is healthy",
+            request=request
         )
         
     except Exception as e:
@@ -47,7 +53,7 @@ async def health_check():
 
 
 @router.get("/services")
-async def services_health_check():
+async def services_health_check(request: Request):
     """Check health of all microservices."""
     try:
         service_statuses = {}
@@ -90,14 +96,15 @@ async def services_health_check():
         
         overall_status = "healthy" if all_healthy else "degraded"
         
-        return health_controller.success_response(
+        return health_controller.envelope_response(
             data={
                 "service": "api-gateway",
                 "overall_status": overall_status,
                 "services": service_statuses,
                 "timestamp": datetime.utcnow().isoformat()
             },
-            message=f"Services status check complete - {overall_status}"
+            message=f"Services status check complete - {overall_status}",
+            request=request
         )
         
     except Exception as e:
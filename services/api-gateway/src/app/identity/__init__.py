@@ -0,0 +1 @@
+# Identity forwarding module
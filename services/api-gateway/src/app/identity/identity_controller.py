@@ -0,0 +1,49 @@
+import uuid
+
+from fastapi import APIRouter, Request, status
+from starlette.responses import Response
+
+from shared.authentication.identity import IDENTITY_HEADER, IdentitySigner
+from shared.authentication.jwt_handler import JWTHandler
+from shared.core.base_controller import BaseController
+from shared.core.exceptions import AuthenticationException
+
+router = APIRouter()
+
+
+class IdentityController(BaseController):
+    """Controller verifying bearer tokens once on behalf of the services behind nginx."""
+    
+    def __init__(self):
+        super().__init__()
+        self.jwt_handler = JWTHandler()
+        self.identity_signer = IdentitySigner.from_environment()
+    
+    def identity_header(self, authorization: str, request_id: str) -> str:
+        """Verify the bearer token and sign an identity header for it, or return '' if it is not valid."""
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token or self.identity_signer is None:
+            return ""
+        
+        try:
+            claims = self.jwt_handler.verify_token(token)
+        except AuthenticationException:
+            # The service repeats the full verification and answers with its own 401
+            return ""
+        
+        return self.identity_signer.sign(claims, request_id, token)
+
+
+identity_controller = IdentityController()
+
+
+@router.get("/verify")
+async def verify_identity(request: Request):
+    """nginx auth_request target: forwards a signed identity header for valid bearer tokens."""
+    request_id = request.headers.get("x-request-id") or str(uuid.uuid4())
+    identity = identity_controller.identity_header(request.headers.get("authorization", ""), request_id)
+    
+    headers = {"X-Request-ID": request_id, "Cache-Control": "no-store"}
+    if identity:
+        headers[IDENTITY_HEADER] = identity
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
@@ -1,12 +1,94 @@
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from shared.core.middleware import RequestLoggingMiddleware, ErrorHandlingMiddleware
-from shared.core.versioning import VersionNegotiationMiddleware, APIVersion
+from shared.authentication.decorators import jwt_handler as token_verifier
+from shared.core.admission import AdmissionController, AdmissionControlMiddleware, Priority
+from shared.core.compression import CompressionMiddleware
+from shared.core.database import Database
+from shared.core.idempotency import IdempotencyMiddleware, IdempotencyStore
+from shared.core.middleware import RequestContextMiddleware
+from shared.core.openapi import add_openapi_routes
+from shared.core.exception_handlers import register_exception_handlers
+from shared.core.versioning import APIVersion, VersionDispatchTable, version_route
 from shared.utils.logger import setup_logger
 from shared.utils.config import config
+from shared.utils.password_pool import password_pool
 from .authentication.v1 import auth_v1_router
+from .authentication.v1.authentication_controller import auth_controller
+from .authentication.v1.login_audit import LoginAuditLog
+from .authentication.v1.sql_repository import (
+    SQLLoginAttemptRepository,
+    SQLRefreshTokenRepository,
+    SQLUserRepository,
+    create_schema,
+)
 from .health.health_controller import router as health_router
+from .keys.keys_controller import router as keys_router
+
+
+def create_admission_controller() -> AdmissionController:
+    admission = AdmissionController(
+        max_concurrency=config.get("ADMISSION_MAX_CONCURRENCY"),
+        max_queue=config.get("ADMISSION_MAX_QUEUE"),
+        queue_timeout=config.get("ADMISSION_QUEUE_TIMEOUT"),
+        retry_after=config.get("ADMISSION_RETRY_AFTER")
+    )
+
+    # Probes must keep answering while the service is saturated
+    for path in ("/api/health/live", "/api/health/ready"):
+        admission.set_priority(path, Priority.CRITICAL)
+
+    # bcrypt-bound endpoints get their own, much smaller pool
+    admission.limit_routes(
+        "password_hashing",
+        [version_route(APIVersion.V1, path) for path in ("/login", "/register", "/change-password")],
+        max_concurrency=config.get("LOGIN_MAX_CONCURRENCY"),
+        max_queue=config.get("LOGIN_MAX_QUEUE")
+    )
+    admission.set_priority(version_route(APIVersion.V1, "/refresh"), Priority.HIGH)
+
+    return admission
+
+
+def create_database() -> Optional[Database]:
+    """Build the connection pool when DATABASE_URL is set; users stay in memory otherwise."""
+    url = config.get("DATABASE_URL")
+    if not url:
+        return None
+    return Database(
+        url,
+        size=config.get("DATABASE_POOL_SIZE"),
+        acquire_timeout=config.get("DATABASE_POOL_TIMEOUT")
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the JWK set before serving when get_current_user verifies against JWT_JWKS_URL
+    await token_verifier.start()
+    # Calibrate password hashing once, off the event loop
+    await password_pool.start()
+    database = app.state.database
+    if database is not None:
+        # Open and validate the whole pool before accepting traffic
+        await database.start()
+        await create_schema(database)
+        auth_controller.auth_service.users = SQLUserRepository(database)
+        auth_controller.auth_service.refresh_tokens = SQLRefreshTokenRepository(database)
+        await auth_controller.auth_service.refresh_tokens.delete_expired()
+        if auth_controller.auth_service.login_attempts is None:
+            auth_controller.auth_service.login_attempts = SQLLoginAttemptRepository(database)
+    yield
+    # Apply queued login side effects before the pool goes away
+    await auth_controller.auth_service.side_effects.stop()
+    if isinstance(auth_controller.auth_service.login_attempts, LoginAuditLog):
+        auth_controller.auth_service.login_attempts.close()
+    if database is not None:
+        await database.close()
+    await token_verifier.stop()
 
 
 def create_app() -> FastAPI:
@@ -17,9 +99,13 @@ def create_app() -> FastAPI:
         description="Microservice for user authentication and authorization with API versioning",
         version=config.get("APP_VERSION", "1.0.0"),
         debug=config.is_debug(),
-        docs_url="/docs",
-        redoc_url="/redoc"
+        openapi_url=None,
+        docs_url=None,
+        redoc_url=None,
+        lifespan=lifespan
     )
+    app.state.database = create_database()
+    add_openapi_routes(app, openapi_url="/openapi.json", docs_url="/docs", redoc_url="/redoc")
 
     # Add CORS middleware
     app.add_middleware(
@@ -30,18 +116,38 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    app.add_middleware(VersionNegotiationMiddleware, default_version=APIVersion.V1)
-    app.add_middleware(RequestLoggingMiddleware)
-    app.add_middleware(ErrorHandlingMiddleware)
+    app.state.admission = create_admission_controller()
+    app.add_middleware(AdmissionControlMiddleware, controller=app.state.admission)
+
+    # Replays and waiting duplicates are answered before they take an admission slot
+    app.state.idempotency = IdempotencyStore(
+        ttl_seconds=config.get("IDEMPOTENCY_TTL_SECONDS"),
+        max_entries=config.get("IDEMPOTENCY_MAX_ENTRIES")
+    )
+    app.add_middleware(
+        IdempotencyMiddleware,
+        store=app.state.idempotency,
+        paths=[version_route(APIVersion.V1, path) for path in ("/register", "/change-password", "/refresh")]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=config.get("COMPRESSION_MIN_SIZE"))
+
+    app.add_middleware(
+        RequestContextMiddleware,
+        version_table=VersionDispatchTable([auth_v1_router], default_version=APIVersion.V1)
+    )
+
+    register_exception_handlers(app)
 
     app.include_router(
         health_router,
-        prefix="/api",
+        prefix="/api/health",
         tags=["Health"]
     )
 
     app.include_router(auth_v1_router)
 
+    app.include_router(keys_router, tags=["Keys"])
+
     return app
 
 
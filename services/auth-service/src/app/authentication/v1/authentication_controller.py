@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
+from shared.core.exceptions import NotFoundException
+from shared.core.responses import json_dumps
 from shared.core.versioning import VersionedController, APIVersion, create_versioned_router
-from shared.core.exceptions import ServiceException
-from shared.authentication.decorators import get_current_user
+from shared.authentication.decorators import get_current_user, require_permission
+from shared.authentication.permissions import Permission
 from .authentication_service import AuthenticationService
+from .login_audit import LoginAuditLog
 from .schemas.requests import (
     LoginRequest, 
     RegisterRequest, 
     RefreshTokenRequest,
     ChangePasswordRequest,
+    LogoutRequest,
     ForgotPasswordRequest,
     ResetPasswordRequest
 )
@@ -19,6 +27,10 @@ security = HTTPBearer()
 
 
 class AuthenticationController(VersionedController):    
+    cache_policies = {
+        "get_current_user_info": "private, no-cache",
+    }
+    
     def __init__(self):
         super().__init__(APIVersion.V1)
         self.auth_service = AuthenticationService()
@@ -28,167 +40,116 @@ auth_controller = AuthenticationController()
 
 @router.post("/login", response_model=LoginResponse)
 async def login(request: LoginRequest, http_request: Request):
-    try:
-        ip_address = http_request.client.host if http_request.client else "unknown"
-        user_agent = http_request.headers.get("user-agent", "unknown")
-        
-        result = await auth_controller.auth_service.login(request, ip_address, user_agent)
-        
-        if isinstance(result, ServiceException):
-            raise auth_controller.handle_service_exception(result)
-        
-        return auth_controller.success_response(
-            data=result,
-            message="Login successful"
-        )
-        
-    except ServiceException as e:
-        raise auth_controller.handle_service_exception(e)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=auth_controller.error_response(
-                message="An unexpected error occurred during login"
-            )
-        )
+    ip_address = auth_controller.auth_service.trusted_proxies.client_ip(
+        http_request.client.host if http_request.client else None, http_request.headers
+    )
+    user_agent = http_request.headers.get("user-agent", "unknown")
+    
+    result = await auth_controller.auth_service.login(request, ip_address, user_agent)
+    
+    return auth_controller.envelope_response(
+        data=result,
+        message="Login successful",
+        request=http_request
+    )
 
 
 @router.post("/register", response_model=RegisterResponse)
-async def register(request: RegisterRequest):
-    try:
-        result = await auth_controller.auth_service.register(request)
-        
-        if isinstance(result, ServiceException):
-            raise auth_controller.handle_service_exception(result)
-        
-        return auth_controller.success_response(
-            data=result,
-            message="Registration successful",
-            status_code=status.HTTP_201_CREATED
-        )
-        
-    except ServiceException as e:
-        raise auth_controller.handle_service_exception(e)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=auth_controller.error_response(
-                message="An unexpected error occurred during registration"
-            )
-        )
+async def register(request: RegisterRequest, http_request: Request):
+    result = await auth_controller.auth_service.register(request)
+    
+    return auth_controller.success_response(
+        data=result,
+        message="Registration successful",
+        status_code=status.HTTP_201_CREATED,
+        fields=http_request.query_params.get("fields")
+    )
 
 
 @router.post("/refresh", response_model=AuthResponse)
-async def refresh_token(request: RefreshTokenRequest):
-    try:
-        tokens = await auth_controller.auth_service.refresh_token(request.refresh_token)
-        
-        return auth_controller.success_response(
-            data={"tokens": tokens.dict()},
-            message="Token refreshed successfully"
-        )
-        
-    except ServiceException as e:
-        raise auth_controller.handle_service_exception(e)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=auth_controller.error_response(
-                message="An unexpected error occurred during token refresh"
-            )
-        )
+async def refresh_token(request: RefreshTokenRequest, http_request: Request):
+    tokens = await auth_controller.auth_service.refresh_token(request.refresh_token)
+    
+    return auth_controller.success_response(
+        data={"tokens": tokens.dict()},
+        message="Token refreshed successfully",
+        fields=http_request.query_params.get("fields")
+    )
 
 
 @router.post("/change-password", response_model=AuthResponse)
 async def change_password(
     request: ChangePasswordRequest,
+    http_request: Request,
     current_user: dict = Depends(get_current_user)
 ):
-    try:
-        result = await auth_controller.auth_service.change_password(
-            current_user["sub"], 
-            request
-        )
-        
-        if isinstance(result, ServiceException):
-            raise auth_controller.handle_service_exception(result)
-        
-        return auth_controller.success_response(
-            data=result,
-            message="Password changed successfully"
-        )
-        
-    except ServiceException as e:
-        raise auth_controller.handle_service_exception(e)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=auth_controller.error_response(
-                message="An unexpected error occurred while changing password"
-            )
-        )
+    result = await auth_controller.auth_service.change_password(
+        current_user["sub"], 
+        request
+    )
+    
+    return auth_controller.success_response(
+        data=result,
+        message="Password changed successfully",
+        fields=http_request.query_params.get("fields")
+    )
 
 
 @router.post("/forgot-password", response_model=AuthResponse)
 async def forgot_password(request: ForgotPasswordRequest):
-    try:
-        return auth_controller.success_response(
-            message="If an account with this email exists, a password reset link has been sent"
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=auth_controller.error_response(
-                message="An unexpected error occurred while processing forgot password request"
-            )
-        )
+    return auth_controller.success_response(
+        message="If an account with this email exists, a password reset link has been sent"
+    )
 
 
 @router.post("/reset-password", response_model=AuthResponse)
 async def reset_password(request: ResetPasswordRequest):
-    try:
-        return auth_controller.success_response(
-            message="Password reset successful"
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=auth_controller.error_response(
-                message="An unexpected error occurred while resetting password"
-            )
-        )
+    return auth_controller.success_response(
+        message="Password reset successful"
+    )
 
 
 @router.post("/logout", response_model=AuthResponse)
-async def logout(current_user: dict = Depends(get_current_user)):
-    try:
-        return auth_controller.success_response(
-            message="Logout successful"
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=auth_controller.error_response(
-                message="An unexpected error occurred during logout"
-            )
-        )
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    await auth_controller.auth_service.logout(
+        current_user,
+        request.refresh_token if request is not None else None
+    )
+    
+    return auth_controller.success_response(
+        message="Logout successful"
+    )
 
 
 @router.get("/me", response_model=AuthResponse)
-async def get_current_user_info(current_user: dict = Depends(get_current_user)):
-    try:
-        return auth_controller.success_response(
-            data={"user": current_user},
-            message="User information retrieved successfully"
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=auth_controller.error_response(
-                message="An unexpected error occurred while retrieving user information"
-            )
-        )
+async def get_current_user_info(http_request: Request, current_user: dict = Depends(get_current_user)):
+    return auth_controller.envelope_response(
+        data={"user": current_user},
+        message="User information retrieved successfully",
+        request=http_request
+    )
+
+
+@router.get("/admin/login-attempts")
+@require_permission([Permission.SYSTEM_ADMIN.value])
+async def list_login_attempts(
+    email: Optional[str] = None,
+    ip: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=100000),
+    current_user: dict = Depends(get_current_user)
+):
+    audit_log = auth_controller.auth_service.login_attempts
+    if not isinstance(audit_log, LoginAuditLog):
+        raise NotFoundException("Login audit log is not enabled")
+
+    # Attempts are decoded and sent one NDJSON line at a time
+    def lines():
+        for attempt in audit_log.query(email=email, ip_address=ip, since=since, until=until, limit=limit):
+            yield json_dumps(attempt.model_dump(mode="json")) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,9 +1,12 @@
 """Authentication service implementation."""
 
+import asyncio
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Set, Tuple
 
 from shared.core.base_service import BaseService
+from shared.core.segment_log import SegmentLog
+from shared.core.write_behind import WriteBehindQueue
 from shared.core.exceptions import (
     AuthenticationException, 
     ValidationException, 
@@ -11,26 +14,59 @@ from shared.core.exceptions import (
     NotFoundException
 )
 from shared.authentication.jwt_handler import JWTHandler
+from shared.authentication.login_throttle import LoginThrottle, TrustedProxies
+from shared.authentication.token_store import ExpiringTokenStore, SQLiteTokenBackend
+from shared.utils.config import config
 from shared.utils.helpers import (
     generate_id, 
-    hash_password, 
-    verify_password, 
+    generate_hash,
     validate_email,
     validate_password_strength
 )
-from .authentication_models import User, RefreshToken
+from shared.utils.password_pool import hash_password_async, password_pool, verify_password_async
+from .authentication_models import LoginAttempt, User, RefreshToken
+from .login_audit import LoginAuditLog
+from .sql_repository import SQLRefreshTokenRepository
+from .user_repository import InMemoryUserRepository, UserRepository
 from .schemas.requests import LoginRequest, RegisterRequest, ChangePasswordRequest
 from .schemas.responses import TokenResponse, UserInfo
 
 
 class AuthenticationService(BaseService):
     
-    def __init__(self):
+    def __init__(self, users: Optional[UserRepository] = None):
         super().__init__()
         self.jwt_handler = JWTHandler()
-        # In a real implementation, you would inject a database repository here
-        self._users_db = {}  # Mock database
-        self._refresh_tokens_db = {}  # Mock database
+        self.users = users if users is not None else InMemoryUserRepository()
+        # Issued refresh tokens by hash; persisted and shared with other
+        # workers through the TOKEN_STORE_PATH file when it is set
+        store_path = config.get("TOKEN_STORE_PATH")
+        backend = SQLiteTokenBackend(store_path) if store_path else None
+        self._refresh_tokens = ExpiringTokenStore(RefreshToken, backend=backend)
+        # Replaces the token store when DATABASE_URL is set
+        self.refresh_tokens: Optional[SQLRefreshTokenRepository] = None
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Checked before any password hashing on login
+        self.login_throttle = LoginThrottle.from_environment()
+        self.trusted_proxies = TrustedProxies.from_environment()
+        # Login attempts go to the audit log when LOGIN_AUDIT_DIR is set, and are discarded
+        # when no store is configured
+        self.login_attempts = None
+        audit_dir = config.get("LOGIN_AUDIT_DIR")
+        if audit_dir:
+            self.login_attempts = LoginAuditLog(SegmentLog(
+                audit_dir,
+                max_segment_bytes=config.get("LOGIN_AUDIT_SEGMENT_BYTES"),
+                max_segment_age=config.get("LOGIN_AUDIT_SEGMENT_SECONDS"),
+                max_segments=config.get("LOGIN_AUDIT_MAX_SEGMENTS")
+            ))
+        # Login side effects are applied in batches after the response is sent
+        self.side_effects = WriteBehindQueue(
+            {"last_login": self._write_last_logins, "login_attempt": self._write_login_attempts},
+            max_batch=config.get("WRITE_BEHIND_MAX_BATCH"),
+            flush_interval=config.get("WRITE_BEHIND_FLUSH_INTERVAL"),
+            max_pending=config.get("WRITE_BEHIND_MAX_PENDING")
+        )
     
     async def login(self, request: LoginRequest, ip_address: str, user_agent: str) -> Dict[str, Any]:
         try:
@@ -39,22 +75,29 @@ class AuthenticationService(BaseService):
             if not validate_email(request.email):
                 raise ValidationException("Invalid email format")
             
+            throttle_ticket = self.login_throttle.acquire(request.email, ip_address)
+            
             user = await self._find_user_by_email(request.email)
             if not user:
                 raise AuthenticationException("Invalid credentials")
             
-            if not verify_password(request.password, user.password_hash):
-                await self._log_failed_login(request.email, ip_address, user_agent, "invalid_password")
+            if not await verify_password_async(request.password, user.password_hash):
+                self._log_failed_login(request.email, ip_address, user_agent, "invalid_password")
                 raise AuthenticationException("Invalid credentials")
             
             if not user.is_active:
                 raise AuthenticationException("Account is deactivated")
             
+            self.login_throttle.forgive(throttle_ticket)
+            
+            if password_pool.needs_rehash(user.password_hash):
+                self._schedule_rehash(user, request.password)
+            
             tokens = await self._generate_tokens(user)
             
-            await self._update_last_login(user.id)
+            self._update_last_login(user.id)
             
-            await self._log_successful_login(user.id, ip_address, user_agent)
+            self._log_successful_login(user.email, ip_address, user_agent)
             
             self.log_operation("login_success", {"user_id": user.id})
             
@@ -64,7 +107,7 @@ class AuthenticationService(BaseService):
             }
             
         except Exception as e:
-            return self.handle_exception("login", e)
+            raise self.handle_exception("login", e)
     
     async def register(self, request: RegisterRequest) -> Dict[str, Any]:
 
@@ -93,13 +136,16 @@ class AuthenticationService(BaseService):
             }
             
         except Exception as e:
-            return self.handle_exception("register", e)
+            raise self.handle_exception("register", e)
     
     async def refresh_token(self, refresh_token: str) -> TokenResponse:
         """Refresh access token using refresh token."""
         try:
-            # Verify refresh token
+            # Verify and immediately revoke the refresh token, so it can only be used once
             payload = self.jwt_handler.verify_token(refresh_token, "refresh")
+            self.jwt_handler.revoke(payload)
+            if await self._consume_refresh_token(generate_hash(refresh_token)) is None:
+                raise AuthenticationException("Invalid refresh token")
             user_id = payload.get("sub")
             
             # Find user
@@ -108,15 +154,27 @@ class AuthenticationService(BaseService):
                 raise AuthenticationException("Invalid refresh token")
             
             # Generate new tokens
-            tokens = await self._generate_tokens(user)
+            return await self._generate_tokens(user)
             
-            # Revoke old refresh token (in real implementation)
-            # await self._revoke_refresh_token(refresh_token)
+        except Exception as e:
+            raise self.handle_exception("refresh_token", e)
+    
+    async def logout(self, access_payload: Dict[str, Any], refresh_token: Optional[str] = None) -> None:
+        """Revoke the access token and, if given, the user's refresh token."""
+        try:
+            self.jwt_handler.revoke(access_payload)
             
-            return tokens
+            if refresh_token:
+                payload = self.jwt_handler.verify_token(refresh_token, "refresh")
+                if payload.get("sub") != access_payload.get("sub"):
+                    raise AuthenticationException("Invalid refresh token")
+                self.jwt_handler.revoke(payload)
+                await self._delete_refresh_token(generate_hash(refresh_token))
+            
+            self.log_operation("logout", {"user_id": access_payload.get("sub")})
             
         except Exception as e:
-            raise self.handle_exception("refresh_token", e)
+            raise self.handle_exception("logout", e)
     
     async def change_password(self, user_id: str, request: ChangePasswordRequest) -> Dict[str, Any]:
         """Change user password."""
@@ -127,7 +185,7 @@ class AuthenticationService(BaseService):
                 raise NotFoundException("User not found")
             
             # Verify current password
-            if not verify_password(request.current_password, user.password_hash):
+            if not await verify_password_async(request.current_password, user.password_hash):
                 raise AuthenticationException("Current password is incorrect")
             
             # Validate new password
@@ -138,12 +196,15 @@ class AuthenticationService(BaseService):
             # Update password
             await self._update_password(user_id, request.new_password)
             
+            # End every other session of the user
+            await self._delete_user_refresh_tokens(user_id)
+            
             self.log_operation("password_changed", {"user_id": user_id})
             
             return {"message": "Password changed successfully"}
             
         except Exception as e:
-            return self.handle_exception("change_password", e)
+            raise self.handle_exception("change_password", e)
     
     def _validate_registration_data(self, request: RegisterRequest) -> None:
         """Validate registration data."""
@@ -155,33 +216,26 @@ class AuthenticationService(BaseService):
             raise ValidationException("Password does not meet requirements", {"errors": errors})
     
     async def _find_user_by_email(self, email: str) -> Optional[User]:
-        """Find user by email (mock implementation)."""
-        # In real implementation, this would query the database
-        return self._users_db.get(email)
+        """Find user by email."""
+        return await self.users.get_by_email(email)
     
     async def _find_user_by_id(self, user_id: str) -> Optional[User]:
-        """Find user by ID (mock implementation)."""
-        # In real implementation, this would query the database
-        for user in self._users_db.values():
-            if user.id == user_id:
-                return user
-        return None
+        """Find user by ID."""
+        return await self.users.get_by_id(user_id)
     
     async def _create_user(self, request: RegisterRequest) -> User:
-        """Create a new user (mock implementation)."""
+        """Create a new user."""
         user = User(
             id=generate_id(),
             email=request.email,
-            password_hash=hash_password(request.password),
+            password_hash=await hash_password_async(request.password),
             first_name=request.first_name,
             last_name=request.last_name,
             created_at=datetime.utcnow(),
             permissions=["user:read"]  # Default permissions
         )
         
-        self._users_db[request.email] = user
-        
-        return user
+        return await self.users.add(user)
     
     async def _generate_tokens(self, user: User) -> TokenResponse:
         """Generate access and refresh tokens."""
@@ -194,35 +248,106 @@ class AuthenticationService(BaseService):
         access_token = self.jwt_handler.create_access_token(token_data)
         refresh_token = self.jwt_handler.create_refresh_token({"sub": user.id})
         
+        now = datetime.utcnow()
+        await self._store_refresh_token(RefreshToken(
+            id=generate_id(),
+            user_id=user.id,
+            token_hash=generate_hash(refresh_token),
+            expires_at=now + timedelta(days=self.jwt_handler.refresh_token_expire_days),
+            created_at=now
+        ))
+        
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
             expires_in=self.jwt_handler.access_token_expire_minutes * 60
         )
     
-    async def _update_last_login(self, user_id: str) -> None:
-        """Update user's last login timestamp."""
-        # In real implementation, this would update the database
-        pass
+    async def _store_refresh_token(self, token: RefreshToken) -> None:
+        if self.refresh_tokens is not None:
+            await self.refresh_tokens.add(token)
+        else:
+            await self._refresh_tokens.put(token)
+    
+    async def _consume_refresh_token(self, token_hash: str) -> Optional[RefreshToken]:
+        """Remove and return a live refresh token record."""
+        if self.refresh_tokens is not None:
+            return await self.refresh_tokens.pop(token_hash)
+        return await self._refresh_tokens.pop(token_hash)
+    
+    async def _delete_refresh_token(self, token_hash: str) -> None:
+        if self.refresh_tokens is not None:
+            await self.refresh_tokens.delete(token_hash)
+        else:
+            await self._refresh_tokens.delete(token_hash)
+    
+    async def _delete_user_refresh_tokens(self, user_id: str) -> None:
+        if self.refresh_tokens is not None:
+            await self.refresh_tokens.delete_user(user_id)
+        else:
+            await self._refresh_tokens.delete_user(user_id)
+    
+    def _schedule_rehash(self, user: User, password: str) -> None:
+        """Rehash a password under the current hashing policy without delaying the login."""
+        task = asyncio.create_task(self._rehash_password(user, password))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _rehash_password(self, user: User, password: str) -> None:
+        old_hash = user.password_hash
+        try:
+            new_hash = await hash_password_async(password)
+        except Exception as e:
+            self.log_error("rehash_password", e, {"user_id": user.id})
+            return
+        
+        # Skip if the password changed while the new hash was computed
+        updated = await self.users.update(user.id, {"password_hash": new_hash}, expected={"password_hash": old_hash})
+        if updated is not None:
+            self.log_operation("password_rehashed", {"user_id": user.id})
+    
+    def _update_last_login(self, user_id: str) -> None:
+        """Queue an update of the user's last login timestamp; dropped if the queue is full."""
+        self.side_effects.offer("last_login", (user_id, datetime.utcnow()), key=user_id)
     
     async def _update_password(self, user_id: str, new_password: str) -> None:
         """Update user password."""
-        # In real implementation, this would update the database
-        for user in self._users_db.values():
-            if user.id == user_id:
-                user.password_hash = hash_password(new_password)
-                user.updated_at = datetime.utcnow()
-                break
-    
-    async def _log_successful_login(self, user_id: str, ip_address: str, user_agent: str) -> None:
+        password_hash = await hash_password_async(new_password)
+        await self.users.update(user_id, {"password_hash": password_hash, "updated_at": datetime.utcnow()})
+    
+    def _log_successful_login(self, email: str, ip_address: str, user_agent: str) -> None:
         """Log successful login attempt."""
-        # In real implementation, this would log to database
-        pass
+        self._log_login_attempt(email, ip_address, user_agent, True)
     
-    async def _log_failed_login(self, email: str, ip_address: str, user_agent: str, reason: str) -> None:
+    def _log_failed_login(self, email: str, ip_address: str, user_agent: str, reason: str) -> None:
         """Log failed login attempt."""
-        # In real implementation, this would log to database
-        pass
+        self._log_login_attempt(email, ip_address, user_agent, False, reason)
+    
+    def _log_login_attempt(
+        self,
+        email: str,
+        ip_address: str,
+        user_agent: str,
+        success: bool,
+        reason: Optional[str] = None
+    ) -> None:
+        # Side effects never fail a login: a full queue drops the record and counts it
+        self.side_effects.offer("login_attempt", LoginAttempt(
+            id=generate_id(),
+            email=email,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            success=success,
+            failure_reason=reason,
+            created_at=datetime.utcnow()
+        ))
+    
+    async def _write_last_logins(self, batch: List[Tuple[str, datetime]]) -> None:
+        await self.users.set_last_logins(batch)
+    
+    async def _write_login_attempts(self, batch: List[LoginAttempt]) -> None:
+        if self.login_attempts is not None:
+            await self.login_attempts.add_many(batch)
     
     def _user_to_info(self, user: User) -> UserInfo:
         """Convert User model to UserInfo response."""
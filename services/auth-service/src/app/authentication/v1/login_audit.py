@@ -0,0 +1,128 @@
+"""Login attempt audit log in a compact binary format."""
+
+import asyncio
+import ipaddress
+import struct
+import uuid
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from shared.core.segment_log import SegmentLog
+from .authentication_models import LoginAttempt
+
+_SUCCESS = 0x01
+_UUID_ID = 0x02
+_HAS_REASON = 0x04
+
+_LENGTH = struct.Struct("<H")
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _pack_text(text: str) -> bytes:
+    data = text.encode("utf-8")[:0xFFFF]
+    return _LENGTH.pack(len(data)) + data
+
+
+def _unpack_text(payload: bytes, offset: int) -> Tuple[str, int]:
+    (length,) = _LENGTH.unpack_from(payload, offset)
+    offset += _LENGTH.size
+    return payload[offset:offset + length].decode("utf-8", "replace"), offset + length
+
+
+def encode_attempt(attempt: LoginAttempt) -> bytes:
+    """Encode an attempt; the timestamp is stored in the record header.
+
+    Layout: flags byte, ID (16 raw bytes for UUIDs), IP (length byte plus
+    packed address, or 0 plus text), then length-prefixed email, user
+    agent and optional failure reason.
+    """
+    flags = _SUCCESS if attempt.success else 0
+    try:
+        attempt_id = uuid.UUID(attempt.id).bytes
+        flags |= _UUID_ID
+    except ValueError:
+        attempt_id = _pack_text(attempt.id)
+    try:
+        packed_ip = ipaddress.ip_address(attempt.ip_address).packed
+        ip = bytes([len(packed_ip)]) + packed_ip
+    except ValueError:
+        ip = b"\x00" + _pack_text(attempt.ip_address)
+    reason = b""
+    if attempt.failure_reason is not None:
+        flags |= _HAS_REASON
+        reason = _pack_text(attempt.failure_reason)
+
+    return bytes([flags]) + attempt_id + ip + _pack_text(attempt.email) + _pack_text(attempt.user_agent) + reason
+
+
+def decode_attempt(timestamp: float, payload: bytes) -> LoginAttempt:
+    flags = payload[0]
+    if flags & _UUID_ID:
+        attempt_id, offset = str(uuid.UUID(bytes=payload[1:17])), 17
+    else:
+        attempt_id, offset = _unpack_text(payload, 1)
+
+    ip_length = payload[offset]
+    if ip_length:
+        ip_address = str(ipaddress.ip_address(payload[offset + 1:offset + 1 + ip_length]))
+        offset += 1 + ip_length
+    else:
+        ip_address, offset = _unpack_text(payload, offset + 1)
+
+    email, offset = _unpack_text(payload, offset)
+    user_agent, offset = _unpack_text(payload, offset)
+    reason = _unpack_text(payload, offset)[0] if flags & _HAS_REASON else None
+
+    return LoginAttempt(
+        id=attempt_id,
+        email=email,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        success=bool(flags & _SUCCESS),
+        failure_reason=reason,
+        created_at=datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+    )
+
+
+class LoginAuditLog:
+    """Append-only store of login attempts, queried by email, IP and time window."""
+
+    def __init__(self, log: SegmentLog):
+        self.log = log
+
+    async def add_many(self, attempts: List[LoginAttempt]) -> None:
+        records = [(_timestamp(attempt.created_at), encode_attempt(attempt)) for attempt in attempts]
+        await asyncio.to_thread(self.log.append_many, records)
+
+    def query(
+        self,
+        email: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[LoginAttempt]:
+        """Yield matching attempts oldest first, reading the log lazily."""
+        email = email.strip().lower() if email else None
+        start = _timestamp(since) if since is not None else float("-inf")
+        end = _timestamp(until) if until is not None else float("inf")
+
+        matched = 0
+        for timestamp, payload in self.log.scan(start, end):
+            attempt = decode_attempt(timestamp, payload)
+            if email is not None and attempt.email.lower() != email:
+                continue
+            if ip_address is not None and attempt.ip_address != ip_address:
+                continue
+            yield attempt
+            matched += 1
+            if limit is not None and matched >= limit:
+                return
+
+    def close(self) -> None:
+        self.log.close()
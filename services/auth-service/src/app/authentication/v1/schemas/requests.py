@@ -25,6 +25,11 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str = Field(..., description="Refresh token")
 
 
+class LogoutRequest(BaseModel):
+    """Logout request schema."""
+    refresh_token: Optional[str] = Field(None, description="Refresh token to revoke along with the access token")
+
+
 class ChangePasswordRequest(BaseModel):
     """Change password request schema."""
     current_password: str = Field(..., description="Current password")
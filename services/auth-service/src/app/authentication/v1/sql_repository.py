@@ -0,0 +1,228 @@
+"""SQL-backed repositories for users, refresh tokens and login attempts."""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.core.database import INTEGRITY_ERRORS, Database
+from shared.core.exceptions import ConflictException, NotFoundException
+from shared.core.responses import json_dumps, json_loads
+from .authentication_models import LoginAttempt, RefreshToken, User
+from .user_repository import UserRepository, normalize_email
+
+# Portable DDL for SQLite and PostgreSQL; timestamps are ISO-8601 text
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS users ("
+    "id TEXT PRIMARY KEY, email TEXT NOT NULL, email_key TEXT NOT NULL UNIQUE, password_hash TEXT NOT NULL, "
+    "first_name TEXT NOT NULL, last_name TEXT NOT NULL, is_active BOOLEAN NOT NULL, is_verified BOOLEAN NOT NULL, "
+    "permissions TEXT NOT NULL, created_at TEXT NOT NULL, updated_at TEXT, last_login TEXT)",
+    "CREATE TABLE IF NOT EXISTS refresh_tokens ("
+    "token_hash TEXT PRIMARY KEY, id TEXT NOT NULL, user_id TEXT NOT NULL, expires_at TEXT NOT NULL, "
+    "created_at TEXT NOT NULL, is_revoked BOOLEAN NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS refresh_tokens_user_id ON refresh_tokens (user_id)",
+    "CREATE TABLE IF NOT EXISTS login_attempts ("
+    "id TEXT PRIMARY KEY, email TEXT NOT NULL, ip_address TEXT NOT NULL, user_agent TEXT NOT NULL, "
+    "success BOOLEAN NOT NULL, failure_reason TEXT, created_at TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS login_attempts_email ON login_attempts (email, created_at)",
+)
+
+USER_COLUMNS = (
+    "id", "email", "email_key", "password_hash", "first_name", "last_name", "is_active",
+    "is_verified", "permissions", "created_at", "updated_at", "last_login",
+)
+
+# Hot lookups: fixed query texts, prepared once per pooled connection
+SELECT_USER_BY_EMAIL = f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE email_key = $1"
+SELECT_USER_BY_ID = f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE id = $1"
+INSERT_USER = f"INSERT INTO users ({', '.join(USER_COLUMNS)}) VALUES ({', '.join(f'${i}' for i in range(1, len(USER_COLUMNS) + 1))})"
+SELECT_TOKEN_BY_HASH = (
+    "SELECT token_hash, id, user_id, expires_at, created_at, is_revoked FROM refresh_tokens "
+    "WHERE token_hash = $1 AND expires_at > $2 AND NOT is_revoked"
+)
+INSERT_TOKEN = (
+    "INSERT INTO refresh_tokens (token_hash, id, user_id, expires_at, created_at, is_revoked) "
+    "VALUES ($1, $2, $3, $4, $5, $6)"
+)
+TAKE_TOKEN = (
+    "DELETE FROM refresh_tokens WHERE token_hash = $1 AND expires_at > $2 AND NOT is_revoked "
+    "RETURNING token_hash, id, user_id, expires_at, created_at, is_revoked"
+)
+UPDATE_LAST_LOGIN = "UPDATE users SET last_login = $1 WHERE id = $2"
+DELETE_TOKEN = "DELETE FROM refresh_tokens WHERE token_hash = $1"
+DELETE_EXPIRED_TOKENS = "DELETE FROM refresh_tokens WHERE expires_at <= $1"
+DELETE_USER_TOKENS = "DELETE FROM refresh_tokens WHERE user_id = $1"
+INSERT_LOGIN_ATTEMPT = (
+    "INSERT INTO login_attempts (id, email, ip_address, user_agent, success, failure_reason, created_at) "
+    "VALUES ($1, $2, $3, $4, $5, $6, $7)"
+)
+SELECT_RECENT_ATTEMPTS = (
+    "SELECT id, email, ip_address, user_agent, success, failure_reason, created_at FROM login_attempts "
+    "WHERE email = $1 AND created_at >= $2 ORDER BY created_at DESC LIMIT $3"
+)
+
+
+async def create_schema(database: Database) -> None:
+    """Create the auth tables and indexes if they do not exist."""
+    for statement in SCHEMA:
+        await database.execute(statement, name="schema")
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _column_value(name: str, value: Any) -> Any:
+    """Convert a User field value to its stored representation."""
+    if name == "permissions":
+        return json_dumps(value).decode("utf-8")
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _user_values(user: User) -> Dict[str, Any]:
+    values = {name: _column_value(name, getattr(user, name)) for name in USER_COLUMNS if name != "email_key"}
+    values["email_key"] = normalize_email(user.email)
+    return values
+
+
+def _attempt_values(attempt: LoginAttempt) -> tuple:
+    return (
+        attempt.id, attempt.email, attempt.ip_address, attempt.user_agent,
+        attempt.success, attempt.failure_reason, _timestamp(attempt.created_at),
+    )
+
+
+def _to_user(row: Optional[Dict[str, Any]]) -> Optional[User]:
+    if row is None:
+        return None
+    row.pop("email_key", None)
+    row["permissions"] = json_loads(row["permissions"])
+    return User.model_validate(row)
+
+
+class SQLUserRepository(UserRepository):
+    """Users in the `users` table, found through the primary key or the unique normalized email."""
+
+    def __init__(self, database: Database):
+        self.database = database
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        row = await self.database.fetch_one(SELECT_USER_BY_EMAIL, normalize_email(email), name="user_by_email")
+        return _to_user(row)
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        return _to_user(await self.database.fetch_one(SELECT_USER_BY_ID, user_id, name="user_by_id"))
+
+    async def add(self, user: User) -> User:
+        values = _user_values(user)
+        try:
+            await self.database.execute(INSERT_USER, *(values[column] for column in USER_COLUMNS), name="insert_user")
+        except INTEGRITY_ERRORS:
+            raise ConflictException("User with this email already exists")
+        return user
+
+    async def update(
+        self,
+        user_id: str,
+        changes: Dict[str, Any],
+        expected: Optional[Dict[str, Any]] = None
+    ) -> Optional[User]:
+        unknown = (set(changes) | set(expected or {})) - set(User.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown user fields: {sorted(unknown)}")
+        if not changes:
+            user = await self.get_by_id(user_id)
+            if user is None:
+                raise NotFoundException("User not found")
+            if expected and any(getattr(user, name) != value for name, value in expected.items()):
+                return None
+            return user
+
+        columns = list(changes)
+        args: List[Any] = [_column_value(name, value) for name, value in changes.items()]
+        if "email" in changes:
+            columns.append("email_key")
+            args.append(normalize_email(changes["email"]))
+        args.append(user_id)
+        conditions = [f"id = ${len(args)}"]
+        for name, value in (expected or {}).items():
+            args.append(_column_value(name, value))
+            conditions.append(f"{name} = ${len(args)}")
+
+        assignments = ", ".join(f"{column} = ${index}" for index, column in enumerate(columns, 1))
+        sql = f"UPDATE users SET {assignments} WHERE {' AND '.join(conditions)} RETURNING {', '.join(USER_COLUMNS)}"
+        try:
+            row = await self.database.fetch_one(sql, *args, name="update_user")
+        except INTEGRITY_ERRORS:
+            raise ConflictException("User with this email already exists")
+
+        if row is None:
+            if await self.get_by_id(user_id) is None:
+                raise NotFoundException("User not found")
+            return None
+        return _to_user(row)
+
+    async def set_last_logins(self, logins: List[Tuple[str, datetime]]) -> None:
+        """Update a batch on one connection, in a single transaction."""
+        await self.database.execute_many(
+            UPDATE_LAST_LOGIN, [(_timestamp(last_login), user_id) for user_id, last_login in logins], name="update_last_logins"
+        )
+
+
+class SQLRefreshTokenRepository:
+    """Refresh token records in the `refresh_tokens` table, keyed by token hash."""
+
+    def __init__(self, database: Database):
+        self.database = database
+
+    async def add(self, token: RefreshToken) -> None:
+        await self.database.execute(
+            INSERT_TOKEN, token.token_hash, token.id, token.user_id,
+            _timestamp(token.expires_at), _timestamp(token.created_at), token.is_revoked,
+            name="insert_token"
+        )
+
+    async def get_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """Get a live, unrevoked token record."""
+        row = await self.database.fetch_one(
+            SELECT_TOKEN_BY_HASH, token_hash, _timestamp(datetime.utcnow()), name="token_by_hash"
+        )
+        return RefreshToken.model_validate(row) if row is not None else None
+
+    async def pop(self, token_hash: str) -> Optional[RefreshToken]:
+        """Delete and return a live token record; one statement, so a token is used at most once."""
+        row = await self.database.fetch_one(TAKE_TOKEN, token_hash, _timestamp(datetime.utcnow()), name="take_token")
+        return RefreshToken.model_validate(row) if row is not None else None
+
+    async def delete(self, token_hash: str) -> bool:
+        return await self.database.execute(DELETE_TOKEN, token_hash, name="delete_token") > 0
+
+    async def delete_user(self, user_id: str) -> int:
+        return await self.database.execute(DELETE_USER_TOKENS, user_id, name="delete_user_tokens")
+
+    async def delete_expired(self) -> int:
+        return await self.database.execute(
+            DELETE_EXPIRED_TOKENS, _timestamp(datetime.utcnow()), name="delete_expired_tokens"
+        )
+
+
+class SQLLoginAttemptRepository:
+    """Login attempts in the `login_attempts` table, indexed by email and time."""
+
+    def __init__(self, database: Database):
+        self.database = database
+
+    async def add(self, attempt: LoginAttempt) -> None:
+        await self.database.execute(INSERT_LOGIN_ATTEMPT, *_attempt_values(attempt), name="insert_login_attempt")
+
+    async def add_many(self, attempts: List[LoginAttempt]) -> None:
+        """Insert a batch on one connection, in a single transaction."""
+        await self.database.execute_many(
+            INSERT_LOGIN_ATTEMPT, [_attempt_values(attempt) for attempt in attempts], name="insert_login_attempts"
+        )
+
+    async def recent(self, email: str, since: datetime, limit: int = 100) -> List[LoginAttempt]:
+        rows = await self.database.fetch_all(
+            SELECT_RECENT_ATTEMPTS, email, _timestamp(since), limit, name="recent_login_attempts"
+        )
+        return [LoginAttempt.model_validate(row) for row in rows]
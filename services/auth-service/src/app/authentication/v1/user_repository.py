@@ -0,0 +1,109 @@
+"""User repositories."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.core.exceptions import ConflictException, NotFoundException
+from .authentication_models import User
+
+
+def normalize_email(email: str) -> str:
+    """Canonical form of an email address used for lookups."""
+    return email.strip().lower()
+
+
+class UserRepository(ABC):
+    """Storage for users, looked up by email or ID."""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Find a user by email, ignoring case."""
+
+    @abstractmethod
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        """Find a user by ID."""
+
+    @abstractmethod
+    async def add(self, user: User) -> User:
+        """Store a new user; raises ConflictException if the email is taken."""
+
+    @abstractmethod
+    async def update(
+        self,
+        user_id: str,
+        changes: Dict[str, Any],
+        expected: Optional[Dict[str, Any]] = None
+    ) -> Optional[User]:
+        """Apply changes to a user atomically.
+
+        With `expected`, the update only happens if those fields still hold
+        the given values; otherwise None is returned and nothing changes.
+        Raises NotFoundException for unknown users.
+        """
+
+    async def set_last_logins(self, logins: List[Tuple[str, datetime]]) -> None:
+        """Record last-login timestamps for many users; unknown users are skipped."""
+        for user_id, last_login in logins:
+            try:
+                await self.update(user_id, {"last_login": last_login})
+            except NotFoundException:
+                pass
+
+
+class InMemoryUserRepository(UserRepository):
+    """Users held in process memory, indexed by ID and by normalized email.
+
+    Records are replaced, never mutated, and both indexes are updated
+    without yielding to the event loop, so readers never see a half-applied
+    update.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[str, User] = {}
+        self._by_email: Dict[str, str] = {}
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        user_id = self._by_email.get(normalize_email(email))
+        return self._by_id.get(user_id) if user_id is not None else None
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        return self._by_id.get(user_id)
+
+    async def add(self, user: User) -> User:
+        email = normalize_email(user.email)
+        if email in self._by_email:
+            raise ConflictException("User with this email already exists")
+        if user.id in self._by_id:
+            raise ConflictException("User with this ID already exists")
+
+        self._by_id[user.id] = user
+        self._by_email[email] = user.id
+        return user
+
+    async def update(
+        self,
+        user_id: str,
+        changes: Dict[str, Any],
+        expected: Optional[Dict[str, Any]] = None
+    ) -> Optional[User]:
+        current = self._by_id.get(user_id)
+        if current is None:
+            raise NotFoundException("User not found")
+        if expected and any(getattr(current, name) != value for name, value in expected.items()):
+            return None
+
+        updated = current.model_copy(update=changes)
+        old_email = normalize_email(current.email)
+        new_email = normalize_email(updated.email)
+        if new_email != old_email:
+            if new_email in self._by_email:
+                raise ConflictException("User with this email already exists")
+            del self._by_email[old_email]
+            self._by_email[new_email] = user_id
+
+        self._by_id[user_id] = updated
+        return updated
+
+    def __len__(self) -> int:
+        return len(self._by_id)
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from datetime import datetime
 
+from shared.authentication.decorators import get_current_user, require_permission
+from shared.authentication.permissions import Permission
 from shared.core.base_controller import BaseController
 from shared.utils.config import config
+from shared.utils.password_pool import password_pool
+from ..authentication.v1.authentication_controller import auth_controller
 
 router = APIRouter()
 
@@ -10,6 +14,14 @@ router = APIRouter()
 class HealthController(BaseController):
     """Controller for health check endpoints."""
     
+    cache_policies = {
+        "health_check": "no-cache",
+        "readiness_check": "no-store",
+        "liveness_check": "no-store",
+        "admission_stats": "no-store",
+        "database_stats": "no-store",
+    }
+    
     def __init__(self):
         super().__init__()
 
@@ -18,17 +30,18 @@ health_controller = HealthController()
 
 
 @router.get("/")
-async def health_check():
+async def health_check(request: Request):
     """Basic health check endpoint."""
     try:
-        return health_controller.success_response(
+        return health_controller.envelope_response(
             data={
                 "service": "auth-service",
                 "status": "healthy",
                 "timestamp": datetime.utcnow().isoformat(),
                 "version": config.get("APP_VERSION", "1.0.0")
             },
-            message="Service is healthy"
+            message="Service is healthy",
+            request=request
         )
         
     except Exception as e:
@@ -40,11 +53,22 @@ async def health_check():
         )
 
 
+async def _check_database(request: Request) -> str:
+    database = getattr(request.app.state, "database", None)
+    if database is None:
+        return "healthy"
+    try:
+        await database.fetch_one("SELECT 1 AS ok", name="health")
+        return "healthy"
+    except Exception:
+        return "unhealthy"
+
+
 @router.get("/ready")
-async def readiness_check():
+async def readiness_check(request: Request):
     try:   
         checks = {
-            "database": "healthy",
+            "database": await _check_database(request),
             "jwt_config": "healthy" if config.get("JWT_SECRET_KEY") else "unhealthy",
             "service": "ready"
         }
@@ -53,7 +77,7 @@ async def readiness_check():
         
         status_code = status.HTTP_200_OK if overall_status == "ready" else status.HTTP_503_SERVICE_UNAVAILABLE
         
-        return health_controller.success_response(
+        return health_controller.envelope_response(
             status_code=status_code,
             data={
                 "service": "auth-service",
@@ -61,7 +85,8 @@ async def readiness_check():
                 "checks": checks,
                 "timestamp": datetime.utcnow().isoformat()
             },
-            message=f"Service is {overall_status}"
+            message=f"Service is {overall_status}",
+            request=request
         )
         
     except Exception as e:
@@ -74,16 +99,17 @@ async def readiness_check():
 
 
 @router.get("/live")
-async def liveness_check():
+async def liveness_check(request: Request):
     try:
-        return health_controller.success_response(
+        return health_controller.envelope_response(
             status_code= status.HTTP_200_OK,
             data={
                 "service": "auth-service",
                 "status": "alive",
                 "timestamp": datetime.utcnow().isoformat()
             },
-            message="Service is alive"
+            message="Service is alive",
+            request=request
         )
         
     except Exception as e:
@@ -93,3 +119,37 @@ async def liveness_check():
                 message="Liveness check failed"
             )
         )
+
+
+@router.get("/admission")
+@require_permission([Permission.SYSTEM_ADMIN.value])
+async def admission_stats(request: Request, current_user: dict = Depends(get_current_user)):
+    """Admission control, password hashing, write-behind and login throttle depths and shed counters."""
+    return health_controller.envelope_response(
+        data={
+            "service": "auth-service",
+            "admission": request.app.state.admission.stats(),
+            "password_pool": password_pool.stats(),
+            "write_behind": auth_controller.auth_service.side_effects.stats(),
+            "login_throttle": auth_controller.auth_service.login_throttle.stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        },
+        message="Admission control statistics",
+        request=request
+    )
+
+
+@router.get("/database")
+@require_permission([Permission.SYSTEM_ADMIN.value])
+async def database_stats(request: Request, current_user: dict = Depends(get_current_user)):
+    """Connection pool wait times and per-statement query latencies."""
+    database = getattr(request.app.state, "database", None)
+    return health_controller.envelope_response(
+        data={
+            "service": "auth-service",
+            "database": database.stats() if database is not None else None,
+            "timestamp": datetime.utcnow().isoformat()
+        },
+        message="Database statistics",
+        request=request
+    )
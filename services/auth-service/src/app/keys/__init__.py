@@ -0,0 +1 @@
+# Signing key discovery module
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Request
+from starlette.responses import Response
+
+from shared.authentication.jwt_handler import JWTHandler
+from shared.authentication.keys import KeyRing
+from shared.core.base_controller import BaseController
+from shared.core.responses import conditional_response
+
+router = APIRouter()
+
+EMPTY_JWKS = b'{"keys":[]}'
+
+
+class KeysController(BaseController):
+    """Controller publishing the public signing keys."""
+    
+    cache_policies = {
+        "jwks": "public, max-age=300",
+    }
+    
+    def __init__(self):
+        super().__init__()
+        self.jwt_handler = JWTHandler()
+    
+    def jwks_body(self) -> bytes:
+        """Get the serialized JWK set; symmetric keys are never published."""
+        codec = self.jwt_handler.codec
+        return codec.jwks() if isinstance(codec, KeyRing) else EMPTY_JWKS
+
+
+keys_controller = KeysController()
+
+
+@router.get("/.well-known/jwks.json")
+async def jwks(request: Request):
+    """Public keys for verifying access tokens, indexed by kid."""
+    response = Response(content=keys_controller.jwks_body(), media_type="application/jwk-set+json")
+    return conditional_response(response, request, keys_controller.get_cache_policy(request))
@@ -0,0 +1,109 @@
+"""Tests for admission control and load shedding."""
+
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from shared.authentication.jwt_handler import JWTHandler
+from shared.core.admission import (
+    AdmissionController,
+    AdmissionControlMiddleware,
+    ConcurrencyLimit,
+    Priority,
+)
+
+
+def test_queue_orders_by_priority_and_sheds_when_full():
+    """Test priority ordering, eviction of low-priority waiters and shedding."""
+    async def scenario():
+        limit = ConcurrencyLimit("test", max_concurrency=1, max_queue=2, queue_timeout=1.0)
+        assert await limit.acquire()
+        
+        order = []
+        
+        async def waiter(name, priority):
+            admitted = await limit.acquire(priority)
+            order.append((name, admitted))
+            if admitted:
+                limit.release()
+        
+        low = asyncio.create_task(waiter("low", Priority.LOW))
+        normal = asyncio.create_task(waiter("normal", Priority.NORMAL))
+        await asyncio.sleep(0)
+        assert limit.queue_depth == 2
+        
+        # Queue is full: a high-priority request evicts the low-priority waiter
+        high = asyncio.create_task(waiter("high", Priority.HIGH))
+        await asyncio.sleep(0)
+        # ...while another low-priority request is shed immediately
+        assert await limit.acquire(Priority.LOW) is False
+        
+        limit.release()
+        await asyncio.gather(low, normal, high)
+        return order, limit.stats()
+    
+    order, stats = asyncio.run(scenario())
+    assert order == [("low", False), ("high", True), ("normal", True)]
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["shed_by_priority"]["LOW"] == 2
+
+
+def test_queue_timeout_sheds_request():
+    """Test that waiters are shed once the queue timeout expires."""
+    async def scenario():
+        limit = ConcurrencyLimit("test", max_concurrency=1, max_queue=1, queue_timeout=0.01)
+        await limit.acquire()
+        return await limit.acquire(), limit.stats()
+    
+    admitted, stats = asyncio.run(scenario())
+    assert admitted is False
+    assert stats["timed_out"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_middleware_returns_503_and_serves_critical_paths():
+    """Test fast 503s with Retry-After while critical paths are still served."""
+    controller = AdmissionController(max_concurrency=0, max_queue=0, retry_after=3)
+    controller.set_priority("/live", Priority.CRITICAL)
+    
+    test_app = FastAPI()
+    test_app.add_middleware(AdmissionControlMiddleware, controller=controller)
+
+    @test_app.get("/live")
+    async def live():
+        return {"status": "alive"}
+
+    @test_app.get("/work")
+    async def work():
+        return {"status": "done"}
+
+    client = TestClient(test_app)
+    
+    response = client.get("/work")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert response.json()["success"] is False
+    
+    assert client.get("/live").status_code == 200
+    assert controller.stats()["limits"]["default"]["shed"] == 1
+
+
+def test_admission_stats_endpoint():
+    """Test that the auth service exposes admission statistics to administrators only."""
+    assert TestClient(app).get("/api/health/admission").status_code in (401, 403)
+    token = JWTHandler().create_access_token({"sub": "admin-1", "permissions": ["system:admin"]})
+    headers = {"Authorization": f"Bearer {token}"}
+    response = TestClient(app).get("/api/health/admission", headers=headers)
+    assert response.status_code == 200
+    
+    limits = response.json()["data"]["admission"]["limits"]
+    assert "default" in limits
+    assert "password_hashing" in limits
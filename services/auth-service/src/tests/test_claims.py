@@ -0,0 +1,68 @@
+"""Tests for compact token claims."""
+
+import jwt
+import pytest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from shared.authentication import claims
+from shared.authentication.claims import compact_claims, decode_permissions, encode_permissions, expand_claims
+from shared.authentication.jwt_handler import JWTHandler
+from shared.authentication.permissions import Permission
+
+ALL_PERMISSIONS = [permission.value for permission in Permission]
+
+
+def test_compact_round_trip():
+    """Test that compact claims expand back to the original claims."""
+    original = {
+        "sub": "user-1",
+        "email": "user@example.com",
+        "permissions": ["user:read", "system:admin", "reports:export"],
+        "type": "access",
+        "exp": 1700000000
+    }
+    compact = compact_claims(original)
+    assert set(compact) == {"sub", "em", "pm", "px", "t", "exp"}
+    assert compact["px"] == ["reports:export"]
+    
+    expanded = expand_claims(compact)
+    assert sorted(expanded.pop("permissions")) == sorted(original["permissions"])
+    assert expanded == {key: value for key, value in original.items() if key != "permissions"}
+
+
+def test_standard_claims_pass_through():
+    """Test that tokens issued in the standard format are left untouched."""
+    payload = {"sub": "user-1", "permissions": ["user:read"], "type": "access"}
+    assert expand_claims(payload) is payload
+
+
+def test_bitmap_versions_are_frozen(monkeypatch):
+    """Test that bitmaps from older table versions decode after a new version is added."""
+    encoded, extra = encode_permissions(["agent:read", "user:write"])
+    assert extra == []
+    
+    monkeypatch.setitem(claims.PERMISSION_TABLES, 2, claims.PERMISSION_TABLES[1] + ("billing:read",))
+    assert decode_permissions(encoded) == ["user:write", "agent:read"]
+    
+    with pytest.raises(jwt.DecodeError):
+        decode_permissions("_w")
+
+
+def test_compact_tokens_are_smaller_and_verify():
+    """Test that compact tokens shrink admin tokens and verify transparently."""
+    data = {"sub": "user-1", "email": "admin@example.com", "permissions": ALL_PERMISSIONS}
+    standard = JWTHandler(compact=False).create_access_token(data)
+    compact = JWTHandler(compact=True).create_access_token(data)
+    assert len(compact) < len(standard) / 2
+    
+    for token in (standard, compact):
+        payload = JWTHandler().verify_token(token)
+        assert payload["email"] == "admin@example.com"
+        assert payload["permissions"] == ALL_PERMISSIONS
+    
+    refresh = JWTHandler(compact=True).create_refresh_token({"sub": "user-1"})
+    assert JWTHandler().verify_token(refresh, "refresh")["sub"] == "user-1"
@@ -0,0 +1,122 @@
+"""Tests for the compression middleware."""
+
+import gzip
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from shared.core.compression import CompressedBodyCache, CompressionMiddleware, parse_accept_encoding
+from shared.core.responses import conditional_response
+
+LARGE_TEXT = "compressible payload " * 2000
+
+body_cache = CompressedBodyCache()
+
+
+def create_test_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache_min_size=1024, cache=body_cache)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE_TEXT)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/binary")
+    async def binary():
+        return Response(b"\x00" * 5000, media_type="image/png")
+
+    @app.get("/tagged")
+    async def tagged(request: Request):
+        return conditional_response(PlainTextResponse(LARGE_TEXT), request)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(5):
+                yield (f"line {i} " * 200).encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+test_app = create_test_app()
+client = TestClient(test_app)
+
+
+def _raw_get(path, accept_encoding):
+    # Read the raw body so the client does not transparently decode it
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_gzip_compression_and_cache_reuse():
+    """Test gzip encoding of large bodies and reuse of the compressed output."""
+    response, body = _raw_get("/large", "gzip")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) == len(body)
+    assert gzip.decompress(body).decode() == LARGE_TEXT
+    
+    hits = body_cache.hits
+    _, second = _raw_get("/large", "gzip")
+    assert second == body
+    assert body_cache.hits == hits + 1
+
+
+def test_brotli_preferred_when_available():
+    """Test brotli negotiation when the optional dependency is installed."""
+    brotli = pytest.importorskip("brotli")
+    response, body = _raw_get("/large", "gzip, deflate, br")
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(body).decode() == LARGE_TEXT
+
+
+def test_thresholds_and_content_type_rules():
+    """Test that small and non-compressible bodies are sent as-is."""
+    response, body = _raw_get("/small", "gzip")
+    assert "Content-Encoding" not in response.headers
+    assert body == b"tiny"
+    
+    response, _ = _raw_get("/binary", "gzip")
+    assert "Content-Encoding" not in response.headers
+    
+    response, _ = _raw_get("/large", "gzip;q=0, identity")
+    assert "Content-Encoding" not in response.headers
+
+
+def test_streaming_compression():
+    """Test that streamed bodies are compressed chunk by chunk."""
+    response, body = _raw_get("/stream", "gzip")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(body).decode() == "".join(f"line {i} " * 200 for i in range(5))
+
+
+def test_parse_accept_encoding():
+    """Test Accept-Encoding parsing with quality values."""
+    assert parse_accept_encoding("gzip;q=0.5, br;q=0, *") == {"gzip", "*"}
+
+
+def test_compressed_responses_carry_weak_etags():
+    """Test that only the identity body keeps a strong ETag, and 304s match the compressed one."""
+    identity, _ = _raw_get("/tagged", "identity")
+    strong = identity.headers["ETag"]
+    assert not strong.startswith("W/")
+
+    compressed, _ = _raw_get("/tagged", "gzip")
+    assert compressed.headers["ETag"] == "W/" + strong
+
+    revalidated = client.get("/tagged", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == "W/" + strong
+    assert "Accept-Encoding" in revalidated.headers["Vary"]
@@ -0,0 +1,60 @@
+"""Tests for ETag generation and conditional GET handling."""
+
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from shared.authentication.jwt_handler import JWTHandler
+from shared.core.responses import etag_matches
+
+client = TestClient(app)
+
+
+def test_openapi_schema_etag():
+    """Test that the OpenAPI schema carries a stable ETag and honours If-None-Match."""
+    first = client.get("/openapi.json")
+    assert first.status_code == 200
+    assert first.json()["info"]["title"] == "Authentication Service"
+    
+    etag = first.headers["ETag"]
+    assert client.get("/openapi.json").headers["ETag"] == etag
+    
+    revalidated = client.get("/openapi.json", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+
+
+def test_me_conditional_get_and_cache_policy():
+    """Test ETag, 304 and the declared Cache-Control policy on /me."""
+    token = JWTHandler().create_access_token({"sub": "user-1", "email": "etag@example.com", "permissions": []})
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = client.get("/v1/api/me", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    
+    etag = response.headers["ETag"]
+    revalidated = client.get("/v1/api/me", headers={**headers, "If-None-Match": f'W/{etag}, "other"'})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_health_responses_carry_etags():
+    """Test that health endpoints expose ETags and their cache policy."""
+    response = client.get("/api/health/live")
+    assert response.headers["Cache-Control"] == "no-store"
+    assert response.headers["ETag"].startswith('"')
+
+
+def test_etag_matching():
+    """Test If-None-Match parsing."""
+    assert etag_matches("*", '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert not etag_matches('"x"', '"abc"')
+    assert not etag_matches("", '"abc"')
@@ -0,0 +1,50 @@
+"""Tests for the service exception handlers."""
+
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from shared.core.exception_handlers import render_error_body
+
+client = TestClient(app)
+
+
+def test_invalid_credentials_envelope():
+    """Test that domain errors render the standard envelope at the top level."""
+    response = client.post("/v1/api/login", json={"email": "nobody@example.com", "password": "secret"})
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    
+    data = response.json()
+    assert data == {
+        "success": False,
+        "message": "Invalid credentials",
+        "status_code": 401,
+        "api_version": "v1"
+    }
+
+
+def test_validation_errors_include_details():
+    """Test that errors carrying details are rendered with them."""
+    response = client.post("/v1/api/register", json={
+        "email": "new@example.com",
+        "password": "weakpassword",
+        "first_name": "New",
+        "last_name": "User"
+    })
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert data["success"] is False
+    assert data["message"] == "Password does not meet requirements"
+    assert data["details"]["errors"]
+
+
+def test_common_error_bodies_are_prerendered():
+    """Test that common error bodies are served from the cache."""
+    assert render_error_body(401, "Invalid credentials", "v1") is render_error_body(401, "Invalid credentials", "v1")
@@ -0,0 +1,103 @@
+"""Tests for password hashers and rehash-on-login."""
+
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from app.authentication.v1.authentication_controller import auth_controller
+from shared.utils.hashers import Argon2Hasher, BcryptHasher, check_password
+from shared.utils import password_pool as password_pool_module
+from shared.utils.password_pool import PasswordHashingPool, password_pool
+
+USER = {
+    "email": "rehash@example.com",
+    "password": "Str0ng!Password",
+    "first_name": "Re",
+    "last_name": "Hash"
+}
+
+
+def test_bcrypt_hash_carries_its_cost():
+    """Test that the cost is read back from the hash to decide on rehashing."""
+    hashed = BcryptHasher(4).hash("secret")
+    assert check_password("secret", hashed)
+    assert not check_password("other", hashed)
+    assert not BcryptHasher(4).needs_rehash(hashed)
+    assert BcryptHasher(5).needs_rehash(hashed)
+    assert not BcryptHasher(4).needs_rehash(BcryptHasher(5).hash("secret"))
+    assert BcryptHasher(4).needs_rehash("$argon2id$v=19$m=65536,t=3,p=4$c2FsdA$aGFzaA")
+
+
+def test_bcrypt_calibration_stays_within_bounds():
+    """Test that calibration honours the minimum cost and the latency target."""
+    assert BcryptHasher.calibrate(target_ms=0.001, min_rounds=4).rounds == 4
+    assert BcryptHasher.calibrate(target_ms=10 ** 9, min_rounds=4, max_rounds=6).rounds == 6
+
+
+def test_pool_calibrates_once_at_start(monkeypatch):
+    """Test that the pool calibrates in start(), off the event loop, and not on first use."""
+    calls = []
+
+    def fake_hasher_from_environment(calibrate=True):
+        calls.append((calibrate, threading.current_thread() is threading.main_thread()))
+        return BcryptHasher(13 if calibrate else 12)
+
+    monkeypatch.setattr(password_pool_module, "hasher_from_environment", fake_hasher_from_environment)
+    pool = PasswordHashingPool()
+    asyncio.run(pool.start())
+    asyncio.run(pool.start())
+    assert pool.hasher.rounds == 13
+    assert calls == [(True, False)]
+    assert BcryptHasher.calibrate(target_ms=0.001).rounds == 12
+
+
+def test_argon2_hasher_round_trip():
+    """Test argon2 hashing when argon2-cffi is installed."""
+    pytest.importorskip("argon2")
+    hasher = Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1)
+    hashed = hasher.hash("secret")
+    assert check_password("secret", hashed)
+    assert not hasher.needs_rehash(hashed)
+    assert Argon2Hasher(time_cost=2, memory_cost=1024, parallelism=1).needs_rehash(hashed)
+
+
+def test_argon2_keeps_stronger_hashes_and_calibrates_above_defaults():
+    """Test that only lower argon2 parameters trigger a rehash and calibration keeps the default floor."""
+    pytest.importorskip("argon2")
+    stronger = Argon2Hasher(time_cost=2, memory_cost=2048, parallelism=2).hash("secret")
+    assert not Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1).needs_rehash(stronger)
+    assert Argon2Hasher(time_cost=1, memory_cost=4096, parallelism=1).needs_rehash(stronger)
+    assert Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=4).needs_rehash(stronger)
+
+    calibrated = Argon2Hasher.calibrate(target_ms=0.001, memory_cost=1024, parallelism=1)
+    assert calibrated.time_cost == 3
+
+
+def test_login_rehashes_outdated_hash_in_background():
+    """Test that a login with an outdated hash stores one made under the current policy."""
+    with TestClient(app) as client:
+        client.post("/v1/api/register", json=USER)
+        users = auth_controller.auth_service.users
+        user = client.portal.call(users.get_by_email, USER["email"])
+        client.portal.call(users.update, user.id, {"password_hash": BcryptHasher(4).hash(USER["password"])})
+
+        response = client.post("/v1/api/login", json={"email": USER["email"], "password": USER["password"]})
+        assert response.status_code == 200
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            user = client.portal.call(users.get_by_id, user.id)
+            if not password_pool.needs_rehash(user.password_hash):
+                break
+            time.sleep(0.05)
+
+    assert not password_pool.needs_rehash(user.password_hash)
+    assert check_password(USER["password"], user.password_hash)
@@ -15,7 +15,7 @@ client = TestClient(app)
 
 def test_health_check():
     """Test basic health check endpoint."""
-    response = client.get("/health/")
+    response = client.get("/api/health/")
     assert response.status_code == 200
     
     data = response.json()
@@ -28,7 +28,7 @@ def test_health_check():
 
 def test_readiness_check():
     """Test readiness check endpoint."""
-    response = client.get("/health/ready")
+    response = client.get("/api/health/ready")
     assert response.status_code == 200
     
     data = response.json()
@@ -40,7 +40,7 @@ def test_readiness_check():
 
 def test_liveness_check():
     """Test liveness check endpoint."""
-    response = client.get("/health/live")
+    response = client.get("/api/health/live")
     assert response.status_code == 200
     
     data = response.json()
@@ -0,0 +1,61 @@
+"""Tests for the HS256 fast-path codec."""
+
+import time
+import jwt
+import pytest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from shared.authentication.hs256 import HS256Codec
+from shared.authentication.jwt_handler import JWTHandler
+from shared.core.exceptions import AuthenticationException
+
+SECRET = "test-secret-key-with-at-least-32-bytes!"
+
+
+def test_codec_is_wire_compatible_with_pyjwt():
+    """Test that tokens round-trip between the codec and PyJWT in both directions."""
+    codec = HS256Codec(SECRET)
+    claims = {"sub": "user-1", "permissions": ["user:read"], "exp": int(time.time()) + 60, "type": "access"}
+    
+    token = codec.encode(claims)
+    assert token == jwt.encode(claims, SECRET, algorithm="HS256")
+    assert jwt.decode(token, SECRET, algorithms=["HS256"]) == claims
+    assert codec.decode(jwt.encode(claims, SECRET, algorithm="HS256")) == claims
+
+
+def test_codec_rejects_bad_tokens():
+    """Test rejection of tampered, expired, immature and non-HS256 tokens."""
+    codec = HS256Codec(SECRET)
+    token = codec.encode({"sub": "user-1", "exp": int(time.time()) + 60})
+    
+    with pytest.raises(jwt.InvalidSignatureError):
+        codec.decode(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+    with pytest.raises(jwt.InvalidSignatureError):
+        HS256Codec("another-secret-key-of-32-bytes-long").decode(token)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        codec.decode(codec.encode({"exp": int(time.time()) - 1}))
+    with pytest.raises(jwt.ImmatureSignatureError):
+        codec.decode(codec.encode({"nbf": int(time.time()) + 60}))
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        codec.decode(jwt.encode({"sub": "x"}, SECRET, algorithm="HS512"))
+    with pytest.raises(jwt.DecodeError):
+        codec.decode("not.a-token")
+    with pytest.raises(jwt.DecodeError):
+        codec.decode("a.b.c.d")
+
+
+def test_handler_tokens_use_integer_timestamps():
+    """Test that handler tokens carry integer exp claims and still verify."""
+    handler = JWTHandler()
+    token = handler.create_access_token({"sub": "user-1"})
+    
+    payload = jwt.decode(token, handler.secret_key, algorithms=["HS256"])
+    assert isinstance(payload["exp"], int)
+    assert handler.verify_token(token)["sub"] == "user-1"
+    
+    with pytest.raises(AuthenticationException, match="Invalid token"):
+        handler.verify_token(token + "x")
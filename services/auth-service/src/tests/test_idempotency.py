@@ -0,0 +1,154 @@
+"""Tests for Idempotency-Key request replay."""
+
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from shared.core.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+client = TestClient(app)
+
+USER = {
+    "email": "idempotent@example.com",
+    "password": "Str0ng!Password",
+    "first_name": "Idem",
+    "last_name": "Potent"
+}
+
+
+def test_register_retry_is_replayed():
+    """Test that a retried registration replays the first response instead of conflicting."""
+    headers = {"Idempotency-Key": "register-retry-1"}
+    
+    first = client.post("/v1/api/register", json=USER, headers=headers)
+    assert first.json()["success"] is True
+    assert "idempotent-replayed" not in first.headers
+    
+    retry = client.post("/v1/api/register", json=USER, headers=headers)
+    assert retry.status_code == first.status_code
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+
+
+def test_key_reused_with_different_payload_is_rejected():
+    """Test that an authenticated caller reusing a key with another request body gets 422."""
+    headers = {"Idempotency-Key": "register-retry-2", "Authorization": "Bearer caller-1"}
+    client.post("/v1/api/register", json={**USER, "email": "other@example.com"}, headers=headers)
+    
+    response = client.post("/v1/api/register", json={**USER, "email": "third@example.com"}, headers=headers)
+    assert response.status_code == 422
+    assert response.json()["success"] is False
+
+
+def test_anonymous_callers_do_not_share_keys():
+    """Test that anonymous requests with the same key but another body are not replayed."""
+    headers = {"Idempotency-Key": "shared-anonymous-key"}
+    first = client.post("/v1/api/register", json={**USER, "email": "anon-a@example.com"}, headers=headers)
+    second = client.post("/v1/api/register", json={**USER, "email": "anon-b@example.com"}, headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert "idempotent-replayed" not in second.headers
+    assert second.json()["data"]["user"]["email"] == "anon-b@example.com"
+
+
+def test_large_bodies_pass_through_and_receive_is_handed_off():
+    """Test that oversized bodies skip idempotency and the app reads the real receive channel."""
+    received = []
+    
+    async def echo_app(scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            received.append(message["type"])
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+        if scope["path"] == "/small":
+            received.append((await receive())["type"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": str(len(body)).encode()})
+    
+    store = IdempotencyStore(ttl_seconds=60, max_entries=10)
+    middleware = IdempotencyMiddleware(echo_app, store=store, paths=["/large", "/small"], max_request_size=8)
+    
+    async def request(path, chunks):
+        inbox = [{"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1} for index, chunk in enumerate(chunks)]
+        inbox.append({"type": "http.disconnect"})
+        sent = []
+        
+        async def receive():
+            return inbox.pop(0)
+        
+        async def send(message):
+            sent.append(message)
+        
+        scope = {"type": "http", "method": "POST", "path": path, "headers": [(b"idempotency-key", b"k")]}
+        await middleware(scope, receive, send)
+        return sent[1]["body"]
+    
+    assert asyncio.run(request("/large", [b"12345", b"67890", b"abc"])) == b"13"
+    assert store.stats()["stored"] == 0
+    assert asyncio.run(request("/small", [b"1234"])) == b"4"
+    assert received[-1] == "http.disconnect"
+    assert store.stats()["stored"] == 1
+
+
+def test_concurrent_duplicates_wait_for_in_flight_request():
+    """Test that duplicates run the handler once and share its response."""
+    calls = []
+    
+    async def slow_app(scope, receive, send):
+        await receive()
+        calls.append(scope["path"])
+        await asyncio.sleep(0.01)
+        await send({"type": "http.response.start", "status": 201, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"created":true}'})
+    
+    store = IdempotencyStore(ttl_seconds=60, max_entries=10)
+    middleware = IdempotencyMiddleware(slow_app, store=store, paths=["/register"])
+    
+    async def request():
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/register",
+            "headers": [(b"idempotency-key", b"abc")],
+        }
+        messages = []
+        
+        async def receive():
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+        
+        async def send(message):
+            messages.append(message)
+        
+        await middleware(scope, receive, send)
+        return messages
+    
+    async def scenario():
+        return await asyncio.gather(*(request() for _ in range(3)))
+    
+    results = asyncio.run(scenario())
+    assert calls == ["/register"]
+    assert all(messages[0]["status"] == 201 for messages in results)
+    assert all(messages[1]["body"] == b'{"created":true}' for messages in results)
+    assert store.stats() == {"stored": 1, "in_flight": 0, "replays": 2}
+
+
+def test_store_is_bounded_and_expires_entries():
+    """Test LRU eviction and TTL expiry of stored responses."""
+    from shared.core.idempotency import StoredResponse
+    
+    store = IdempotencyStore(ttl_seconds=60, max_entries=2)
+    for index in range(3):
+        store.put(("/p", b"", str(index)), StoredResponse(b"", 200, [], b"", float("inf")))
+    assert store.get(("/p", b"", "0")) is None
+    assert store.get(("/p", b"", "2")) is not None
+    
+    store.put(("/p", b"", "old"), StoredResponse(b"", 200, [], b"", 0.0))
+    assert store.get(("/p", b"", "old")) is None
@@ -0,0 +1,96 @@
+"""Tests for gateway identity headers."""
+
+import time
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from shared.authentication import decorators
+from shared.authentication.identity import IdentitySigner, NonceCache
+from shared.authentication.jwt_handler import JWTHandler
+from shared.core.exceptions import AuthenticationException, ServiceException
+
+client = TestClient(app)
+
+CLAIMS = {
+    "sub": "user-1",
+    "email": "gateway@example.com",
+    "permissions": ["user:read", "reports:export"],
+    "exp": int(time.time()) + 600,
+    "type": "access"
+}
+
+
+def test_identity_round_trip_and_replay_protection():
+    """Test that a header verifies once, for its own request and token only."""
+    signer = IdentitySigner(b"internal-key")
+    header = signer.sign(CLAIMS, "req-1", "token-1")
+    
+    with pytest.raises(AuthenticationException, match="another request"):
+        signer.verify(header, "req-2", "token-1")
+    with pytest.raises(AuthenticationException, match="another token"):
+        signer.verify(header, "req-1", "token-2")
+    
+    assert signer.verify(header, "req-1", "token-1") == CLAIMS
+    with pytest.raises(AuthenticationException, match="already been used"):
+        signer.verify(header, "req-1", "token-1")
+
+
+def test_full_nonce_cache_rejects_instead_of_forgetting():
+    """Test that unexpired nonces are never evicted to make room, so they cannot be replayed."""
+    nonces = NonceCache(3)
+    expires_at = time.time() + 30
+    for nonce in ("a", "b", "c"):
+        assert nonces.add(nonce, expires_at)
+    with pytest.raises(ServiceException) as raised:
+        nonces.add("d", expires_at)
+    assert raised.value.status_code == 503
+    assert int(raised.value.headers["Retry-After"]) >= 29
+    assert nonces.add("a", expires_at) is False
+
+    single = NonceCache(1)
+    single.add("old", time.time() - 1)
+    assert single.add("new", expires_at)
+    assert IdentitySigner(b"internal-key", ttl=10, max_rate=50).nonces.max_entries == 500
+
+
+def test_identity_rejects_forged_and_expired_headers():
+    """Test rejection of headers signed with another key or past their expiry."""
+    signer = IdentitySigner(b"internal-key")
+    with pytest.raises(AuthenticationException, match="Invalid"):
+        signer.verify(IdentitySigner(b"other-key").sign(CLAIMS, "req-1", "t"), "req-1", "t")
+    with pytest.raises(AuthenticationException, match="Invalid"):
+        signer.verify("garbage", "req-1", "t")
+    with pytest.raises(AuthenticationException, match="expired"):
+        signer.verify(IdentitySigner(b"internal-key", ttl=-1).sign(CLAIMS, "req-1", "t"), "req-1", "t")
+
+
+def test_get_current_user_trusts_identity_header(monkeypatch):
+    """Test that services use the identity header and fall back to the token without it."""
+    signer = IdentitySigner(b"internal-key")
+    monkeypatch.setattr(decorators, "identity_signer", signer)
+    
+    # The bearer token is never verified when a valid identity header is present
+    token = "opaque-token-checked-by-the-gateway"
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "X-Request-ID": "req-42",
+        "X-Identity": signer.sign(CLAIMS, "req-42", token),
+    }
+    response = client.get("/v1/api/me", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == "req-42"
+    assert response.json()["data"]["user"]["email"] == "gateway@example.com"
+    
+    # Replaying the same header is rejected
+    assert client.get("/v1/api/me", headers=headers).status_code == 401
+    
+    # Without the header the bearer token is verified as before
+    real_token = JWTHandler().create_access_token({"sub": "user-2", "email": "direct@example.com", "permissions": []})
+    response = client.get("/v1/api/me", headers={"Authorization": f"Bearer {real_token}"})
+    assert response.json()["data"]["user"]["email"] == "direct@example.com"
@@ -0,0 +1,151 @@
+"""Tests for asymmetric signing keys and JWKS verification."""
+
+import asyncio
+import json
+import time
+import jwt
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from app.keys.keys_controller import keys_controller
+from shared.authentication.jwt_handler import JWTHandler, codec_from_environment
+from shared.authentication.keys import JWKSCache, KeyRing, SigningKey, UnknownKeyError
+from shared.core.exceptions import AuthenticationException
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("algorithm", ["EdDSA", "RS256"])
+def test_key_ring_round_trip_and_pyjwt_interop(algorithm):
+    """Test signing with the active key and verifying with PyJWT and the ring."""
+    key = SigningKey.generate(algorithm)
+    ring = KeyRing([key])
+    claims = {"sub": "user-1", "exp": int(time.time()) + 60}
+    
+    token = ring.encode(claims)
+    assert jwt.get_unverified_header(token)["kid"] == key.kid
+    assert jwt.decode(token, key.public_key, algorithms=[algorithm]) == claims
+    assert ring.decode(token) == claims
+    assert ring.decode(jwt.encode(claims, key.private_key, algorithm=algorithm, headers={"kid": key.kid})) == claims
+
+
+def test_asymmetric_algorithm_without_keys_fails_at_startup(monkeypatch):
+    """Test that no worker silently signs with a key of its own."""
+    monkeypatch.delenv("JWT_PRIVATE_KEY_FILES", raising=False)
+    monkeypatch.delenv("JWT_JWKS_URL", raising=False)
+    codec_from_environment.cache_clear()
+    try:
+        with pytest.raises(ValueError, match="JWT_PRIVATE_KEY_FILES or JWT_JWKS_URL"):
+            codec_from_environment("EdDSA")
+    finally:
+        codec_from_environment.cache_clear()
+
+
+def test_key_rotation_keeps_old_tokens_valid():
+    """Test that retired keys verify until removed and unknown kids are rejected."""
+    old_key = SigningKey.generate()
+    ring = KeyRing([old_key])
+    old_token = ring.encode({"sub": "user-1"})
+    
+    new_key = SigningKey.generate()
+    ring.add(new_key, active=True)
+    assert jwt.get_unverified_header(ring.encode({"sub": "user-1"}))["kid"] == new_key.kid
+    assert ring.decode(old_token)["sub"] == "user-1"
+    
+    ring.remove(old_key.kid)
+    with pytest.raises(UnknownKeyError):
+        ring.decode(old_token)
+
+
+def test_jwks_cache_verifies_locally_and_refreshes_on_unknown_kid():
+    """Test JWKS-based verification, including picking up a rotated key."""
+    ring = KeyRing([SigningKey.generate()])
+    fetches = []
+    
+    async def fetch(url):
+        fetches.append(url)
+        return json.loads(ring.jwks())
+    
+    async def scenario():
+        cache = JWKSCache("http://auth/.well-known/jwks.json", min_refresh_interval=0, fetch=fetch)
+        await cache.start()
+        assert cache.decode(ring.encode({"sub": "user-1"}))["sub"] == "user-1"
+        
+        ring.add(SigningKey.generate(), active=True)
+        rotated = ring.encode({"sub": "user-2"})
+        with pytest.raises(UnknownKeyError):
+            cache.decode(rotated)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        claims = cache.decode(rotated)
+        await cache.stop()
+        return claims
+    
+    assert asyncio.run(scenario())["sub"] == "user-2"
+    assert len(fetches) == 2
+
+
+def test_handler_with_verifier_only_codec():
+    """Test that a JWKS-backed handler verifies but cannot mint tokens."""
+    ring = KeyRing([SigningKey.generate()])
+    signer = JWTHandler(codec=ring)
+    
+    async def fetch(url):
+        return {"keys": [ring.active.to_jwk()]}
+    
+    cache = JWKSCache("http://auth/.well-known/jwks.json", fetch=fetch)
+    asyncio.run(cache.refresh())
+    verifier = JWTHandler(codec=cache)
+    
+    assert verifier.verify_token(signer.create_access_token({"sub": "user-1"}))["sub"] == "user-1"
+    with pytest.raises(AuthenticationException):
+        verifier.verify_token(JWTHandler(codec=KeyRing([SigningKey.generate()])).create_access_token({"sub": "x"}))
+    with pytest.raises(ValueError):
+        verifier.create_access_token({"sub": "user-1"})
+
+
+def test_jwks_endpoint(monkeypatch):
+    """Test that the JWKS endpoint publishes public keys only, with caching headers."""
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
+    
+    key = SigningKey.generate()
+    monkeypatch.setattr(keys_controller.jwt_handler, "codec", KeyRing([key]))
+    response = client.get("/.well-known/jwks.json")
+    assert response.headers["content-type"] == "application/jwk-set+json"
+    assert response.headers["cache-control"] == "public, max-age=300"
+    
+    jwk = response.json()["keys"][0]
+    assert jwk["kid"] == key.kid
+    assert jwk["alg"] == "EdDSA"
+    assert "d" not in jwk
+    
+    assert client.get("/.well-known/jwks.json", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def test_lifespan_loads_jwks_before_serving():
+    """Test that the app lifespan starts the JWK set used by get_current_user."""
+    from shared.authentication.decorators import jwt_handler as token_verifier
+    
+    ring = KeyRing([SigningKey.generate()])
+    
+    async def fetch(url):
+        return {"keys": [ring.active.to_jwk()]}
+    
+    cache = JWKSCache("http://auth/.well-known/jwks.json", fetch=fetch)
+    previous, token_verifier.codec = token_verifier.codec, cache
+    try:
+        with TestClient(app) as lifespan_client:
+            assert cache.refreshes == 1
+            token = JWTHandler(codec=ring).create_access_token({"sub": "user-1", "permissions": []})
+            response = lifespan_client.get("/v1/api/me", headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200
+    finally:
+        token_verifier.codec = previous
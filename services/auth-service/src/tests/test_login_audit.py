@@ -0,0 +1,134 @@
+"""Tests for the segmented login attempt audit log."""
+
+import asyncio
+import json
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from app.authentication.v1.authentication_controller import auth_controller
+from app.authentication.v1.authentication_models import LoginAttempt
+from app.authentication.v1.login_audit import LoginAuditLog, decode_attempt, encode_attempt
+from shared.authentication.jwt_handler import JWTHandler
+from shared.core.segment_log import SegmentLog
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def attempt(minutes: int, email: str = "audit@example.com", ip: str = "10.0.0.1", success: bool = True) -> LoginAttempt:
+    return LoginAttempt(
+        id=str(uuid.uuid4()),
+        email=email,
+        ip_address=ip,
+        user_agent="pytest",
+        success=success,
+        failure_reason=None if success else "Invalid credentials",
+        created_at=START + timedelta(minutes=minutes)
+    )
+
+
+def test_encode_decode_round_trip():
+    """Test that attempts survive encoding, including IPv6, non-IP hosts and failures."""
+    for original in (
+        attempt(0),
+        attempt(1, ip="2001:db8::1", success=False),
+        LoginAttempt(
+            id="legacy-id", email="x@example.com", ip_address="unknown", user_agent="", success=False, created_at=START
+        ),
+    ):
+        timestamp = (original.created_at - datetime(1970, 1, 1)).total_seconds()
+        decoded = decode_attempt(timestamp, encode_attempt(original))
+        assert decoded.model_dump() == original.model_dump()
+
+
+def test_rotation_and_retention(tmp_path):
+    """Test that segments rotate by size and only the newest are kept."""
+    log = SegmentLog(str(tmp_path), max_segment_bytes=256, max_segments=3)
+    for second in range(100):
+        log.append(float(second), b"x" * 40)
+
+    stats = log.stats()
+    assert stats["segments"] == 3
+    assert stats["rotations"] > 3
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".log")]) == 3
+    timestamps = [timestamp for timestamp, _payload in log.scan()]
+    assert timestamps == sorted(timestamps) and timestamps[-1] == 99.0
+    log.close()
+
+
+def test_time_window_scan_and_recovery(tmp_path):
+    """Test windowed scans through the sparse index, and reopening after a torn write."""
+    log = SegmentLog(str(tmp_path), max_segment_bytes=4096, index_every=8)
+    log.append_many([(float(second), second.to_bytes(4, "little")) for second in range(500)])
+    # Timestamps are clamped so the log stays ordered
+    log.append(10.0, b"late")
+
+    window = [timestamp for timestamp, _payload in log.scan(100.0, 120.0)]
+    assert window == [float(second) for second in range(100, 121)]
+    log.close()
+
+    active = sorted(name for name in os.listdir(tmp_path) if name.endswith(".log"))[-1]
+    with open(tmp_path / active, "ab") as segment_file:
+        segment_file.write(b"\x10\x00\x00\x00torn")
+
+    reopened = SegmentLog(str(tmp_path), max_segment_bytes=4096, index_every=8)
+    records = list(reopened.scan())
+    assert len(records) == 501
+    assert records[-1] == (499.0, b"late")
+    reopened.append(600.0, b"next")
+    assert list(reopened.scan(550.0)) == [(600.0, b"next")]
+    reopened.close()
+
+
+def test_query_filters_by_email_ip_and_time(tmp_path):
+    """Test that queries filter by email, IP and window, and respect the limit."""
+    audit = LoginAuditLog(SegmentLog(str(tmp_path)))
+    asyncio.run(audit.add_many([
+        attempt(0),
+        attempt(1, email="other@example.com"),
+        attempt(2, ip="10.0.0.2", success=False),
+        attempt(3),
+    ]))
+
+    assert [a.created_at for a in audit.query(email="AUDIT@example.com")] == [
+        START, START + timedelta(minutes=2), START + timedelta(minutes=3)
+    ]
+    assert [a.success for a in audit.query(ip_address="10.0.0.2")] == [False]
+    assert len(list(audit.query(since=START + timedelta(minutes=1), until=START + timedelta(minutes=2)))) == 2
+    assert len(list(audit.query(limit=2))) == 2
+    audit.close()
+
+
+def test_admin_endpoint_streams_ndjson(tmp_path):
+    """Test that the admin endpoint requires system:admin and streams matching attempts."""
+    audit = LoginAuditLog(SegmentLog(str(tmp_path)))
+    asyncio.run(audit.add_many([attempt(0), attempt(1, email="other@example.com")]))
+    service = auth_controller.auth_service
+    previous, service.login_attempts = service.login_attempts, audit
+    handler = JWTHandler()
+    admin = handler.create_access_token({"sub": "admin-1", "email": "admin@example.com", "permissions": ["system:admin"]})
+    reader = handler.create_access_token({"sub": "user-1", "email": "user@example.com", "permissions": ["user:read"]})
+    try:
+        client = TestClient(app)
+        forbidden = client.get("/v1/api/admin/login-attempts", headers={"Authorization": f"Bearer {reader}"})
+        assert forbidden.status_code == 403
+
+        response = client.get(
+            "/v1/api/admin/login-attempts",
+            params={"email": "audit@example.com"},
+            headers={"Authorization": f"Bearer {admin}"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["email"] for line in lines] == ["audit@example.com"]
+    finally:
+        service.login_attempts = previous
+        audit.close()
@@ -0,0 +1,141 @@
+"""Tests for sliding-window login throttling."""
+
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from app.authentication.v1.authentication_controller import auth_controller
+from shared.authentication.login_throttle import LoginThrottle, SlidingWindowCounter, TrustedProxies
+from shared.core.exceptions import TooManyRequestsException
+from shared.utils.password_pool import password_pool
+
+USER = {
+    "email": "throttle@example.com",
+    "password": "Str0ng!Password",
+    "first_name": "Throt",
+    "last_name": "Tle"
+}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_counter_slides_out_old_slots():
+    """Test that counts are kept per key and expire slot by slot."""
+    clock = Clock()
+    counter = SlidingWindowCounter(window=10.0, buckets=5, width=256, depth=3, now=clock)
+    for _ in range(3):
+        counter.add("a")
+    clock.now += 4
+    counter.add("a")
+    counter.add("b")
+
+    assert counter.count("a") == 4
+    assert counter.count("b") == 1
+    # The first three fall out of the window before the fourth does
+    assert counter.retry_after("a", 4) == pytest.approx(6.0)
+    assert counter.retry_after("a", 1) == pytest.approx(10.0)
+    clock.now += 6
+    assert counter.count("a") == 1
+    clock.now += 4
+    assert counter.count("a") == 0
+
+
+def test_throttle_rejects_with_lockout_headers():
+    """Test that an email over its limit gets a 429 naming the scope, until the window passes."""
+    clock = Clock()
+    throttle = LoginThrottle({"email": 2, "ip": 0}, window=60.0, buckets=6, width=256, now=clock)
+    throttle.acquire("User@example.com", "10.0.0.1")
+    throttle.acquire("user@example.com", "10.0.0.2")
+
+    with pytest.raises(TooManyRequestsException) as raised:
+        throttle.acquire("user@example.com", "10.0.0.3")
+    assert raised.value.status_code == 429
+    assert raised.value.headers["X-Lockout-Scope"] == "email"
+    assert raised.value.headers["RateLimit-Remaining"] == "0"
+    assert int(raised.value.headers["Retry-After"]) == 60
+    assert throttle.stats()["rejected"] == {"email": 1}
+
+    throttle.acquire("other@example.com", "10.0.0.1")
+    clock.now += 60
+    throttle.acquire("user@example.com", "10.0.0.1")
+
+
+def test_subnet_scope_and_forgiveness():
+    """Test that addresses share a subnet budget and successful attempts are given back."""
+    throttle = LoginThrottle({"ip": 0, "email": 0, "subnet": 2}, now=Clock())
+    ticket = throttle.acquire("a@example.com", "192.0.2.10")
+    throttle.forgive(ticket)
+    throttle.acquire("b@example.com", "192.0.2.11")
+    throttle.acquire("c@example.com", "192.0.2.12")
+    throttle.acquire("d@example.com", "198.51.100.1")
+    throttle.acquire("e@example.com", "unknown")
+
+    with pytest.raises(TooManyRequestsException) as raised:
+        throttle.acquire("f@example.com", "192.0.2.200")
+    assert raised.value.headers["X-Lockout-Scope"] == "subnet"
+
+
+def test_login_is_throttled_before_password_hashing():
+    """Test that a throttled login returns 429 with lockout headers and never hashes."""
+    service = auth_controller.auth_service
+    previous = service.login_throttle
+    service.login_throttle = LoginThrottle({"email": 2})
+    try:
+        with TestClient(app) as client:
+            client.post("/v1/api/register", json=USER)
+            wrong = {"email": USER["email"], "password": "Wr0ng!Password"}
+            assert client.post("/v1/api/login", json=wrong).status_code == 401
+            assert client.post("/v1/api/login", json=wrong).status_code == 401
+
+            completed = password_pool.completed
+            response = client.post("/v1/api/login", json={"email": USER["email"], "password": USER["password"]})
+            assert response.status_code == 429
+            assert response.headers["X-Lockout-Scope"] == "email"
+            assert int(response.headers["Retry-After"]) >= 1
+            assert response.json()["success"] is False
+            assert password_pool.completed == completed
+    finally:
+        service.login_throttle = previous
+
+
+def test_client_ip_comes_from_trusted_proxies_only():
+    """Test that forwarding headers are believed only from trusted peers, past trusted hops."""
+    proxies = TrustedProxies(["172.16.0.0/12", "10.0.0.5"])
+    forwarded = {"x-forwarded-for": "203.0.113.9, 198.51.100.7, 10.0.0.5", "x-real-ip": "10.0.0.5"}
+
+    assert proxies.client_ip("172.18.0.3", forwarded) == "198.51.100.7"
+    assert proxies.client_ip("172.18.0.3", {"x-real-ip": "198.51.100.8"}) == "198.51.100.8"
+    assert proxies.client_ip("172.18.0.3", {"x-forwarded-for": "not-an-ip, 10.0.0.5"}) == "10.0.0.5"
+    assert proxies.client_ip("172.18.0.3", {}) == "172.18.0.3"
+    assert proxies.client_ip("198.51.100.7", {"x-forwarded-for": "203.0.113.9"}) == "198.51.100.7"
+    assert TrustedProxies().client_ip("172.18.0.3", forwarded) == "172.18.0.3"
+    assert proxies.client_ip(None, forwarded) == "unknown"
+
+
+def test_login_throttles_forwarded_clients_separately():
+    """Test that clients behind a trusted proxy do not share the proxy's IP budget."""
+    service = auth_controller.auth_service
+    previous = service.login_throttle, service.trusted_proxies
+    service.login_throttle = LoginThrottle({"ip": 1})
+    service.trusted_proxies = TrustedProxies(["172.16.0.0/12"])
+    try:
+        with TestClient(app, client=("172.18.0.3", 50000)) as client:
+            wrong = {"email": USER["email"], "password": "Wr0ng!Password"}
+            first = {"X-Forwarded-For": "198.51.100.1"}
+            assert client.post("/v1/api/login", json=wrong, headers=first).status_code == 401
+            assert client.post("/v1/api/login", json=wrong, headers=first).status_code == 429
+            second = {"X-Forwarded-For": "198.51.100.2"}
+            assert client.post("/v1/api/login", json=wrong, headers=second).status_code == 401
+    finally:
+        service.login_throttle, service.trusted_proxies = previous
@@ -0,0 +1,80 @@
+"""Tests for the request context middleware."""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from shared.core.middleware import RequestContextMiddleware
+from shared.core.versioning import APIVersion
+
+
+def create_test_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, default_version=APIVersion.V1)
+
+    @app.get("/v2/api/echo")
+    async def echo_v2(request: Request):
+        return {"request_id": request.state.request_id, "api_version": request.state.api_version.value}
+
+    @app.get("/echo")
+    async def echo(request: Request):
+        return {"api_version": request.state.api_version.value}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i};".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+client = TestClient(create_test_app(), raise_server_exceptions=False)
+
+
+def test_request_id_and_version_headers():
+    """Test that request ID and path version are exposed as headers and state."""
+    response = client.get("/v2/api/echo")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert response.headers["X-Request-ID"] == data["request_id"]
+    assert response.headers["X-API-Version"] == "v2"
+    assert data["api_version"] == "v2"
+
+
+def test_version_from_headers_and_default():
+    """Test header-based version negotiation and fallback to the default."""
+    assert client.get("/echo").headers["X-API-Version"] == "v1"
+    assert client.get("/echo", headers={"X-API-Version": "v2"}).json()["api_version"] == "v2"
+    assert client.get("/echo", headers={"Accept": "application/vnd.api+json;version=2"}).json()["api_version"] == "v2"
+
+
+def test_unhandled_exception_is_enveloped():
+    """Test that unhandled exceptions produce the standard error envelope."""
+    response = client.get("/boom")
+    assert response.status_code == 500
+    
+    data = response.json()
+    assert data["success"] is False
+    assert data["message"] == "Internal server error"
+    assert data["request_id"] == response.headers["X-Request-ID"]
+
+
+def test_streaming_response_passes_through():
+    """Test that streaming bodies are forwarded intact."""
+    response = client.get("/stream")
+    assert response.status_code == 200
+    assert response.text == "chunk-0;chunk-1;chunk-2;"
+    assert "X-Request-ID" in response.headers
@@ -0,0 +1,79 @@
+"""Tests for the password hashing pool."""
+
+import asyncio
+import threading
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from shared.authentication.jwt_handler import JWTHandler
+from shared.core.exceptions import ServiceException
+from shared.utils.password_pool import PasswordHashingPool
+
+
+def test_hash_and_verify_off_the_event_loop():
+    """Test that hashing runs on a worker thread and verifies."""
+    pool = PasswordHashingPool(max_workers=2)
+
+    async def scenario():
+        hashed = await pool.hash("Str0ng!Password")
+        return hashed, await pool.verify("Str0ng!Password", hashed), await pool.verify("wrong", hashed)
+
+    hashed, valid, invalid = asyncio.run(scenario())
+    assert hashed.startswith("$2")
+    assert valid and not invalid
+    assert pool.stats()["completed"] == 3
+    pool.shutdown()
+
+
+def test_pool_rejects_when_backlog_is_full():
+    """Test that calls beyond workers plus queue are rejected with a 503."""
+    pool = PasswordHashingPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        jobs = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert pool.stats()["saturation"] == 1.0
+        with pytest.raises(ServiceException) as error:
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(*jobs)
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["queue_depth"] == 0
+    pool.shutdown()
+
+
+def test_pool_times_out_but_keeps_the_slot():
+    """Test that a timed-out call raises while its job still counts as pending."""
+    pool = PasswordHashingPool(max_workers=1, timeout=0.05)
+    release = threading.Event()
+
+    async def scenario():
+        with pytest.raises(ServiceException):
+            await pool.run(release.wait)
+        pending = pool.pending
+        release.set()
+        await asyncio.sleep(0.05)
+        return pending
+
+    assert asyncio.run(scenario()) == 1
+    assert pool.stats()["timed_out"] == 1
+    pool.shutdown()
+
+
+def test_admission_endpoint_reports_password_pool():
+    """Test that pool saturation is exposed with the admission statistics."""
+    token = JWTHandler().create_access_token({"sub": "admin-1", "permissions": ["system:admin"]})
+    headers = {"Authorization": f"Bearer {token}"}
+    response = TestClient(app).get("/api/health/admission", headers=headers)
+    assert "saturation" in response.json()["data"]["password_pool"]
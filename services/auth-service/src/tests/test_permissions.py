@@ -0,0 +1,126 @@
+"""Tests for the bitmask permission engine."""
+
+import threading
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from shared.authentication.decorators import require_permission
+from shared.authentication import permissions as permissions_module
+from shared.authentication.permissions import (
+    Permission,
+    PermissionChecker,
+    permission_bit,
+    permissions_from_mask,
+)
+
+checker = PermissionChecker()
+
+
+def test_hierarchy_is_expanded():
+    """Test that inherited permissions are granted and others are not."""
+    admin = [Permission.ORG_ADMIN.value]
+    assert checker.has_permission(admin, Permission.USER_WRITE.value)
+    assert checker.has_permissions(admin, [Permission.AGENT_READ.value, Permission.ORG_WRITE.value])
+    assert not checker.has_permission(admin, Permission.USER_DELETE.value)
+    assert checker.has_any_permission(admin, [Permission.USER_DELETE.value, Permission.ORG_READ.value])
+    assert not checker.has_any_permission(admin, [])
+    assert checker.has_permissions(admin, [])
+    
+    assert checker.get_effective_permissions([Permission.SYSTEM_ADMIN.value]) == {
+        permission.value for permission in Permission
+    }
+
+
+def test_unknown_permissions_are_interned():
+    """Test that permissions outside the enum still work."""
+    assert checker.has_permission(["reports:export"], "reports:export")
+    assert not checker.has_permission(["user:read"], "reports:export")
+    assert permissions_from_mask(permission_bit("reports:export") | permission_bit("user:read")) == {
+        "reports:export", "user:read"
+    }
+
+
+def test_interning_is_thread_safe_and_bounded(monkeypatch):
+    """Test that concurrent interning hands out distinct bits and stops at the cap."""
+    names = [f"concurrent:{index}" for index in range(32)]
+    barrier = threading.Barrier(len(names))
+    bits = {}
+
+    def intern(name):
+        barrier.wait()
+        bits[name] = permission_bit(name)
+
+    threads = [threading.Thread(target=intern, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(bits.values())) == len(names)
+
+    monkeypatch.setattr(permissions_module, "_MAX_PERMISSIONS", len(permissions_module._permission_bits))
+    with pytest.raises(ValueError):
+        permission_bit("overflow:required")
+    assert not checker.has_permission(["overflow:held"], Permission.USER_READ.value)
+    assert checker.has_permission(["overflow:held", "user:read"], Permission.USER_READ.value)
+
+
+def test_effective_masks_are_memoized():
+    """Test that a permission tuple is only expanded once."""
+    permissions = [Permission.AGENT_READ.value, Permission.USER_READ.value]
+    mask = checker.effective_mask(permissions)
+    assert checker._effective_masks[tuple(permissions)] == mask
+    assert checker.effective_mask(tuple(permissions)) == mask
+
+
+def test_require_permission_stores_mask_on_request_state():
+    """Test the decorator's mask check and the mask left on request state."""
+    test_app = FastAPI()
+    users = {
+        "admin": {"sub": "1", "permissions": [Permission.ORG_ADMIN.value]},
+        "reader": {"sub": "2", "permissions": [Permission.USER_READ.value]},
+    }
+    
+    def current_user(request: Request):
+        return users[request.headers["x-user"]]
+    
+    @test_app.get("/agents")
+    @require_permission([Permission.AGENT_EXECUTE.value])
+    async def run_agent(request: Request, current_user: dict = Depends(current_user)):
+        return {"mask": request.state.permission_mask}
+    
+    client = TestClient(test_app)
+    response = client.get("/agents", headers={"x-user": "admin"})
+    assert response.status_code == 200
+    assert response.json()["mask"] == checker.effective_mask([Permission.ORG_ADMIN.value])
+    
+    assert client.get("/agents", headers={"x-user": "reader"}).status_code == 403
+
+
+def test_require_permission_injects_request_when_endpoint_has_none():
+    """Test that the mask is stored even when the endpoint takes no Request."""
+    test_app = FastAPI()
+    masks = []
+    
+    def current_user():
+        return {"sub": "2", "permissions": [Permission.USER_READ.value]}
+    
+    @test_app.middleware("http")
+    async def capture_mask(request, call_next):
+        response = await call_next(request)
+        masks.append(getattr(request.state, "permission_mask", None))
+        return response
+    
+    @test_app.get("/reports")
+    @require_permission([Permission.USER_READ.value])
+    async def reports(current_user: dict = Depends(current_user)):
+        return {"ok": True}
+    
+    client = TestClient(test_app)
+    assert client.get("/reports").json() == {"ok": True}
+    assert masks == [checker.effective_mask([Permission.USER_READ.value])]
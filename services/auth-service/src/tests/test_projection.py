@@ -0,0 +1,84 @@
+"""Tests for sparse fieldsets."""
+
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from shared.core.projection import compile_fields
+
+client = TestClient(app)
+
+USER = {
+    "email": "sparse@example.com",
+    "password": "Str0ng!Password",
+    "first_name": "Sparse",
+    "last_name": "User"
+}
+
+
+@pytest.fixture(scope="module")
+def tokens():
+    client.post("/v1/api/register", json=USER)
+    response = client.post("/v1/api/login", json={"email": USER["email"], "password": USER["password"]})
+    return response.json()["data"]["tokens"]
+
+
+def test_compile_fields_is_cached_per_field_set():
+    """Test that equivalent field parameters share one compiled projection."""
+    assert compile_fields(None) is None
+    assert compile_fields(" , ") is None
+    assert compile_fields("user.email,tokens") is compile_fields("tokens, user.email")
+
+
+def test_projection_handles_nesting_lists_and_unknown_fields():
+    """Test nested paths, list elements, whole-subtree selection and unknown fields."""
+    projection = compile_fields("user.email,items.id,meta,missing.field")
+    data = {
+        "user": {"email": "a@example.com", "id": "1"},
+        "items": [{"id": 1, "name": "x"}, {"id": 2, "name": "y"}],
+        "meta": {"page": 1},
+        "extra": True
+    }
+    assert projection.apply(data) == {
+        "user": {"email": "a@example.com"},
+        "items": [{"id": 1}, {"id": 2}],
+        "meta": {"page": 1}
+    }
+    assert compile_fields("user,user.email").apply(data) == {"user": data["user"]}
+
+
+def test_login_sparse_fieldset(tokens):
+    """Test that login only serializes the requested model fields."""
+    response = client.post(
+        "/v1/api/login?fields=user.email,tokens.access_token",
+        json={"email": USER["email"], "password": USER["password"]}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == {
+        "user": {"email": USER["email"]},
+        "tokens": {"access_token": response.json()["data"]["tokens"]["access_token"]}
+    }
+
+
+def test_me_sparse_fieldset_with_compact_envelope(tokens):
+    """Test projection of the current user together with the compact envelope."""
+    response = client.get(
+        "/v1/api/me?fields=user.email",
+        headers={"Authorization": f"Bearer {tokens['access_token']}", "Prefer": "envelope=compact"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"success": True, "data": {"user": {"email": USER["email"]}}}
+
+
+def test_register_sparse_fieldset():
+    """Test that endpoints answering through success_response honour fields= too."""
+    response = client.post(
+        "/v1/api/register?fields=user.email",
+        json={**USER, "email": "sparse-register@example.com"}
+    )
+    assert response.json()["data"] == {"user": {"email": "sparse-register@example.com"}}
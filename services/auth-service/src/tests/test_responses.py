@@ -0,0 +1,67 @@
+"""Tests for the serialized response envelope."""
+
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from shared.core.responses import build_envelope, json_dumps
+
+client = TestClient(app)
+
+USER = {
+    "email": "envelope@example.com",
+    "password": "Str0ng!Password",
+    "first_name": "Envelope",
+    "last_name": "User"
+}
+
+
+@pytest.fixture(scope="module")
+def registered_user():
+    response = client.post("/v1/api/register", json=USER)
+    assert response.json()["success"] is True
+    return USER
+
+
+def test_login_full_envelope(registered_user):
+    """Test that login returns the full envelope with serialized models."""
+    response = client.post("/v1/api/login", json={"email": USER["email"], "password": USER["password"]})
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["success"] is True
+    assert data["message"] == "Login successful"
+    assert data["status_code"] == 200
+    assert data["api_version"] == "v1"
+    assert data["data"]["tokens"]["token_type"] == "bearer"
+    assert data["data"]["user"]["email"] == USER["email"]
+
+
+def test_login_compact_envelope(registered_user):
+    """Test that clients can negotiate the compact envelope."""
+    response = client.post(
+        "/v1/api/login",
+        json={"email": USER["email"], "password": USER["password"]},
+        headers={"Prefer": "envelope=compact"}
+    )
+    assert response.status_code == 200
+    assert response.headers["Preference-Applied"] == "envelope=compact"
+    
+    data = response.json()
+    assert set(data) == {"success", "data"}
+    assert data["data"]["user"]["email"] == USER["email"]
+
+
+def test_json_dumps_handles_datetimes():
+    """Test that the serializer encodes datetimes as ISO strings."""
+    envelope = build_envelope({"at": datetime(2024, 1, 2, 3, 4, 5)}, api_version="v1")
+    assert json_dumps(envelope) == (
+        b'{"success":true,"message":"Success","status_code":200,'
+        b'"api_version":"v1","data":{"at":"2024-01-02T03:04:05"}}'
+    )
@@ -0,0 +1,135 @@
+"""Tests for token revocation."""
+
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from shared.authentication.jwt_handler import JWTHandler
+from shared.authentication.revocation import BloomFilter, RevocationStore
+from shared.authentication.token_store import SQLiteTokenBackend
+from shared.core.exceptions import AuthenticationException
+
+client = TestClient(app)
+
+USER = {
+    "email": "revocation@example.com",
+    "password": "Str0ng!Password",
+    "first_name": "Revo",
+    "last_name": "Cation"
+}
+
+
+@pytest.fixture(scope="module")
+def registered_user():
+    client.post("/v1/api/register", json=USER)
+    return USER
+
+
+def login():
+    response = client.post("/v1/api/login", json={"email": USER["email"], "password": USER["password"]})
+    return response.json()["data"]["tokens"]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added item is found and the false positive rate is low."""
+    bloom = BloomFilter(1000, error_rate=0.01)
+    for index in range(1000):
+        bloom.add(f"jti-{index}")
+    assert all(f"jti-{index}" in bloom for index in range(1000))
+    
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+
+
+def test_store_expires_entries_and_rebuilds():
+    """Test expiry of revocations and that rebuilds drop them from the filter."""
+    store = RevocationStore(capacity=2, rebuild_interval=3600)
+    store.revoke("expired", time.time() - 1)
+    assert not store.is_revoked("expired")
+    
+    store.revoke("short", time.time() + 0.05)
+    store.revoke("long", time.time() + 60)
+    assert store.is_revoked("short")
+    assert store.is_revoked("long")
+    
+    time.sleep(0.06)
+    assert not store.is_revoked("short")
+    store.rebuild()
+    assert store.stats()["revoked"] == 1
+    
+    # Exceeding capacity rebuilds the filter with room to grow
+    for index in range(5):
+        store.revoke(f"jti-{index}", time.time() + 60)
+    assert store.capacity >= 6
+    assert all(store.is_revoked(f"jti-{index}") for index in range(5))
+
+
+def test_revocations_are_shared_through_the_backend(tmp_path):
+    """Test that a token revoked on one worker is rejected by another after a sync."""
+    path = str(tmp_path / "tokens.db")
+    first = RevocationStore(backend=SQLiteTokenBackend(path))
+    second = RevocationStore(backend=SQLiteTokenBackend(path))
+
+    async def scenario():
+        await first.start()
+        await second.start()
+        first.revoke("jti-1", time.time() + 60)
+        first.revoke("jti-old", time.time() - 1)
+        assert not second.is_revoked("jti-1")
+        await first.sync()
+        await second.sync()
+        await first.stop()
+        await second.stop()
+
+    asyncio.run(scenario())
+    assert second.is_revoked("jti-1")
+    assert not second.is_revoked("jti-old")
+
+    restarted = RevocationStore(backend=SQLiteTokenBackend(path))
+    asyncio.run(restarted.sync())
+    assert restarted.is_revoked("jti-1")
+    for store in (first, second, restarted):
+        store.backend.close()
+
+
+def test_handler_rejects_revoked_tokens():
+    """Test that revoking a verified token makes later verifications fail."""
+    handler = JWTHandler(revocations=RevocationStore())
+    token = handler.create_access_token({"sub": "user-1"})
+    other = handler.create_access_token({"sub": "user-1"})
+    
+    handler.revoke(handler.verify_token(token))
+    with pytest.raises(AuthenticationException, match="revoked"):
+        handler.verify_token(token)
+    assert handler.verify_token(other)["sub"] == "user-1"
+
+
+def test_refresh_rotates_refresh_tokens(registered_user):
+    """Test that a refresh token can only be used once."""
+    refresh_token = login()["refresh_token"]
+    
+    response = client.post("/v1/api/refresh", json={"refresh_token": refresh_token})
+    assert response.json()["success"] is True
+    
+    response = client.post("/v1/api/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
+
+def test_logout_revokes_tokens(registered_user):
+    """Test that logout revokes the access token and the given refresh token."""
+    tokens = login()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/v1/api/me", headers=headers).status_code == 200
+    
+    response = client.post("/v1/api/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert response.json()["success"] is True
+    
+    assert client.get("/v1/api/me", headers=headers).status_code == 401
+    assert client.post("/v1/api/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
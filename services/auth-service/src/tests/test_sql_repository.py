@@ -0,0 +1,216 @@
+"""Tests for the SQL repositories and connection pool."""
+
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.authentication.v1.authentication_service import AuthenticationService
+from app.authentication.v1.authentication_models import LoginAttempt, RefreshToken, User
+from app.authentication.v1.sql_repository import (
+    SQLLoginAttemptRepository,
+    SQLRefreshTokenRepository,
+    SQLUserRepository,
+    create_schema,
+)
+from shared.core.database import Database
+from shared.core.exceptions import AuthenticationException, ConflictException, NotFoundException, ServiceException
+from shared.utils.helpers import generate_hash
+
+
+def make_user(user_id="user-1", email="Sql.User@Example.com"):
+    return User(
+        id=user_id,
+        email=email,
+        password_hash="hash",
+        first_name="Sql",
+        last_name="User",
+        permissions=["user:read", "agent:read"],
+        created_at=datetime.utcnow()
+    )
+
+
+async def open_database(size=2, acquire_timeout=5.0):
+    database = Database("sqlite:///:memory:", size=size, acquire_timeout=acquire_timeout)
+    await database.start()
+    await create_schema(database)
+    return database
+
+
+def test_user_repository_round_trip():
+    """Test inserts, case-insensitive lookups and conditional updates."""
+    async def scenario():
+        database = await open_database()
+        users = SQLUserRepository(database)
+        await users.add(make_user())
+        with pytest.raises(ConflictException):
+            await users.add(make_user("user-2", "sql.user@example.com"))
+
+        by_email = await users.get_by_email("SQL.USER@example.com")
+        skipped = await users.update("user-1", {"password_hash": "new"}, expected={"password_hash": "stale"})
+        updated = await users.update("user-1", {"password_hash": "new", "last_login": datetime.utcnow()})
+        with pytest.raises(NotFoundException):
+            await users.update("missing", {"first_name": "Nobody"})
+        moved = await users.update("user-1", {"email": "moved@example.com"})
+        old_email = await users.get_by_email("sql.user@example.com")
+        stats = database.stats()
+        await database.close()
+        return by_email, skipped, updated, moved, old_email, stats
+
+    by_email, skipped, updated, moved, old_email, stats = asyncio.run(scenario())
+    assert by_email.id == "user-1"
+    assert by_email.permissions == ["user:read", "agent:read"]
+    assert skipped is None
+    assert updated.password_hash == "new" and updated.last_login is not None
+    assert moved.email == "moved@example.com" and old_email is None
+    assert stats["queries"]["user_by_email"]["count"] == 2
+    assert stats["acquire_wait"]["count"] > 0
+
+
+def test_token_and_login_attempt_repositories():
+    """Test token lookups by hash and recent login attempts by email."""
+    async def scenario():
+        database = await open_database()
+        tokens = SQLRefreshTokenRepository(database)
+        attempts = SQLLoginAttemptRepository(database)
+        now = datetime.utcnow()
+
+        await tokens.add(RefreshToken(id="t1", user_id="user-1", token_hash="live", expires_at=now + timedelta(days=1), created_at=now))
+        await tokens.add(RefreshToken(id="t2", user_id="user-1", token_hash="expired", expires_at=now - timedelta(seconds=1), created_at=now))
+        await tokens.add(RefreshToken(id="t3", user_id="user-2", token_hash="once", expires_at=now + timedelta(days=1), created_at=now))
+        live, expired = await tokens.get_by_hash("live"), await tokens.get_by_hash("expired")
+        taken, taken_again = await tokens.pop("once"), await tokens.pop("once")
+        purged = await tokens.delete_expired()
+        deleted = await tokens.delete_user("user-1")
+
+        await attempts.add_many([
+            LoginAttempt(
+                id=f"a{index}", email="sql.user@example.com", ip_address="10.0.0.1", user_agent="test",
+                success=success, created_at=now + timedelta(seconds=index)
+            )
+            for index, success in enumerate((False, True))
+        ])
+        recent = await attempts.recent("sql.user@example.com", now - timedelta(minutes=1))
+        stats = database.stats()
+        await database.close()
+        return live, expired, taken, taken_again, purged, deleted, recent, stats
+
+    live, expired, taken, taken_again, purged, deleted, recent, stats = asyncio.run(scenario())
+    assert live.user_id == "user-1" and expired is None
+    assert taken.user_id == "user-2" and taken_again is None
+    assert purged == 1 and deleted == 1
+    assert [attempt.success for attempt in recent] == [True, False]
+    assert stats["queries"]["insert_login_attempts"]["count"] == 1
+
+
+def test_last_logins_are_written_in_one_batch():
+    """Test that a batch of last-login updates runs as one statement and skips unknown users."""
+    async def scenario():
+        database = await open_database()
+        users = SQLUserRepository(database)
+        await users.add(make_user())
+        await users.add(make_user("user-2", "second@example.com"))
+        seen = datetime.utcnow()
+        await users.set_last_logins([("user-1", seen), ("missing", seen), ("user-2", seen)])
+        result = [(await users.get_by_id(user_id)).last_login for user_id in ("user-1", "user-2")]
+        stats = database.stats()
+        await database.close()
+        return seen, result, stats
+
+    seen, result, stats = asyncio.run(scenario())
+    assert result == [seen, seen]
+    assert stats["queries"]["update_last_logins"]["count"] == 1
+    assert "update_user" not in stats["queries"]
+
+
+def test_add_many_rolls_back_the_whole_batch():
+    """Test that a failing row leaves none of its batch behind."""
+    async def scenario():
+        database = await open_database()
+        attempts = SQLLoginAttemptRepository(database)
+        now = datetime.utcnow()
+        batch = [
+            LoginAttempt(id=attempt_id, email="sql.user@example.com", ip_address="10.0.0.1", user_agent="test", success=False, created_at=now)
+            for attempt_id in ("a1", "a2", "a1")
+        ]
+        with pytest.raises(Exception):
+            await attempts.add_many(batch)
+        recent = await attempts.recent("sql.user@example.com", now - timedelta(minutes=1))
+        await database.close()
+        return recent
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_service_keeps_refresh_tokens_in_sql():
+    """Test that with a database the service issues, consumes and revokes refresh tokens in SQL."""
+    async def scenario():
+        database = await open_database()
+        service = AuthenticationService(users=SQLUserRepository(database))
+        service.refresh_tokens = SQLRefreshTokenRepository(database)
+        user = await service.users.add(make_user())
+        first = await service._generate_tokens(user)
+        stored = await service.refresh_tokens.get_by_hash(generate_hash(first.refresh_token))
+        second = await service.refresh_token(first.refresh_token)
+        with pytest.raises(AuthenticationException):
+            await service.refresh_token(first.refresh_token)
+        await service._delete_user_refresh_tokens(user.id)
+        remaining = await service.refresh_tokens.get_by_hash(generate_hash(second.refresh_token))
+        await database.close()
+        return stored, remaining
+
+    stored, remaining = asyncio.run(scenario())
+    assert stored.user_id == "user-1"
+    assert remaining is None
+
+
+def test_pool_times_out_when_exhausted():
+    """Test that waiting for a connection beyond the timeout returns a 503."""
+    async def scenario():
+        database = await open_database(size=1, acquire_timeout=0.05)
+        async with database.connection():
+            with pytest.raises(ServiceException) as error:
+                await database.fetch_one("SELECT 1 AS ok")
+        stats = database.stats()
+        await database.close()
+        return error.value, stats
+
+    error, stats = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert stats["timeouts"] == 1
+
+
+def test_cancelled_statement_does_not_return_its_connection():
+    """Test that a connection whose caller was cancelled mid-statement is replaced, not reused."""
+    async def scenario():
+        database = await open_database(size=1)
+        busy = await database.fetch_one("SELECT 1 AS ok")
+        original = database._connections[0]
+        slow = asyncio.ensure_future(database.fetch_one(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 2000000) SELECT count(*) AS c FROM n"
+        ))
+        await asyncio.sleep(0.05)
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+        row = await database.fetch_one("SELECT count(*) + 2 AS ok FROM users")
+        replacement = database._connections[0]
+        stats = database.stats()
+        await database.close()
+        return busy, row, original, replacement, stats
+
+    busy, row, original, replacement, stats = asyncio.run(scenario())
+    assert busy["ok"] == 1 and row["ok"] == 2
+    assert replacement is not original
+    assert stats["replaced"] == 1
+
+
+def test_pool_start_fails_for_unreachable_database():
+    """Test that connection problems surface at startup."""
+    database = Database("sqlite:////nonexistent/directory/auth.db", size=2)
+    with pytest.raises(Exception):
+        asyncio.run(database.start())
@@ -0,0 +1,71 @@
+"""Tests for the verified token cache."""
+
+import time
+import pytest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from shared.authentication.jwt_handler import JWTHandler
+from shared.authentication.token_cache import VerifiedTokenCache
+from shared.core.exceptions import AuthenticationException
+
+
+def test_cache_serves_repeat_verifications():
+    """Test that repeat verifications and extract helpers share one decode."""
+    handler = JWTHandler(token_cache=VerifiedTokenCache(max_entries=10))
+    token = handler.create_access_token({"sub": "user-1", "permissions": ["user:read"]})
+    
+    assert handler.verify_token(token)["sub"] == "user-1"
+    assert handler.extract_user_id(token) == "user-1"
+    assert handler.extract_user_permissions(token) == ["user:read"]
+    
+    stats = handler.token_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    
+    # Callers get a copy, so mutations do not leak into the cache
+    handler.verify_token(token)["sub"] = "tampered"
+    assert handler.verify_token(token)["sub"] == "user-1"
+
+
+def test_cache_checks_type_and_revocation_on_hits():
+    """Test that cached tokens still go through type and revocation checks."""
+    revoked = set()
+    handler = JWTHandler(
+        token_cache=VerifiedTokenCache(max_entries=10),
+        is_revoked=lambda payload: payload["sub"] in revoked
+    )
+    token = handler.create_access_token({"sub": "user-2"})
+    handler.verify_token(token)
+    
+    with pytest.raises(AuthenticationException):
+        handler.verify_token(token, "refresh")
+    
+    revoked.add("user-2")
+    with pytest.raises(AuthenticationException, match="revoked"):
+        handler.verify_token(token)
+    assert handler.token_cache.stats()["size"] == 0
+
+
+def test_cache_expires_entries_at_exp_and_is_bounded():
+    """Test expiry at the token's exp claim and LRU eviction."""
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.put("expired", {"exp": time.time() - 1})
+    assert cache.get("expired") is None
+    
+    cache.put("no-exp", {"sub": "x"})
+    assert cache.get("no-exp") is None
+    
+    for token in ("a", "b", "c"):
+        cache.put(token, {"exp": time.time() + 60})
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_is_opt_in():
+    """Test that handlers do not cache unless configured to."""
+    assert JWTHandler().token_cache is None
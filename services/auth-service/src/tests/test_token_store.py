@@ -0,0 +1,167 @@
+"""Tests for the expiring token store."""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from app.authentication.v1.authentication_models import PasswordResetToken, RefreshToken
+from shared.authentication.token_store import ExpiringTokenStore, SQLiteTokenBackend, TimingWheel
+
+client = TestClient(app)
+
+USER = {
+    "email": "sessions@example.com",
+    "password": "Str0ng!Password",
+    "first_name": "Sess",
+    "last_name": "Ion"
+}
+
+
+def make_token(model, token_hash, user_id="user-1", expires_in=3600):
+    now = datetime.utcnow()
+    return model(
+        id=token_hash,
+        user_id=user_id,
+        token_hash=token_hash,
+        expires_at=now + timedelta(seconds=expires_in),
+        created_at=now
+    )
+
+
+def test_timing_wheel_expires_keys_at_their_deadline():
+    """Test that keys expire on their tick across levels and the overflow set."""
+    wheel = TimingWheel(slot_bits=2, levels=2, now=0)
+    for deadline in (1, 3, 5, 17, 40, 100):
+        wheel.schedule(str(deadline), deadline)
+    wheel.cancel("17")
+
+    assert wheel.advance(2) == ["1"]
+    assert sorted(wheel.advance(16)) == ["3", "5"]
+    assert wheel.advance(99) == ["40"]
+    assert wheel.advance(100) == ["100"]
+    assert len(wheel) == 0
+
+
+def test_store_lookup_and_per_user_revocation():
+    """Test lookups by hash and dropping every record of a user."""
+    async def scenario():
+        store = ExpiringTokenStore(RefreshToken)
+        await store.put(make_token(RefreshToken, "a"))
+        await store.put(make_token(RefreshToken, "b"))
+        await store.put(make_token(RefreshToken, "c", user_id="user-2"))
+
+        assert (await store.get("a")).user_id == "user-1"
+        assert {token.token_hash for token in store.for_user("user-1")} == {"a", "b"}
+        assert await store.pop("a") is not None
+        assert await store.pop("a") is None
+
+        assert await store.delete_user("user-1") == 1
+        assert await store.get("b") is None
+        assert await store.get("c") is not None
+
+    asyncio.run(scenario())
+
+
+def test_store_evicts_expired_records():
+    """Test that expired records are evicted when the wheel advances."""
+    store = ExpiringTokenStore(PasswordResetToken)
+    asyncio.run(store.put(make_token(PasswordResetToken, "soon", expires_in=1)))
+    asyncio.run(store.put(make_token(PasswordResetToken, "later")))
+
+    assert store.expire(datetime.utcnow().timestamp() + 5) == 1
+    assert asyncio.run(store.get("soon")) is None
+    assert store.stats()["records"] == 1
+
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    """Test that records are reloaded from the backend and deletions persist."""
+    path = str(tmp_path / "tokens.db")
+
+    async def write():
+        store = ExpiringTokenStore(RefreshToken, backend=SQLiteTokenBackend(path))
+        await store.put(make_token(RefreshToken, "kept"))
+        await store.put(make_token(RefreshToken, "dropped"))
+        await store.delete("dropped")
+        store.backend.close()
+
+    asyncio.run(write())
+    reloaded = ExpiringTokenStore(RefreshToken, backend=SQLiteTokenBackend(path))
+    assert asyncio.run(reloaded.get("kept")).user_id == "user-1"
+    assert asyncio.run(reloaded.get("dropped")) is None
+    assert len(ExpiringTokenStore(PasswordResetToken, backend=reloaded.backend)) == 0
+
+
+def test_stores_sharing_a_backend_see_each_others_records(tmp_path):
+    """Test that a worker can consume a record written by another, but only once."""
+    path = str(tmp_path / "tokens.db")
+    issuer = ExpiringTokenStore(RefreshToken, backend=SQLiteTokenBackend(path))
+    worker = ExpiringTokenStore(RefreshToken, backend=SQLiteTokenBackend(path))
+
+    async def scenario():
+        await issuer.put(make_token(RefreshToken, "shared"))
+        await issuer.put(make_token(RefreshToken, "other"))
+
+        assert (await worker.get("shared")).user_id == "user-1"
+        assert (await worker.pop("shared")).token_hash == "shared"
+        assert await issuer.pop("shared") is None
+        assert await worker.delete_user("user-1") == 1
+        assert await issuer.pop("other") is None
+
+    asyncio.run(scenario())
+    issuer.backend.close()
+    worker.backend.close()
+
+
+def test_backend_calls_stay_off_the_event_loop(tmp_path):
+    """Test that every backend call runs on a worker thread."""
+    backend = SQLiteTokenBackend(str(tmp_path / "tokens.db"))
+    store = ExpiringTokenStore(RefreshToken, backend=backend)
+    loop_thread = threading.get_ident()
+    threads = []
+    for name in ("save", "get", "take", "delete", "delete_user"):
+        method = getattr(backend, name)
+
+        def record(*args, _method=method):
+            threads.append(threading.get_ident())
+            return _method(*args)
+
+        setattr(backend, name, record)
+
+    async def scenario():
+        await store.put(make_token(RefreshToken, "a"))
+        await store.put(make_token(RefreshToken, "b"))
+        store._records.clear()
+        await store.get("a")
+        await store.pop("a")
+        await store.delete("b")
+        await store.delete_user("user-1")
+
+    asyncio.run(scenario())
+    assert len(threads) == 6 and loop_thread not in threads
+    backend.close()
+
+
+def test_change_password_ends_all_sessions():
+    """Test that changing the password invalidates every refresh token of the user."""
+    client.post("/v1/api/register", json=USER)
+    credentials = {"email": USER["email"], "password": USER["password"]}
+    first = client.post("/v1/api/login", json=credentials).json()["data"]["tokens"]
+    second = client.post("/v1/api/login", json=credentials).json()["data"]["tokens"]
+
+    response = client.post(
+        "/v1/api/change-password",
+        json={"current_password": USER["password"], "new_password": "N3w!Password"},
+        headers={"Authorization": f"Bearer {second['access_token']}"}
+    )
+    assert response.status_code == 200
+
+    for tokens in (first, second):
+        assert client.post("/v1/api/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
@@ -0,0 +1,76 @@
+"""Tests for the user repository."""
+
+import asyncio
+from datetime import datetime
+import pytest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.authentication.v1.authentication_models import User
+from app.authentication.v1.user_repository import InMemoryUserRepository
+from shared.core.exceptions import ConflictException, NotFoundException
+
+
+def make_user(user_id="user-1", email="Repo.User@Example.com"):
+    return User(
+        id=user_id,
+        email=email,
+        password_hash="hash",
+        first_name="Repo",
+        last_name="User",
+        created_at=datetime.utcnow()
+    )
+
+
+def test_lookups_ignore_email_case():
+    """Test that users are found by ID and by email in any case."""
+    async def scenario():
+        repository = InMemoryUserRepository()
+        await repository.add(make_user())
+        with pytest.raises(ConflictException):
+            await repository.add(make_user("user-2", "repo.user@example.com"))
+        return await repository.get_by_email(" REPO.USER@example.com"), await repository.get_by_id("user-1")
+
+    by_email, by_id = asyncio.run(scenario())
+    assert by_email is by_id
+    assert by_id.email == "Repo.User@example.com"
+
+
+def test_update_keeps_indexes_consistent():
+    """Test that changing the email moves the email index entry."""
+    async def scenario():
+        repository = InMemoryUserRepository()
+        await repository.add(make_user())
+        await repository.add(make_user("user-2", "taken@example.com"))
+        with pytest.raises(ConflictException):
+            await repository.update("user-1", {"email": "Taken@example.com"})
+        with pytest.raises(NotFoundException):
+            await repository.update("missing", {"first_name": "Nobody"})
+
+        await repository.update("user-1", {"email": "new@example.com"})
+        return (
+            await repository.get_by_email("repo.user@example.com"),
+            await repository.get_by_email("NEW@example.com"),
+        )
+
+    old, new = asyncio.run(scenario())
+    assert old is None
+    assert new.id == "user-1"
+
+
+def test_conditional_update():
+    """Test that an update is skipped when an expected field has changed."""
+    async def scenario():
+        repository = InMemoryUserRepository()
+        original = await repository.add(make_user())
+        skipped = await repository.update("user-1", {"password_hash": "new"}, expected={"password_hash": "stale"})
+        applied = await repository.update("user-1", {"password_hash": "new"}, expected={"password_hash": "hash"})
+        return original, skipped, applied
+
+    original, skipped, applied = asyncio.run(scenario())
+    assert skipped is None
+    assert applied.password_hash == "new"
+    assert original.password_hash == "hash"
@@ -0,0 +1,66 @@
+"""Tests for compiled validation rules."""
+
+import pytest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from shared.core.base_service import BaseService
+from shared.core.exceptions import ValidationException
+from shared.core.validation import compile_rules
+
+
+def _no_spaces(value):
+    if " " in value:
+        raise ValueError("must not contain spaces")
+
+
+RULES = {
+    "username": {"required": True, "type": str, "min_length": 3, "max_length": 8, "validator": _no_spaces},
+    "age": {"type": int},
+    "nickname": {"min_length": 2},
+}
+
+
+class SampleService(BaseService):
+    pass
+
+
+def test_reports_every_error_in_one_pass():
+    """Test that all failing rules are reported together."""
+    errors = compile_rules(RULES).errors({"username": "a b", "age": "old", "nickname": "x"})
+    assert errors == [
+        "username: must not contain spaces",
+        "age must be of type int",
+        "nickname must be at least 2 characters long",
+    ]
+
+
+def test_required_and_optional_fields():
+    """Test required handling and skipping of missing optional fields."""
+    validator = compile_rules(RULES)
+    assert validator.errors({"username": ""}) == ["username is required"]
+    assert validator.errors({"username": "valid"}) == []
+
+
+def test_validators_are_cached():
+    """Test that rules compile once by identity and by structure."""
+    assert compile_rules(RULES) is compile_rules(RULES)
+    assert compile_rules({"name": {"required": True}}) is compile_rules({"name": {"required": True}})
+
+
+def test_base_service_validate_input_and_batch():
+    """Test the BaseService entry points."""
+    service = SampleService()
+    
+    with pytest.raises(ValidationException) as exc_info:
+        service.validate_input({}, RULES)
+    assert exc_info.value.details == {"errors": ["username is required"]}
+    
+    results = service.validate_batch([{"username": "alice"}, {"username": "toolongname"}, {}], RULES)
+    assert results == {
+        1: ["username must be at most 8 characters long"],
+        2: ["username is required"],
+    }
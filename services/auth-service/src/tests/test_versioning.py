@@ -0,0 +1,99 @@
+"""Tests for the compiled version dispatch table."""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from shared.core.middleware import RequestContextMiddleware
+from shared.core.versioning import APIVersion, VersionDispatchTable, create_versioned_router
+
+v2_router = create_versioned_router(APIVersion.V2)
+
+
+@v2_router.get("/items")
+async def list_items(request: Request):
+    return {"api_version": request.state.api_version.value}
+
+
+@v2_router.get("/items/{item_id}")
+async def get_item(item_id: str):
+    return {"id": item_id}
+
+
+def create_test_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        RequestContextMiddleware,
+        version_table=VersionDispatchTable([v2_router], sunset_dates={APIVersion.V1: "Wed, 01 Jan 2031 00:00:00 GMT"})
+    )
+    app.include_router(v2_router)
+
+    @app.get("/api/status")
+    async def status():
+        return {"status": "ok"}
+
+    return app
+
+
+client = TestClient(create_test_app())
+
+
+def test_table_resolution():
+    """Test path and header resolution without the middleware."""
+    table = VersionDispatchTable([v2_router])
+    assert table.resolve_path("/v2/api/items") is APIVersion.V2
+    assert table.resolve_path("/api/items") is None
+    assert table.resolve_headers([(b"accept", b"application/vnd.api+json;version=2")]) is APIVersion.V2
+    assert table.resolve_headers([(b"x-api-version", b" V2 ")]) is APIVersion.V2
+    assert table.resolve_headers([(b"x-api-version", b"v9")]) is None
+    assert table.dispatch_path(APIVersion.V2, "/api/items") == "/v2/api/items"
+    assert table.dispatch_path(APIVersion.V2, "/api/items/42") == "/v2/api/items/42"
+    assert table.dispatch_path(APIVersion.V2, "/api/missing") is None
+
+
+def test_header_negotiated_dispatch():
+    """Test that unversioned paths dispatch to the negotiated versioned router."""
+    response = client.get("/api/items", headers={"X-API-Version": "2"})
+    assert response.status_code == 200
+    assert response.json() == {"api_version": "v2"}
+    
+    response = client.get("/api/items/7", headers={"Accept": "application/json;version=2"})
+    assert response.json() == {"id": "7"}
+
+
+def test_unversioned_routes_are_not_redirected():
+    """Test that paths without a versioned counterpart are left untouched."""
+    response = client.get("/api/status", headers={"X-API-Version": "v2"})
+    assert response.status_code == 200
+    assert response.headers["X-API-Version"] == "v2"
+
+
+def test_deprecation_headers_from_table():
+    """Test that deprecated versions carry the precomputed deprecation headers."""
+    response = client.get("/api/status")
+    assert response.headers["X-API-Version"] == "v1"
+    assert response.headers["Deprecation"] == "true"
+    assert response.headers["X-API-Deprecated-Version"] == "v1"
+    assert response.headers["Sunset"] == "Wed, 01 Jan 2031 00:00:00 GMT"
+    
+    response = client.get("/v2/api/items")
+    assert "Deprecation" not in response.headers
+
+
+def test_only_served_version_is_not_deprecated():
+    """Test that the newest served version carries no deprecation headers."""
+    v1_router = create_versioned_router(APIVersion.V1)
+
+    @v1_router.get("/things")
+    async def list_things():
+        return []
+
+    table = VersionDispatchTable([v1_router])
+    assert table.response_headers(APIVersion.V1) == [(b"x-api-version", b"v1")]
+    both = VersionDispatchTable([v1_router, v2_router])
+    assert (b"deprecation", b"true") in both.response_headers(APIVersion.V1)
@@ -0,0 +1,157 @@
+"""Tests for the write-behind queue."""
+
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.app import app
+from app.authentication.v1.authentication_controller import auth_controller
+from shared.core.exceptions import ServiceException
+from shared.core.write_behind import WriteBehindQueue
+
+USER = {
+    "email": "writebehind@example.com",
+    "password": "Str0ng!Password",
+    "first_name": "Write",
+    "last_name": "Behind"
+}
+
+
+def recorder():
+    batches = []
+
+    async def handler(batch):
+        batches.append(list(batch))
+
+    return batches, handler
+
+
+def test_coalesces_keyed_writes_and_flushes_on_interval():
+    """Test that keyed writes replace each other and flush after the interval."""
+    batches, handler = recorder()
+
+    async def scenario():
+        queue = WriteBehindQueue({"touch": handler}, flush_interval=0.05)
+        for value in range(3):
+            await queue.submit("touch", ("user-1", value), key="user-1")
+        await queue.submit("touch", ("user-2", 0), key="user-2")
+        assert batches == []
+        await asyncio.sleep(0.15)
+        await queue.stop()
+        return queue.stats()
+
+    stats = asyncio.run(scenario())
+    assert batches == [[("user-1", 2), ("user-2", 0)]]
+    assert stats["coalesced"] == 2
+    assert stats["flushed"] == 2
+
+
+def test_flushes_when_batch_is_full():
+    """Test that reaching max_batch flushes without waiting for the interval."""
+    batches, handler = recorder()
+
+    async def scenario():
+        queue = WriteBehindQueue({"log": handler}, max_batch=2, flush_interval=60)
+        for value in range(4):
+            await queue.submit("log", value)
+        await asyncio.sleep(0.01)
+        flushed = list(batches)
+        await queue.stop()
+        return flushed
+
+    assert asyncio.run(scenario()) == [[0, 1], [2, 3]]
+
+
+def test_backpressure_rejects_when_full():
+    """Test that submitters wait for space and get a 503 when none frees up."""
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def slow(batch):
+            await gate.wait()
+
+        queue = WriteBehindQueue({"log": slow}, max_batch=1, max_pending=1, flush_interval=60, enqueue_timeout=0.05)
+        await queue.submit("log", 1)
+        await asyncio.sleep(0.01)  # the flusher takes the first write and blocks
+        await queue.submit("log", 2)
+        with pytest.raises(ServiceException) as error:
+            await queue.submit("log", 3)
+        gate.set()
+        await queue.stop()
+        return error.value, queue.stats()
+
+    error, stats = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert stats["rejected"] == 1
+    assert stats["flushed"] == 2
+
+
+def test_offer_drops_and_counts_when_full():
+    """Test that offer never waits: a full queue drops new writes but still coalesces keyed ones."""
+    batches, handler = recorder()
+
+    async def scenario():
+        queue = WriteBehindQueue({"touch": handler}, max_pending=1, flush_interval=60)
+        accepted = [
+            queue.offer("touch", ("user-1", 0), key="user-1"),
+            queue.offer("touch", ("user-2", 0), key="user-2"),
+            queue.offer("touch", ("user-1", 1), key="user-1"),
+        ]
+        await queue.stop()
+        return accepted, queue.stats()
+
+    accepted, stats = asyncio.run(scenario())
+    assert accepted == [True, False, True]
+    assert batches == [[("user-1", 1)]]
+    assert stats["dropped"] == 1
+    assert stats["rejected"] == 0
+
+
+def test_stop_drains_pending_writes():
+    """Test that stopping applies every pending write."""
+    batches, handler = recorder()
+
+    async def scenario():
+        queue = WriteBehindQueue({"log": handler}, max_batch=10, flush_interval=60)
+        for value in range(25):
+            await queue.submit("log", value)
+        await queue.stop()
+        return len(queue)
+
+    assert asyncio.run(scenario()) == 0
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+
+
+def test_login_records_last_login_behind_the_response():
+    """Test that the last-login update is applied by the queue after login."""
+    service = auth_controller.auth_service
+    with TestClient(app) as client:
+        client.post("/v1/api/register", json=USER)
+        response = client.post("/v1/api/login", json={"email": USER["email"], "password": USER["password"]})
+        assert response.status_code == 200
+
+    # Shutdown drains the queue
+    user = asyncio.run(service.users.get_by_email(USER["email"]))
+    assert user.last_login is not None
+    assert service.side_effects.stats()["pending"] == 0
+
+
+def test_full_queue_does_not_fail_login():
+    """Test that a login succeeds when its bookkeeping writes have to be dropped."""
+    service = auth_controller.auth_service
+    user = {**USER, "email": "writebehind-full@example.com"}
+    with TestClient(app) as client:
+        client.post("/v1/api/register", json=user)
+        max_pending, service.side_effects.max_pending = service.side_effects.max_pending, 0
+        dropped = service.side_effects.dropped
+        try:
+            response = client.post("/v1/api/login", json={"email": user["email"], "password": user["password"]})
+        finally:
+            service.side_effects.max_pending = max_pending
+        assert response.status_code == 200
+        assert service.side_effects.dropped == dropped + 2
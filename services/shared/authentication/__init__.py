@@ -1,13 +1,35 @@
 """Shared authentication utilities."""
 
 from .jwt_handler import JWTHandler
-from .decorators import require_auth, require_permission
-from .permissions import Permission, PermissionChecker
+from .token_cache import VerifiedTokenCache
+from .keys import JWKSCache, KeyRing, SigningKey
+from .identity import IdentitySigner
+from .revocation import BloomFilter, RevocationStore
+from .login_throttle import LoginThrottle, SlidingWindowCounter, TrustedProxies
+from .token_store import ExpiringTokenStore, SQLiteTokenBackend, TimingWheel
+from .decorators import require_auth, require_permission, get_permission_mask
+from .permissions import Permission, PermissionChecker, permission_bit, permissions_from_mask
 
 __all__ = [
     "JWTHandler",
+    "VerifiedTokenCache",
+    "JWKSCache",
+    "KeyRing",
+    "SigningKey",
+    "IdentitySigner",
+    "BloomFilter",
+    "RevocationStore",
+    "LoginThrottle",
+    "SlidingWindowCounter",
+    "TrustedProxies",
+    "ExpiringTokenStore",
+    "SQLiteTokenBackend",
+    "TimingWheel",
     "require_auth",
     "require_permission", 
+    "get_permission_mask",
     "Permission",
     "PermissionChecker",
+    "permission_bit",
+    "permissions_from_mask",
 ]
@@ -0,0 +1,98 @@
+"""Compact access token claims with a versioned permission bitmap."""
+
+from typing import Any, Dict, List, Tuple
+
+import jwt
+
+from .hs256 import b64url_decode, b64url_encode
+
+# Claim names shortened in compact tokens
+SHORT_CLAIMS = {"email": "em", "type": "t"}
+_LONG_CLAIMS = {short: name for name, short in SHORT_CLAIMS.items()}
+
+PERMISSION_BITMAP_CLAIM = "pm"
+EXTRA_PERMISSIONS_CLAIM = "px"
+
+# Bit order of the permission bitmap, per encoding version. Published
+# versions are frozen: adding a permission means adding a new version, so
+# tokens that are already issued keep decoding to the same permissions.
+PERMISSION_TABLES: Dict[int, Tuple[str, ...]] = {
+    1: (
+        "user:read",
+        "user:write",
+        "user:delete",
+        "organization:read",
+        "organization:write",
+        "organization:delete",
+        "organization:admin",
+        "agent:read",
+        "agent:write",
+        "agent:delete",
+        "agent:execute",
+        "system:admin",
+        "system:read",
+    ),
+}
+CURRENT_TABLE_VERSION = max(PERMISSION_TABLES)
+
+_table_bits = {
+    version: {permission: 1 << index for index, permission in enumerate(table)}
+    for version, table in PERMISSION_TABLES.items()
+}
+
+
+def encode_permissions(permissions: List[str], version: int = CURRENT_TABLE_VERSION) -> Tuple[str, List[str]]:
+    """Encode permissions as a versioned bitmap, plus those the table does not cover."""
+    bits = _table_bits[version]
+    mask = 0
+    extra = []
+    for permission in permissions:
+        bit = bits.get(permission)
+        if bit is None:
+            extra.append(permission)
+        else:
+            mask |= bit
+
+    bitmap = bytes([version]) + mask.to_bytes((len(bits) + 7) // 8, "little")
+    return b64url_encode(bitmap).decode("ascii"), extra
+
+
+def decode_permissions(encoded: str) -> List[str]:
+    """Decode a versioned permission bitmap into permission strings."""
+    try:
+        bitmap = b64url_decode(encoded.encode("ascii"))
+        table = PERMISSION_TABLES[bitmap[0]]
+    except (ValueError, IndexError, KeyError, AttributeError):
+        raise jwt.DecodeError("Unsupported permission bitmap")
+
+    mask = int.from_bytes(bitmap[1:], "little")
+    if mask >> len(table):
+        raise jwt.DecodeError("Permission bitmap has bits outside its table")
+    return [permission for index, permission in enumerate(table) if mask >> index & 1]
+
+
+def compact_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """Rewrite claims into the compact format."""
+    compact = {}
+    for name, value in claims.items():
+        if name == "permissions":
+            compact[PERMISSION_BITMAP_CLAIM], extra = encode_permissions(value)
+            if extra:
+                compact[EXTRA_PERMISSIONS_CLAIM] = extra
+        else:
+            compact[SHORT_CLAIMS.get(name, name)] = value
+    return compact
+
+
+def expand_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """Rewrite compact claims back to the standard format; standard claims pass through."""
+    if PERMISSION_BITMAP_CLAIM not in claims and not any(short in claims for short in _LONG_CLAIMS):
+        return claims
+
+    expanded = {}
+    for name, value in claims.items():
+        if name == PERMISSION_BITMAP_CLAIM:
+            expanded["permissions"] = decode_permissions(value) + claims.get(EXTRA_PERMISSIONS_CLAIM, [])
+        elif name != EXTRA_PERMISSIONS_CLAIM:
+            expanded[_LONG_CLAIMS.get(name, name)] = value
+    return expanded
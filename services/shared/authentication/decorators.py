@@ -1,23 +1,38 @@
 """Authentication decorators."""
 
+import inspect
 from functools import wraps
 from typing import Callable, List, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from .identity import IDENTITY_HEADER, IdentitySigner
 from .jwt_handler import JWTHandler
 from .permissions import PermissionChecker
-from ..core.exceptions import AuthenticationException, AuthorizationException
+from ..core.exceptions import AuthenticationException
 
 security = HTTPBearer()
 jwt_handler = JWTHandler()
+identity_signer = IdentitySigner.from_environment()
 permission_checker = PermissionChecker()
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    """Get current user from JWT token."""
+def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """Get current user from JWT token.
+    
+    When the gateway has already verified the token and forwarded a signed
+    identity header, that header is trusted instead of verifying again.
+    """
     try:
         token = credentials.credentials
+        identity = request.headers.get(IDENTITY_HEADER)
+        if identity and identity_signer is not None:
+            request_id = getattr(request.state, "request_id", None) or request.headers.get("x-request-id")
+            payload = identity_signer.verify(identity, request_id, token)
+            if jwt_handler.revocations.is_revoked(payload.get("jti")):
+                raise AuthenticationException("Token has been revoked")
+            return payload
+        
         payload = jwt_handler.verify_token(token)
         return payload
     except AuthenticationException as e:
@@ -38,11 +53,44 @@ def require_auth(func: Callable) -> Callable:
     return wrapper
 
 
+def get_permission_mask(current_user: dict, request: Optional[Request] = None) -> int:
+    """Get the user's effective permission mask, computed once per request.
+    
+    The mask is stored on `request.state.permission_mask` so later checks in
+    the same request are a single AND.
+    """
+    if request is not None:
+        mask = getattr(request.state, "permission_mask", None)
+        if mask is not None:
+            return mask
+    
+    mask = permission_checker.effective_mask(current_user.get('permissions', []))
+    if request is not None:
+        request.state.permission_mask = mask
+    return mask
+
+
 def require_permission(required_permissions: List[str]) -> Callable:
-    """Decorator to require specific permissions."""
+    """Decorator to require specific permissions.
+    
+    Endpoints that do not take a `Request` get one injected for the
+    decorator's own use, so the mask is always stored on request state.
+    """
+    required_mask = permission_checker.required_mask(required_permissions)
+    
     def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        request_name = next(
+            (name for name, parameter in signature.parameters.items() if parameter.annotation is Request),
+            None
+        )
+        injected = request_name is None
+        if injected:
+            request_name = "permission_request"
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
+            request = kwargs.pop(request_name) if injected else kwargs.get(request_name)
             # Extract current user from kwargs (injected by FastAPI)
             current_user = kwargs.get('current_user')
             if not current_user:
@@ -51,15 +99,21 @@ def require_permission(required_permissions: List[str]) -> Callable:
                     detail="Authentication required"
                 )
             
-            user_permissions = current_user.get('permissions', [])
+            mask = get_permission_mask(current_user, request)
             
-            if not permission_checker.has_permissions(user_permissions, required_permissions):
+            if mask & required_mask != required_mask:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Insufficient permissions"
                 )
             
             return await func(*args, **kwargs)
+        
+        if injected:
+            wrapper.__signature__ = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(request_name, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            ])
         return wrapper
     return decorator
 
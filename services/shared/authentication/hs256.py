@@ -0,0 +1,112 @@
+"""Fast-path JWT codec for the fixed HS256 configuration."""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import time
+from calendar import timegm
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+import jwt
+
+from ..core.responses import json_dumps, json_loads
+
+HEADER = {"alg": "HS256", "typ": "JWT"}
+TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+def b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HS256Codec:
+    """Encode and verify HS256 tokens without PyJWT's generic machinery.
+
+    The header segment is encoded once and the HMAC key is prepared once and
+    copied per token. Tokens verify with PyJWT and PyJWT tokens verify here,
+    and errors are raised as PyJWT exceptions, so the codec is a drop-in for
+    `jwt.encode`/`jwt.decode` with this configuration.
+    """
+
+    def __init__(self, secret_key: str):
+        self._header_segment = b64url_encode(json_dumps(HEADER))
+        self._mac = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """Sign claims; datetime time claims are converted to integer timestamps."""
+        for claim in TIME_CLAIMS:
+            value = claims.get(claim)
+            if isinstance(value, datetime):
+                claims = {**claims, claim: timegm(value.utctimetuple())}
+
+        signing_input = self._header_segment + b"." + b64url_encode(json_dumps(claims))
+        return (signing_input + b"." + b64url_encode(self._sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verify a token's signature, exp and nbf and return its claims."""
+        header_segment, payload_segment, signature = split_token(token)
+        signing_input = header_segment + b"." + payload_segment
+
+        # Tokens minted by this codec or PyJWT carry the cached header
+        if header_segment != self._header_segment:
+            header = decode_segment(header_segment)
+            if header.get("alg") != "HS256":
+                raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+
+        if not hmac.compare_digest(self._sign(signing_input), signature):
+            raise jwt.InvalidSignatureError("Signature verification failed")
+
+        claims = decode_segment(payload_segment)
+        check_time_claims(claims)
+        return claims
+
+
+def split_token(token: str) -> Tuple[bytes, bytes, bytes]:
+    """Split a compact JWS into its header and payload segments and raw signature."""
+    try:
+        segments = token.encode("ascii").split(b".")
+        if len(segments) != 3:
+            raise jwt.DecodeError("Not enough segments")
+        return segments[0], segments[1], b64url_decode(segments[2])
+    except (UnicodeError, binascii.Error, ValueError) as e:
+        raise jwt.DecodeError(f"Invalid token: {e}")
+
+
+def decode_segment(segment: bytes) -> Dict[str, Any]:
+    """Decode a base64url JSON object segment."""
+    try:
+        value = json_loads(b64url_decode(segment))
+    except (UnicodeError, binascii.Error, ValueError) as e:
+        raise jwt.DecodeError(f"Invalid token: {e}")
+    if not isinstance(value, dict):
+        raise jwt.DecodeError("Invalid token segment")
+    return value
+
+
+def check_time_claims(claims: Dict[str, Any]) -> None:
+    """Reject tokens whose exp has passed or whose nbf is still ahead."""
+    now = time.time()
+    exp = claims.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise jwt.DecodeError("Expiration Time claim (exp) must be a number")
+        if exp <= now:
+            raise jwt.ExpiredSignatureError("Signature has expired")
+
+    nbf = claims.get("nbf")
+    if nbf is not None:
+        if not isinstance(nbf, (int, float)):
+            raise jwt.DecodeError("Not Before claim (nbf) must be a number")
+        if nbf > now:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
@@ -0,0 +1,140 @@
+"""Signed identity headers forwarded by the gateway after it has verified a token."""
+
+import hashlib
+import heapq
+import hmac
+import math
+import os
+import secrets
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import jwt
+from fastapi import status
+
+from ..core.exceptions import AuthenticationException, ServiceException
+from ..core.responses import json_dumps
+from .claims import compact_claims, expand_claims
+from .hs256 import b64url_encode, decode_segment
+
+IDENTITY_HEADER = "x-identity"
+IDENTITY_VERSION = b"v1"
+
+# Identity-only fields, removed before the claims are handed to the service
+REQUEST_ID_FIELD = "rid"
+NONCE_FIELD = "n"
+EXPIRES_FIELD = "ie"
+TOKEN_DIGEST_FIELD = "th"
+
+
+def token_digest(token: str) -> str:
+    """Short digest binding an identity header to the bearer token it was derived from."""
+    return b64url_encode(hashlib.blake2b(token.encode("ascii", "replace"), digest_size=8).digest()).decode("ascii")
+
+
+class NonceCache:
+    """Nonces seen within their validity window, for rejecting replayed headers.
+
+    A nonce is only forgotten once its header has expired, so a full cache
+    rejects new headers with a 503 rather than making room. Size it as
+    header TTL x peak identity headers per second. The cache is per worker:
+    a header is single-use on each worker, and the request ID and token
+    digest it is bound to keep it from being reused for anything else.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.rejected = 0
+        self._seen: Dict[str, float] = {}
+        self._expiry: List[Tuple[float, str]] = []
+
+    def add(self, nonce: str, expires_at: float) -> bool:
+        """Record a nonce, returning False if it was already used."""
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, expired = heapq.heappop(self._expiry)
+            self._seen.pop(expired, None)
+
+        if nonce in self._seen:
+            return False
+        if len(self._seen) >= self.max_entries:
+            self.rejected += 1
+            retry_after = max(1, math.ceil(self._expiry[0][0] - now))
+            raise ServiceException(
+                "Too many identity headers in flight",
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(retry_after)}
+            )
+        self._seen[nonce] = expires_at
+        heapq.heappush(self._expiry, (expires_at, nonce))
+        return True
+
+
+class IdentitySigner:
+    """Sign and verify the compact identity header passed from the gateway to services.
+
+    The header carries the verified token's claims in compact form plus the
+    request ID, a nonce, a short expiry and a digest of the bearer token,
+    all under an HMAC with a key shared only by internal services. Services
+    accept each header once, for its own request and token only.
+    """
+
+    def __init__(self, key: bytes, ttl: float = 30.0, nonces: Optional[NonceCache] = None, max_rate: float = 3000.0):
+        self.ttl = ttl
+        self.nonces = nonces or NonceCache(max(1, math.ceil(ttl * max_rate)))
+        self._mac = hmac.new(key, digestmod=hashlib.sha256)
+
+    @classmethod
+    def from_environment(cls) -> Optional["IdentitySigner"]:
+        """Build a signer from INTERNAL_IDENTITY_KEY, or None if identity headers are disabled."""
+        key = os.getenv("INTERNAL_IDENTITY_KEY")
+        if not key:
+            return None
+        return cls(
+            key.encode("utf-8"),
+            ttl=float(os.getenv("IDENTITY_TTL_SECONDS", "30")),
+            max_rate=float(os.getenv("IDENTITY_MAX_RATE", "3000"))
+        )
+
+    def _sign(self, data: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(data)
+        return mac.digest()
+
+    def sign(self, claims: Dict[str, Any], request_id: str, token: str) -> str:
+        """Build the identity header for verified token claims."""
+        payload = compact_claims(claims)
+        payload[REQUEST_ID_FIELD] = request_id
+        payload[NONCE_FIELD] = secrets.token_urlsafe(12)
+        payload[EXPIRES_FIELD] = time.time() + self.ttl
+        payload[TOKEN_DIGEST_FIELD] = token_digest(token)
+
+        signing_input = IDENTITY_VERSION + b"." + b64url_encode(json_dumps(payload))
+        return (signing_input + b"." + b64url_encode(self._sign(signing_input))).decode("ascii")
+
+    def verify(self, header: str, request_id: Optional[str], token: str) -> Dict[str, Any]:
+        """Verify an identity header and return the token claims it carries."""
+        try:
+            version, body, signature = header.encode("ascii").split(b".")
+            if version != IDENTITY_VERSION:
+                raise AuthenticationException("Unsupported identity header")
+            if not hmac.compare_digest(b64url_encode(self._sign(version + b"." + body)), signature):
+                raise AuthenticationException("Invalid identity header")
+            payload = decode_segment(body)
+        except (ValueError, UnicodeError, jwt.DecodeError):
+            raise AuthenticationException("Invalid identity header")
+
+        expires_at = payload.pop(EXPIRES_FIELD, 0)
+        if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+            raise AuthenticationException("Identity header has expired")
+        if payload.pop(REQUEST_ID_FIELD, None) != request_id:
+            raise AuthenticationException("Identity header belongs to another request")
+        if payload.pop(TOKEN_DIGEST_FIELD, None) != token_digest(token):
+            raise AuthenticationException("Identity header belongs to another token")
+        if not self.nonces.add(str(payload.pop(NONCE_FIELD, "")), expires_at):
+            raise AuthenticationException("Identity header has already been used")
+
+        try:
+            return expand_claims(payload)
+        except jwt.DecodeError:
+            raise AuthenticationException("Invalid identity header")
@@ -1,48 +1,150 @@
 """JWT token handling utilities."""
 
 import jwt
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+import secrets
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Any, Optional
 import os
 
 from ..core.exceptions import AuthenticationException
+from .claims import compact_claims, expand_claims
+from .hs256 import HS256Codec
+from .keys import ASYMMETRIC_ALGORITHMS, JWKSCache, KeyRing, SigningKey
+from .revocation import RevocationStore, default_revocation_store
+from .token_cache import VerifiedTokenCache
+
+
+@lru_cache(maxsize=None)
+def codec_from_environment(algorithm: str):
+    """Build the asymmetric token codec, shared by every handler in the process.
+    
+    Asymmetric algorithms sign with the keys in JWT_PRIVATE_KEY_FILES (the
+    first is active) or, on verifier-only services, verify against the JWK
+    set at JWT_JWKS_URL. One of the two is required.
+    """
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise ValueError(f"Unsupported JWT_ALGORITHM: {algorithm}")
+    
+    key_files = [path.strip() for path in os.getenv("JWT_PRIVATE_KEY_FILES", "").split(",") if path.strip()]
+    if key_files:
+        keys = []
+        for path in key_files:
+            with open(path, "rb") as key_file:
+                keys.append(SigningKey.from_private_pem(key_file.read(), algorithm))
+        return KeyRing(keys)
+    
+    jwks_url = os.getenv("JWT_JWKS_URL")
+    if jwks_url:
+        return JWKSCache(jwks_url, refresh_interval=float(os.getenv("JWT_JWKS_REFRESH_SECONDS", "300")))
+    
+    # A per-process key would make every worker reject the others' tokens
+    raise ValueError(f"JWT_ALGORITHM={algorithm} needs JWT_PRIVATE_KEY_FILES or JWT_JWKS_URL")
 
 
 class JWTHandler:
     """Handle JWT token creation and validation."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        token_cache: Optional[VerifiedTokenCache] = None,
+        is_revoked: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        codec: Any = None,
+        compact: Optional[bool] = None,
+        revocations: Optional[RevocationStore] = None
+    ):
         self.secret_key = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
-        self.algorithm = "HS256"
+        self.algorithm = os.getenv("JWT_ALGORITHM", "HS256")
         self.access_token_expire_minutes = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
         self.refresh_token_expire_days = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+        
+        # HS256Codec, KeyRing or JWKSCache; all expose encode() and decode()
+        if codec is None:
+            codec = HS256Codec(self.secret_key) if self.algorithm == "HS256" else codec_from_environment(self.algorithm)
+        self.codec = codec
+        
+        # Issue compact claims (short names, permission bitmap); both formats always verify
+        if compact is None:
+            compact = os.getenv("JWT_COMPACT_CLAIMS", "false").lower() == "true"
+        self.compact = compact
+        
+        # Caching verified payloads is opt-in, via the argument or JWT_VERIFY_CACHE_SIZE
+        if token_cache is None:
+            cache_size = int(os.getenv("JWT_VERIFY_CACHE_SIZE", "0"))
+            if cache_size > 0:
+                token_cache = VerifiedTokenCache(cache_size)
+        self.token_cache = token_cache
+        self.revocations = revocations if revocations is not None else default_revocation_store
+        self.is_revoked = is_revoked
+    
+    async def start(self) -> None:
+        """Start background key refresh for a remote JWK set, and revocation sharing."""
+        if isinstance(self.codec, JWKSCache):
+            await self.codec.start()
+        await self.revocations.start()
+    
+    async def stop(self) -> None:
+        if isinstance(self.codec, JWKSCache):
+            await self.codec.stop()
+        await self.revocations.stop()
     
     def create_access_token(self, data: Dict[str, Any]) -> str:
         """Create an access token."""
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
-        to_encode.update({"exp": expire, "type": "access"})
+        expire = int(time.time()) + self.access_token_expire_minutes * 60
+        to_encode.update({"exp": expire, "type": "access", "jti": secrets.token_urlsafe(12)})
         
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        return self._encode(to_encode)
     
     def create_refresh_token(self, data: Dict[str, Any]) -> str:
         """Create a refresh token."""
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
-        to_encode.update({"exp": expire, "type": "refresh"})
+        expire = int(time.time()) + self.refresh_token_expire_days * 86400
+        to_encode.update({"exp": expire, "type": "refresh", "jti": secrets.token_urlsafe(12)})
         
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        return self._encode(to_encode)
+    
+    def _encode(self, claims: Dict[str, Any]) -> str:
+        return self.codec.encode(compact_claims(claims) if self.compact else claims)
     
     def verify_token(self, token: str, token_type: str = "access") -> Dict[str, Any]:
-        """Verify and decode a token."""
+        """Verify and decode a token.
+        
+        With a token cache, a token whose signature was already verified is
+        served from the cache until it expires; the type and revocation
+        checks still run on every call.
+        """
+        payload = self.token_cache.get(token) if self.token_cache is not None else None
+        
+        if payload is None:
+            payload = self._decode(token)
+            if self.token_cache is not None:
+                self.token_cache.put(token, payload)
+        
+        # Check token type
+        if payload.get("type") != token_type:
+            raise AuthenticationException(f"Invalid token type. Expected {token_type}")
+        
+        if self.revocations.is_revoked(payload.get("jti")) or (
+            self.is_revoked is not None and self.is_revoked(payload)
+        ):
+            if self.token_cache is not None:
+                self.token_cache.invalidate(token)
+            raise AuthenticationException("Token has been revoked")
+        
+        # Cached payloads are shared between requests, so callers get a copy
+        return dict(payload) if self.token_cache is not None else payload
+    
+    def revoke(self, payload: Dict[str, Any]) -> None:
+        """Revoke a verified token until it expires."""
+        jti = payload.get("jti")
+        if jti and payload.get("exp"):
+            self.revocations.revoke(jti, payload["exp"])
+    
+    def _decode(self, token: str) -> Dict[str, Any]:
+        """Check the signature and expiry of a token and decode its claims."""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            
-            # Check token type
-            if payload.get("type") != token_type:
-                raise AuthenticationException(f"Invalid token type. Expected {token_type}")
-            
-            return payload
+            return expand_claims(self.codec.decode(token))
         
         except jwt.ExpiredSignatureError:
             raise AuthenticationException("Token has expired")
@@ -67,8 +169,11 @@ class JWTHandler:
     
     def is_token_expired(self, token: str) -> bool:
         """Check if token is expired without raising an exception."""
+        if self.token_cache is not None and self.token_cache.get(token) is not None:
+            return False
+        
         try:
-            jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            self.codec.decode(token)
             return False
         except jwt.ExpiredSignatureError:
             return True
@@ -0,0 +1,259 @@
+"""Asymmetric JWT signing keys, key rings and JWKS verification."""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import jwt
+from jwt.algorithms import get_default_algorithms
+
+from ..core.responses import json_dumps
+from .hs256 import b64url_encode, check_time_claims, decode_segment, split_token
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("EdDSA", "RS256")
+_ALGORITHMS = get_default_algorithms()
+
+# Members used for RFC 7638 thumbprints, per key type
+_THUMBPRINT_MEMBERS = {"OKP": ("crv", "kty", "x"), "RSA": ("e", "kty", "n")}
+
+
+class UnknownKeyError(jwt.InvalidTokenError):
+    """The token was signed with a kid that is not in the key set."""
+
+
+def _algorithm(name: str):
+    if name not in ASYMMETRIC_ALGORITHMS:
+        raise ValueError(f"Unsupported signing algorithm: {name}")
+    return _ALGORITHMS[name]
+
+
+def jwk_thumbprint(jwk: Dict[str, Any]) -> str:
+    """Compute the RFC 7638 thumbprint of a public JWK, used as its kid."""
+    members = {name: jwk[name] for name in _THUMBPRINT_MEMBERS[jwk["kty"]]}
+    return b64url_encode(hashlib.sha256(json_dumps(members)).digest()).decode("ascii")
+
+
+class SigningKey:
+    """A parsed asymmetric key with its kid and precomputed JWS header segment."""
+
+    __slots__ = ("kid", "algorithm", "private_key", "public_key", "header_segment", "_alg")
+
+    def __init__(self, algorithm: str, public_key: Any, private_key: Any = None, kid: Optional[str] = None):
+        self._alg = _algorithm(algorithm)
+        self.algorithm = algorithm
+        self.private_key = private_key
+        self.public_key = public_key
+        self.kid = kid or jwk_thumbprint(self._alg.to_jwk(public_key, as_dict=True))
+        self.header_segment = b64url_encode(json_dumps({"alg": algorithm, "kid": self.kid, "typ": "JWT"}))
+
+    @classmethod
+    def generate(cls, algorithm: str = "EdDSA", kid: Optional[str] = None) -> "SigningKey":
+        """Generate a new key pair."""
+        if algorithm == "EdDSA":
+            from cryptography.hazmat.primitives.asymmetric import ed25519
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            from cryptography.hazmat.primitives.asymmetric import rsa
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return cls(algorithm, private_key.public_key(), private_key, kid)
+
+    @classmethod
+    def from_private_pem(cls, pem: bytes, algorithm: str, kid: Optional[str] = None) -> "SigningKey":
+        """Load a key pair from a PEM-encoded private key."""
+        private_key = _algorithm(algorithm).prepare_key(pem)
+        return cls(algorithm, private_key.public_key(), private_key, kid)
+
+    @classmethod
+    def from_jwk(cls, jwk: Dict[str, Any]) -> "SigningKey":
+        """Load a verification-only key from a public JWK."""
+        algorithm = jwk.get("alg") or ("EdDSA" if jwk.get("kty") == "OKP" else "RS256")
+        return cls(algorithm, _algorithm(algorithm).from_jwk(jwk), kid=jwk.get("kid"))
+
+    def sign(self, signing_input: bytes) -> bytes:
+        if self.private_key is None:
+            raise ValueError(f"Key {self.kid} can only verify")
+        return self._alg.sign(signing_input, self.private_key)
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        return self._alg.verify(signing_input, self.public_key, signature)
+
+    def to_jwk(self) -> Dict[str, Any]:
+        """Get the public JWK for this key."""
+        jwk = self._alg.to_jwk(self.public_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+
+def _verify_with(keys: Dict[str, SigningKey], token: str) -> Dict[str, Any]:
+    """Verify a token against keys indexed by kid and return its claims."""
+    header_segment, payload_segment, signature = split_token(token)
+    header = decode_segment(header_segment)
+
+    key = keys.get(header.get("kid"))
+    if key is None:
+        raise UnknownKeyError("Unknown signing key")
+    if header.get("alg") != key.algorithm:
+        raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+    if not key.verify(header_segment + b"." + payload_segment, signature):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+
+    claims = decode_segment(payload_segment)
+    check_time_claims(claims)
+    return claims
+
+
+class KeyRing:
+    """Signing keys indexed by kid, with one active key used for new tokens.
+
+    Retired keys stay in the ring so tokens they signed keep verifying until
+    they expire. Keys are parsed once and reused for every token.
+    """
+
+    def __init__(self, keys: Iterable[SigningKey] = ()):
+        self._keys: Dict[str, SigningKey] = {}
+        self.active: Optional[SigningKey] = None
+        self._jwks: Optional[bytes] = None
+        for key in keys:
+            self.add(key, active=self.active is None)
+
+    def add(self, key: SigningKey, active: bool = False) -> None:
+        """Add a key, optionally making it the signing key."""
+        self._keys[key.kid] = key
+        if active:
+            self.active = key
+        self._jwks = None
+
+    def remove(self, kid: str) -> None:
+        """Remove a retired key; the active key cannot be removed."""
+        if self.active is not None and self.active.kid == kid:
+            raise ValueError("Cannot remove the active signing key")
+        self._keys.pop(kid, None)
+        self._jwks = None
+
+    def get(self, kid: str) -> Optional[SigningKey]:
+        return self._keys.get(kid)
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """Sign claims with the active key."""
+        if self.active is None:
+            raise ValueError("Key ring has no active signing key")
+        signing_input = self.active.header_segment + b"." + b64url_encode(json_dumps(claims))
+        return (signing_input + b"." + b64url_encode(self.active.sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verify a token signed by any key in the ring."""
+        return _verify_with(self._keys, token)
+
+    def jwks(self) -> bytes:
+        """Get the serialized public JWK set, rendered once per key change."""
+        if self._jwks is None:
+            self._jwks = json_dumps({"keys": [key.to_jwk() for key in self._keys.values()]})
+        return self._jwks
+
+
+async def fetch_jwks(url: str) -> Dict[str, Any]:
+    """Fetch a JWK set over HTTP."""
+    import httpx
+
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.json()
+
+
+class JWKSCache:
+    """Verifier-side cache of a remote JWK set.
+
+    Keys are fetched and parsed in the background, so verification is a
+    local dictionary lookup. A token with an unknown kid schedules an early
+    refresh (at most once per `min_refresh_interval`) to pick up rotated keys.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        refresh_interval: float = 300.0,
+        min_refresh_interval: float = 30.0,
+        fetch: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None
+    ):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.refreshes = 0
+        self.failures = 0
+        self._fetch = fetch or fetch_jwks
+        self._keys: Dict[str, SigningKey] = {}
+        self._last_refresh = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Optional[asyncio.Task] = None
+
+    @property
+    def kids(self) -> List[str]:
+        return list(self._keys)
+
+    async def refresh(self) -> None:
+        """Fetch the JWK set and swap in the parsed keys."""
+        self._last_refresh = time.monotonic()
+        try:
+            document = await self._fetch(self.url)
+            keys = {}
+            for jwk in document.get("keys", []):
+                if jwk.get("use", "sig") != "sig":
+                    continue
+                try:
+                    key = SigningKey.from_jwk(jwk)
+                except (KeyError, ValueError, jwt.InvalidKeyError) as e:
+                    logger.warning(f"Skipping unusable JWK {jwk.get('kid')}: {e}")
+                    continue
+                keys[key.kid] = key
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"JWKS refresh from {self.url} failed: {e}")
+            return
+
+        self._keys = keys
+        self.refreshes += 1
+
+    async def start(self) -> None:
+        """Load the keys and keep refreshing them in the background."""
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._pending):
+            if task is not None:
+                task.cancel()
+        self._task = None
+        self._pending = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        raise ValueError("A JWKS cache can only verify tokens")
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verify a token against the cached keys."""
+        try:
+            return _verify_with(self._keys, token)
+        except UnknownKeyError:
+            self._schedule_refresh()
+            raise
+
+    def _schedule_refresh(self) -> None:
+        if time.monotonic() - self._last_refresh < self.min_refresh_interval:
+            return
+        if self._pending is not None and not self._pending.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._pending = loop.create_task(self.refresh())
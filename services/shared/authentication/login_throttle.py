@@ -0,0 +1,260 @@
+"""Login throttling on approximate sliding-window counters per email, IP and subnet."""
+
+import ipaddress
+import math
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..core.exceptions import TooManyRequestsException
+from ..utils.config import config
+
+
+class SlidingWindowCounter:
+    """Approximate per-key event counts over a sliding window, in fixed memory.
+
+    The window is split into `buckets` slots, each a count-min sketch of
+    `depth` rows of `width` counters indexed by double hashing of the
+    builtin hash. A slot is cleared when the window moves past it, so
+    memory does not grow with the number of keys. Collisions can only
+    inflate a count, never hide events.
+    """
+
+    __slots__ = ("window", "buckets", "width", "depth", "slot_seconds", "_counts", "_slots", "_zero", "_now")
+
+    def __init__(
+        self,
+        window: float,
+        buckets: int = 10,
+        width: int = 4096,
+        depth: int = 4,
+        now: Optional[Callable[[], float]] = None
+    ):
+        self.window = window
+        self.buckets = buckets
+        self.width = width
+        self.depth = depth
+        self.slot_seconds = window / buckets
+        self._zero = array("I", bytes(4 * width * depth))
+        self._counts = [array("I", self._zero) for _ in range(buckets)]
+        self._slots = [-1] * buckets
+        self._now = now or time.monotonic
+
+    def _columns(self, key: str) -> List[int]:
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def _live(self, current: int) -> List[Tuple[int, array]]:
+        """Slots still inside the window, oldest first."""
+        return [
+            (slot, self._counts[slot % self.buckets])
+            for slot in range(current - self.buckets + 1, current + 1)
+            if self._slots[slot % self.buckets] == slot
+        ]
+
+    def add(self, key: str) -> int:
+        """Count one event for `key`; returns the slot it was counted in."""
+        slot = int(self._now() // self.slot_seconds)
+        index = slot % self.buckets
+        counts = self._counts[index]
+        if self._slots[index] != slot:
+            counts[:] = self._zero
+            self._slots[index] = slot
+        for column in self._columns(key):
+            counts[column] += 1
+        return slot
+
+    def remove(self, key: str, slot: int) -> None:
+        """Uncount an event added in `slot`, if that slot is still live."""
+        index = slot % self.buckets
+        if self._slots[index] != slot:
+            return
+        counts = self._counts[index]
+        for column in self._columns(key):
+            if counts[column]:
+                counts[column] -= 1
+
+    def count(self, key: str) -> int:
+        current = int(self._now() // self.slot_seconds)
+        columns = self._columns(key)
+        return min(sum(counts[column] for _slot, counts in self._live(current)) for column in columns)
+
+    def retry_after(self, key: str, limit: int) -> float:
+        """Seconds until the count for `key` drops below `limit` with no new events."""
+        now = self._now()
+        live = self._live(int(now // self.slot_seconds))
+        columns = self._columns(key)
+        totals = [sum(counts[column] for _slot, counts in live) for column in columns]
+        wait = 0.0
+        for slot, counts in live:
+            if min(totals) < limit:
+                break
+            totals = [total - counts[column] for total, column in zip(totals, columns)]
+            wait = (slot + self.buckets) * self.slot_seconds - now
+        return wait
+
+
+class LoginThrottle:
+    """Rejects login attempts once an email, IP or subnet exceeds its limit.
+
+    `acquire()` runs before the user lookup and password check, so a
+    throttled request costs a few counter reads instead of a password
+    hash. Admitted attempts are counted up front, which also bounds
+    concurrent guesses; a successful login gives its attempt back with
+    `forgive()`. Rejected attempts are not counted, so a lockout ends on
+    schedule even while guesses continue. A limit of 0 disables a scope.
+    """
+
+    SCOPES = ("email", "ip", "subnet")
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        window: float = 300.0,
+        buckets: int = 10,
+        width: int = 4096,
+        depth: int = 4,
+        ipv4_prefix: int = 24,
+        ipv6_prefix: int = 64,
+        now: Optional[Callable[[], float]] = None
+    ):
+        unknown = set(limits) - set(self.SCOPES)
+        if unknown:
+            raise ValueError(f"Unknown throttle scopes: {sorted(unknown)}")
+        self.limits = {scope: limit for scope, limit in limits.items() if limit > 0}
+        self.window = window
+        self.ipv4_prefix = ipv4_prefix
+        self.ipv6_prefix = ipv6_prefix
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {scope: 0 for scope in self.limits}
+        self._counters = {
+            scope: SlidingWindowCounter(window, buckets=buckets, width=width, depth=depth, now=now)
+            for scope in self.limits
+        }
+
+    @classmethod
+    def from_environment(cls) -> "LoginThrottle":
+        """Build a throttle from the LOGIN_THROTTLE_* settings."""
+        return cls(
+            limits={
+                "email": config.get("LOGIN_THROTTLE_EMAIL_LIMIT"),
+                "ip": config.get("LOGIN_THROTTLE_IP_LIMIT"),
+                "subnet": config.get("LOGIN_THROTTLE_SUBNET_LIMIT"),
+            },
+            window=config.get("LOGIN_THROTTLE_WINDOW_SECONDS"),
+            buckets=config.get("LOGIN_THROTTLE_BUCKETS"),
+            width=config.get("LOGIN_THROTTLE_SKETCH_WIDTH")
+        )
+
+    def _keys(self, email: str, ip_address: str) -> Dict[str, str]:
+        keys = {"email": email.strip().lower(), "ip": ip_address}
+        try:
+            address = ipaddress.ip_address(ip_address)
+        except ValueError:
+            pass  # not an IP (e.g. "unknown"), so there is no subnet to count
+        else:
+            prefix = self.ipv4_prefix if address.version == 4 else self.ipv6_prefix
+            keys["subnet"] = str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+        return {scope: key for scope, key in keys.items() if scope in self._counters}
+
+    def acquire(self, email: str, ip_address: str) -> Dict[str, Tuple[str, int]]:
+        """Count an attempt, or raise a 429 if any scope is over its limit.
+
+        Returns a ticket for `forgive()`.
+        """
+        keys = self._keys(email, ip_address)
+        exceeded = [
+            scope for scope, key in keys.items()
+            if self._counters[scope].count(key) >= self.limits[scope]
+        ]
+        if exceeded:
+            for scope in exceeded:
+                self.rejected[scope] += 1
+            retry_after = max(
+                self._counters[scope].retry_after(keys[scope], self.limits[scope]) for scope in exceeded
+            )
+            retry_after = str(max(1, math.ceil(retry_after)))
+            raise TooManyRequestsException(
+                "Too many login attempts, please retry later",
+                headers={
+                    "Retry-After": retry_after,
+                    "RateLimit-Limit": str(min(self.limits[scope] for scope in exceeded)),
+                    "RateLimit-Remaining": "0",
+                    "RateLimit-Reset": retry_after,
+                    "X-Lockout-Scope": ",".join(exceeded),
+                }
+            )
+
+        self.admitted += 1
+        return {scope: (key, self._counters[scope].add(key)) for scope, key in keys.items()}
+
+    def forgive(self, ticket: Dict[str, Tuple[str, int]]) -> None:
+        """Give back an attempt that turned out to be legitimate."""
+        for scope, (key, slot) in ticket.items():
+            self._counters[scope].remove(key, slot)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "limits": dict(self.limits),
+            "window_seconds": self.window,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+        }
+
+
+class TrustedProxies:
+    """Resolves the client address of a request that may have come through reverse proxies.
+
+    Forwarding headers are believed only when the peer itself is a trusted
+    proxy. X-Forwarded-For is then walked from the right, past every
+    trusted hop, so a client cannot pick its address by sending its own
+    header; X-Real-IP is used when there is no X-Forwarded-For. With no
+    trusted networks the peer address is always used.
+    """
+
+    def __init__(self, networks: Iterable[str] = ()):
+        self.networks = [ipaddress.ip_network(network.strip(), strict=False) for network in networks]
+
+    @classmethod
+    def from_environment(cls) -> "TrustedProxies":
+        """Build from the comma-separated TRUSTED_PROXIES networks."""
+        return cls(network for network in config.get("TRUSTED_PROXIES").split(",") if network.strip())
+
+    def _trusted(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.networks)
+
+    def client_ip(self, peer: Optional[str], headers: Mapping[str, str]) -> str:
+        """The address to throttle and audit for a request from `peer`."""
+        if peer is None:
+            return "unknown"
+        if not self._trusted(peer):
+            return peer
+
+        hops = [hop.strip() for hop in headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if not hops:
+            real_ip = headers.get("x-real-ip", "").strip()
+            return real_ip if self._valid(real_ip) else peer
+
+        address = peer
+        for hop in reversed(hops):
+            if not self._valid(hop):
+                break  # garbage from the client; the last good hop is as far as we can see
+            address = hop
+            if not self._trusted(hop):
+                break
+        return address
+
+    @staticmethod
+    def _valid(address: str) -> bool:
+        try:
+            ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return True
@@ -1,7 +1,8 @@
 """Permission management utilities."""
 
+import threading
 from enum import Enum
-from typing import List, Set
+from typing import Dict, Iterable, List, Set, Tuple
 
 
 class Permission(Enum):
@@ -29,8 +30,62 @@ class Permission(Enum):
     SYSTEM_READ = "system:read"
 
 
+# Bit positions follow the declaration order of Permission, so new members
+# must be appended. Permission strings outside the enum are interned to
+# positions after it on first use, up to _MAX_PERMISSIONS in total.
+_permission_bits: Dict[str, int] = {permission.value: 1 << index for index, permission in enumerate(Permission)}
+_bit_permissions: Dict[int, str] = {bit: value for value, bit in _permission_bits.items()}
+# Sync dependencies run on the threadpool, so interning must not hand one bit out twice
+_intern_lock = threading.Lock()
+
+_MAX_PERMISSIONS = 256
+_MASK_CACHE_SIZE = 1024
+
+
+def permission_bit(permission: str) -> int:
+    """Get the bit for a permission string, interning unknown permissions.
+    
+    Raises ValueError once the table is full, so a required permission can
+    never silently get an empty mask.
+    """
+    bit = _permission_bits.get(permission)
+    if bit is None:
+        with _intern_lock:
+            bit = _permission_bits.get(permission)
+            if bit is None:
+                if len(_permission_bits) >= _MAX_PERMISSIONS:
+                    raise ValueError(f"Too many distinct permissions; cannot intern {permission!r}")
+                bit = 1 << len(_permission_bits)
+                _bit_permissions[bit] = permission
+                _permission_bits[permission] = bit
+    return bit
+
+
+def _held_bit(permission: str) -> int:
+    """Bit for a permission a user holds; 0 if it could not be interned, as no check can require it."""
+    try:
+        return permission_bit(permission)
+    except ValueError:
+        return 0
+
+
+def permissions_from_mask(mask: int) -> Set[str]:
+    """Get the permission strings set in a mask."""
+    permissions = set()
+    while mask:
+        bit = mask & -mask
+        permissions.add(_bit_permissions[bit])
+        mask ^= bit
+    return permissions
+
+
 class PermissionChecker:
-    """Check user permissions."""
+    """Check user permissions.
+    
+    Permissions are interned to bits and the hierarchy is closed into masks
+    up front, so checks are integer ANDs. Effective masks are memoized per
+    distinct permission tuple.
+    """
     
     def __init__(self):
         # Define permission hierarchies
@@ -61,28 +116,69 @@ class PermissionChecker:
                 Permission.AGENT_EXECUTE.value,
             ],
         }
+        
+        self._hierarchy_masks = self._close_hierarchy()
+        self._effective_masks: Dict[Tuple[str, ...], int] = {}
+        self._required_masks: Dict[Tuple[str, ...], int] = {}
     
-    def get_effective_permissions(self, user_permissions: List[str]) -> Set[str]:
-        """Get all effective permissions including inherited ones."""
-        effective_permissions = set(user_permissions)
+    def _close_hierarchy(self) -> Dict[str, int]:
+        """Compute each permission's mask including everything it inherits transitively."""
+        masks: Dict[str, int] = {}
         
-        for permission in user_permissions:
-            if permission in self.permission_hierarchy:
-                effective_permissions.update(self.permission_hierarchy[permission])
+        def close(permission: str, visiting: frozenset) -> int:
+            if permission in masks:
+                return masks[permission]
+            mask = permission_bit(permission)
+            for inherited in self.permission_hierarchy.get(permission, ()):
+                if inherited not in visiting:
+                    mask |= close(inherited, visiting | {permission})
+            masks[permission] = mask
+            return mask
         
-        return effective_permissions
+        for permission in self.permission_hierarchy:
+            close(permission, frozenset())
+        return masks
+    
+    def effective_mask(self, user_permissions: Iterable[str]) -> int:
+        """Get the mask of a user's permissions including inherited ones."""
+        key = tuple(user_permissions)
+        mask = self._effective_masks.get(key)
+        if mask is None:
+            mask = 0
+            for permission in key:
+                mask |= self._hierarchy_masks.get(permission) or _held_bit(permission)
+            if len(self._effective_masks) >= _MASK_CACHE_SIZE:
+                self._effective_masks.clear()
+            self._effective_masks[key] = mask
+        return mask
+    
+    def required_mask(self, required_permissions: Iterable[str]) -> int:
+        """Get the mask of a set of required permissions (without inheritance)."""
+        key = tuple(required_permissions)
+        mask = self._required_masks.get(key)
+        if mask is None:
+            mask = 0
+            for permission in key:
+                mask |= permission_bit(permission)
+            if len(self._required_masks) >= _MASK_CACHE_SIZE:
+                self._required_masks.clear()
+            self._required_masks[key] = mask
+        return mask
+    
+    def get_effective_permissions(self, user_permissions: List[str]) -> Set[str]:
+        """Get all effective permissions including inherited ones."""
+        return permissions_from_mask(self.effective_mask(user_permissions))
     
     def has_permission(self, user_permissions: List[str], required_permission: str) -> bool:
         """Check if user has a specific permission."""
-        effective_permissions = self.get_effective_permissions(user_permissions)
-        return required_permission in effective_permissions
+        bit = permission_bit(required_permission)
+        return self.effective_mask(user_permissions) & bit == bit
     
     def has_permissions(self, user_permissions: List[str], required_permissions: List[str]) -> bool:
         """Check if user has all required permissions."""
-        effective_permissions = self.get_effective_permissions(user_permissions)
-        return all(perm in effective_permissions for perm in required_permissions)
+        required = self.required_mask(required_permissions)
+        return self.effective_mask(user_permissions) & required == required
     
     def has_any_permission(self, user_permissions: List[str], required_permissions: List[str]) -> bool:
         """Check if user has any of the required permissions."""
-        effective_permissions = self.get_effective_permissions(user_permissions)
-        return any(perm in effective_permissions for perm in required_permissions)
+        return self.effective_mask(user_permissions) & self.required_mask(required_permissions) != 0
@@ -0,0 +1,190 @@
+"""Token revocation by jti with a Bloom filter in front of the exact denylist."""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .token_store import SQLiteTokenBackend
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, using double hashing of the builtin hash.
+
+    Positions depend on the process hash seed, so a filter is only
+    meaningful inside the process that built it.
+    """
+
+    __slots__ = ("size", "hashes", "_bits")
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        h = hash(item) & 0xFFFFFFFFFFFFFFFF
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        size = self.size
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % size
+
+    def add(self, item: str) -> None:
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationStore:
+    """Revoked token IDs, each kept until the token would have expired anyway.
+
+    Lookups check the Bloom filter first, so the common not-revoked case never
+    touches the exact store. The filter cannot drop entries, so it is rebuilt
+    from the live entries every `rebuild_interval` seconds (and whenever it
+    fills up), which keeps memory bounded by the number of unexpired
+    revocations.
+
+    With a backend, revocations are shared between workers: once started,
+    the store writes its own revocations to the backend and merges the
+    other workers' every `sync_interval` seconds, on a worker thread, so
+    a revoked token is rejected everywhere within about that delay.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        error_rate: float = 0.001,
+        rebuild_interval: float = 60.0,
+        backend: Optional[SQLiteTokenBackend] = None,
+        sync_interval: float = 1.0
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.backend = backend
+        self.sync_interval = sync_interval
+        self.rebuilds = 0
+        self.false_positives = 0
+        self._entries: Dict[str, float] = {}
+        self._filter = BloomFilter(capacity, error_rate)
+        self._next_rebuild = time.monotonic() + rebuild_interval
+        self._unsaved: List[Tuple[str, float]] = []
+        self._synced_seq = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_environment(cls) -> "RevocationStore":
+        """Share revocations through the TOKEN_STORE_PATH file when it is set."""
+        path = os.getenv("TOKEN_STORE_PATH")
+        return cls(
+            backend=SQLiteTokenBackend(path) if path else None,
+            sync_interval=float(os.getenv("REVOCATION_SYNC_SECONDS", "1.0"))
+        )
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke a token ID until its expiry timestamp."""
+        if expires_at <= time.time():
+            return
+
+        self._add(jti, expires_at)
+        if self.backend is not None:
+            self._unsaved.append((jti, expires_at))
+
+    def _add(self, jti: str, expires_at: float) -> None:
+        self._maybe_rebuild()
+        self._entries[jti] = max(expires_at, self._entries.get(jti, 0))
+        self._filter.add(jti)
+        if len(self._entries) > self.capacity:
+            self.rebuild()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Check whether a token ID has been revoked."""
+        if not jti or jti not in self._filter:
+            return False
+
+        self._maybe_rebuild()
+        expires_at = self._entries.get(jti)
+        if expires_at is None or expires_at <= time.time():
+            self.false_positives += 1
+            return False
+        return True
+
+    def rebuild(self) -> None:
+        """Drop expired entries and rebuild the filter, growing it if needed."""
+        now = time.time()
+        self._entries = {jti: expires_at for jti, expires_at in self._entries.items() if expires_at > now}
+        self.capacity = max(self.capacity, 2 * len(self._entries))
+
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for jti in self._entries:
+            bloom.add(jti)
+        self._filter = bloom
+        self._next_rebuild = time.monotonic() + self.rebuild_interval
+        self.rebuilds += 1
+
+    async def sync(self) -> None:
+        """Write this worker's new revocations to the backend and merge everyone else's."""
+        if self.backend is None:
+            return
+        unsaved, self._unsaved = self._unsaved, []
+        try:
+            self._synced_seq, revoked = await asyncio.to_thread(
+                self.backend.exchange_revocations, unsaved, self._synced_seq, time.time()
+            )
+        except Exception:
+            self._unsaved = unsaved + self._unsaved
+            raise
+        for jti, expires_at in revoked:
+            self._add(jti, expires_at)
+
+    async def start(self) -> None:
+        """Load the shared revocations and keep syncing them in the background."""
+        if self.backend is None or self._task is not None:
+            return
+        await self.sync()
+        self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        await self.sync()
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f"Revocation sync failed: {e}")
+
+    def _maybe_rebuild(self) -> None:
+        if time.monotonic() >= self._next_rebuild:
+            self.rebuild()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "revoked": len(self._entries),
+            "capacity": self.capacity,
+            "filter_bits": self._filter.size,
+            "rebuilds": self.rebuilds,
+            "false_positives": self.false_positives,
+        }
+
+
+# Shared by every JWTHandler in the process unless one is given its own store
+default_revocation_store = RevocationStore.from_environment()
@@ -0,0 +1,71 @@
+"""Cache of verified JWT payloads."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified token payloads keyed by a digest of the token.
+
+    Entries are only served until the token's `exp`, so a cache hit never
+    outlives the signature check it stands in for. Tokens without `exp` are
+    not cached.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode("ascii", "replace"), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get the verified payload of a token, or None if it is not cached or has expired."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """Cache the payload of a token that has just been verified."""
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+
+        self._entries[self._key(token)] = (payload, expires_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        """Drop a token, e.g. after it has been revoked."""
+        self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
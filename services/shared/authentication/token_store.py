@@ -0,0 +1,365 @@
+"""Expiring token records with per-user indexes and timing-wheel eviction."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Generic, Iterable, List, Optional, Set, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def _timestamp(value: datetime) -> float:
+    """Convert a model datetime to a timestamp; naive values are UTC, as produced by utcnow()."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class TimingWheel:
+    """Hierarchical timing wheel mapping keys to expiry ticks.
+
+    Level 0 has one slot per tick; each higher level has one slot per full
+    turn of the level below. A key is placed in the lowest level whose
+    current turn contains its deadline and is cascaded down as the wheel
+    reaches its slot, so scheduling, cancelling and expiring are O(1) per
+    key and advancing never scans the keys that are not yet due. Deadlines
+    beyond the top level wait in an overflow set that is re-placed once
+    per top-level turn.
+    """
+
+    def __init__(self, tick: float = 1.0, slot_bits: int = 6, levels: int = 4, now: Optional[float] = None):
+        self.tick = tick
+        self.slot_bits = slot_bits
+        self.levels = levels
+        self._mask = (1 << slot_bits) - 1
+        self._slots: List[List[Set[str]]] = [[set() for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self._overflow: Set[str] = set()
+        self._deadlines: Dict[str, int] = {}
+        self._current = self._tick_of(time.time() if now is None else now)
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int(timestamp // self.tick)
+
+    def _slot_for(self, deadline: int) -> Optional[Set[str]]:
+        current = self._current
+        for level in range(self.levels):
+            shift = self.slot_bits * (level + 1)
+            if deadline >> shift == current >> shift:
+                return self._slots[level][(deadline >> (self.slot_bits * level)) & self._mask]
+        return None
+
+    def _place(self, key: str, deadline: int) -> None:
+        slot = self._slot_for(deadline)
+        (self._overflow if slot is None else slot).add(key)
+
+    def schedule(self, key: str, expires_at: float) -> None:
+        """Schedule a key to expire at a timestamp, replacing any earlier schedule."""
+        self.cancel(key)
+        deadline = max(self._tick_of(expires_at), self._current + 1)
+        self._deadlines[key] = deadline
+        self._place(key, deadline)
+
+    def cancel(self, key: str) -> None:
+        deadline = self._deadlines.pop(key, None)
+        if deadline is None:
+            return
+        slot = self._slot_for(deadline)
+        (self._overflow if slot is None else slot).discard(key)
+
+    def advance(self, now: Optional[float] = None) -> List[str]:
+        """Move the wheel to `now` and return the keys that have expired."""
+        target = self._tick_of(time.time() if now is None else now)
+        expired: List[str] = []
+        if not self._deadlines:
+            self._current = max(self._current, target)
+            return expired
+
+        while self._current < target:
+            self._current += 1
+            current = self._current
+
+            # Cascade higher levels whose slot starts at this tick, top level first
+            if current & ((1 << (self.slot_bits * self.levels)) - 1) == 0:
+                keys, self._overflow = self._overflow, set()
+                self._cascade(keys, expired)
+            for level in range(self.levels - 1, 0, -1):
+                shift = self.slot_bits * level
+                if current & ((1 << shift) - 1) == 0:
+                    index = (current >> shift) & self._mask
+                    keys, self._slots[level][index] = self._slots[level][index], set()
+                    self._cascade(keys, expired)
+
+            index = current & self._mask
+            if self._slots[0][index]:
+                keys, self._slots[0][index] = self._slots[0][index], set()
+                for key in keys:
+                    del self._deadlines[key]
+                expired.extend(keys)
+
+            if not self._deadlines:
+                self._current = target
+        return expired
+
+    def _cascade(self, keys: Iterable[str], expired: List[str]) -> None:
+        for key in keys:
+            deadline = self._deadlines[key]
+            if deadline <= self._current:
+                del self._deadlines[key]
+                expired.append(key)
+            else:
+                self._place(key, deadline)
+
+
+class SQLiteTokenBackend:
+    """Persist token records in a SQLite table so they survive restarts.
+
+    Rows are written through on every change. Expired rows are deleted
+    through an index on the expiry column, never by scanning the table.
+    Methods block on disk I/O; the store calls them from worker threads,
+    one at a time per backend.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            "kind TEXT NOT NULL, token_hash TEXT NOT NULL, user_id TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, data TEXT NOT NULL, PRIMARY KEY (kind, token_hash))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS tokens_expires_at ON tokens (expires_at)")
+        # Revoked token IDs; the sequence lets each worker fetch only what is new
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS revocations ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, jti TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS revocations_expires_at ON revocations (expires_at)")
+
+    def save(self, kind: str, token_hash: str, user_id: str, expires_at: float, data: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO tokens (kind, token_hash, user_id, expires_at, data) VALUES (?, ?, ?, ?, ?)",
+                (kind, token_hash, user_id, expires_at, data)
+            )
+
+    def get(self, kind: str, token_hash: str, now: float) -> Optional[str]:
+        """Get the serialized record for a token hash, if it has not expired."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM tokens WHERE kind = ? AND token_hash = ? AND expires_at > ?",
+                (kind, token_hash, now)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def take(self, kind: str, token_hash: str, now: float) -> Optional[str]:
+        """Delete and return an unexpired record in one statement, so only one caller gets it."""
+        with self._lock:
+            row = self._db.execute(
+                "DELETE FROM tokens WHERE kind = ? AND token_hash = ? AND expires_at > ? RETURNING data",
+                (kind, token_hash, now)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def delete(self, kind: str, token_hashes: Iterable[str]) -> int:
+        with self._lock:
+            return self._db.executemany(
+                "DELETE FROM tokens WHERE kind = ? AND token_hash = ?",
+                [(kind, token_hash) for token_hash in token_hashes]
+            ).rowcount
+
+    def delete_user(self, kind: str, user_id: str) -> int:
+        with self._lock:
+            return self._db.execute("DELETE FROM tokens WHERE kind = ? AND user_id = ?", (kind, user_id)).rowcount
+
+    def delete_expired(self, now: float) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM tokens WHERE expires_at <= ?", (now,))
+            self._db.execute("DELETE FROM revocations WHERE expires_at <= ?", (now,))
+
+    def exchange_revocations(
+        self, revoked: List[Tuple[str, float]], after: int, now: float
+    ) -> Tuple[int, List[Tuple[str, float]]]:
+        """Record revocations, then get the live ones recorded after sequence `after`.
+
+        Returns the last sequence number seen and the (jti, expires_at) pairs.
+        """
+        with self._lock:
+            if revoked:
+                self._db.executemany("INSERT INTO revocations (jti, expires_at) VALUES (?, ?)", revoked)
+            rows = self._db.execute(
+                "SELECT seq, jti, expires_at FROM revocations WHERE seq > ? ORDER BY seq", (after,)
+            ).fetchall()
+        last = rows[-1][0] if rows else after
+        return last, [(jti, expires_at) for _seq, jti, expires_at in rows if expires_at > now]
+
+    def load(self, kind: str, now: float) -> List[str]:
+        """Get the serialized records of a kind that have not expired."""
+        with self._lock:
+            rows = self._db.execute("SELECT data FROM tokens WHERE kind = ? AND expires_at > ?", (kind, now)).fetchall()
+        return [data for (data,) in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class ExpiringTokenStore(Generic[T]):
+    """Token records (refresh, password reset, email verification) indexed by token hash and user.
+
+    Records are models with `token_hash`, `user_id` and `expires_at` fields.
+    Lookups are dictionary hits; expired records are evicted by a timing
+    wheel that is advanced on each call, so expiry costs nothing per record
+    that is not yet due. An optional backend keeps the records across
+    restarts; records of several kinds can share one backend. With a
+    backend the store is also safe to share between worker processes:
+    local misses fall through to the backend, and single-use records are
+    claimed with an atomic delete there. Methods that may reach the
+    backend are coroutines and run its calls on a worker thread.
+    """
+
+    def __init__(
+        self,
+        model: Type[T],
+        kind: Optional[str] = None,
+        backend: Optional[SQLiteTokenBackend] = None,
+        tick: float = 1.0
+    ):
+        self.model = model
+        self.kind = kind or model.__name__
+        self.backend = backend
+        self.evictions = 0
+        # Locally evicted hashes, deleted from the backend with the next write
+        self._expired: List[str] = []
+        self._records: Dict[str, Tuple[T, float]] = {}
+        self._by_user: Dict[str, Set[str]] = {}
+        self._wheel = TimingWheel(tick)
+
+        if backend is not None:
+            now = time.time()
+            backend.delete_expired(now)
+            for data in backend.load(self.kind, now):
+                self._index(model.model_validate_json(data))
+
+    def __len__(self) -> int:
+        self.expire()
+        return len(self._records)
+
+    def _index(self, record: T) -> None:
+        expires_at = _timestamp(record.expires_at)
+        self._unindex(record.token_hash)
+        self._records[record.token_hash] = (record, expires_at)
+        self._by_user.setdefault(record.user_id, set()).add(record.token_hash)
+        self._wheel.schedule(record.token_hash, expires_at)
+
+    def _unindex(self, token_hash: str) -> Optional[T]:
+        entry = self._records.pop(token_hash, None)
+        if entry is None:
+            return None
+        record = entry[0]
+        hashes = self._by_user.get(record.user_id)
+        if hashes is not None:
+            hashes.discard(token_hash)
+            if not hashes:
+                del self._by_user[record.user_id]
+        return record
+
+    async def put(self, record: T) -> None:
+        """Store a record, replacing any record with the same token hash."""
+        self.expire()
+        if _timestamp(record.expires_at) <= time.time():
+            return
+        self._index(record)
+        if self.backend is not None:
+            expired, self._expired = self._expired, []
+            await asyncio.to_thread(self._save, record, expired)
+
+    def _save(self, record: T, expired: List[str]) -> None:
+        if expired:
+            self.backend.delete(self.kind, expired)
+        self.backend.save(
+            self.kind, record.token_hash, record.user_id,
+            _timestamp(record.expires_at), record.model_dump_json()
+        )
+
+    async def get(self, token_hash: str) -> Optional[T]:
+        """Get the live record for a token hash."""
+        self.expire()
+        now = time.time()
+        entry = self._records.get(token_hash)
+        if entry is not None:
+            return entry[0] if entry[1] > now else None
+        if self.backend is None:
+            return None
+        # Written by another process, or before this one started
+        data = await asyncio.to_thread(self.backend.get, self.kind, token_hash, now)
+        if data is None:
+            return None
+        record = self.model.model_validate_json(data)
+        self._index(record)
+        return record
+
+    async def pop(self, token_hash: str) -> Optional[T]:
+        """Remove and return the live record for a token hash, for single-use tokens."""
+        if self.backend is None:
+            record = await self.get(token_hash)
+            if record is not None:
+                await self.delete(token_hash)
+            return record
+
+        self.expire()
+        self._wheel.cancel(token_hash)
+        self._unindex(token_hash)
+        data = await asyncio.to_thread(self.backend.take, self.kind, token_hash, time.time())
+        return self.model.model_validate_json(data) if data is not None else None
+
+    async def delete(self, token_hash: str) -> bool:
+        self._wheel.cancel(token_hash)
+        record = self._unindex(token_hash)
+        if self.backend is not None:
+            deleted = await asyncio.to_thread(self.backend.delete, self.kind, [token_hash])
+            return deleted > 0 or record is not None
+        return record is not None
+
+    def for_user(self, user_id: str) -> List[T]:
+        """Get the live records of a user."""
+        self.expire()
+        now = time.time()
+        entries = (self._records[token_hash] for token_hash in self._by_user.get(user_id, ()))
+        return [record for record, expires_at in entries if expires_at > now]
+
+    async def delete_user(self, user_id: str) -> int:
+        """Remove every record of a user, e.g. to end all of their sessions."""
+        hashes = list(self._by_user.get(user_id, ()))
+        for token_hash in hashes:
+            self._wheel.cancel(token_hash)
+            self._unindex(token_hash)
+        if self.backend is not None:
+            deleted = await asyncio.to_thread(self.backend.delete_user, self.kind, user_id)
+            return max(deleted, len(hashes))
+        return len(hashes)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Evict the records that have expired by `now`."""
+        expired = self._wheel.advance(now)
+        for token_hash in expired:
+            self._unindex(token_hash)
+        if expired and self.backend is not None:
+            self._expired.extend(expired)
+        self.evictions += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "records": len(self._records),
+            "users": len(self._by_user),
+            "evictions": self.evictions,
+        }
@@ -8,14 +8,24 @@ from .exceptions import (
     AuthenticationException,
     AuthorizationException,
     NotFoundException,
+    TooManyRequestsException,
 )
 from .versioning import (
     APIVersion,
     VersionedController,
     VersionNegotiationMiddleware,
+    VersionDispatchTable,
     get_api_version,
     version_route,
 )
+from .middleware import RequestContextMiddleware
+from .exception_handlers import register_exception_handlers
+from .validation import CompiledValidator, compile_rules
+from .admission import AdmissionController, AdmissionControlMiddleware, Priority
+from .compression import CompressionMiddleware
+from .idempotency import IdempotencyMiddleware, IdempotencyStore
+from .openapi import add_openapi_routes
+from .projection import FieldProjection, compile_fields
 
 __all__ = [
     "BaseController",
@@ -25,9 +35,24 @@ __all__ = [
     "AuthenticationException",
     "AuthorizationException",
     "NotFoundException",
+    "TooManyRequestsException",
     "APIVersion",
     "VersionedController",
     "VersionNegotiationMiddleware",
+    "VersionDispatchTable",
     "get_api_version",
     "version_route",
+    "RequestContextMiddleware",
+    "register_exception_handlers",
+    "CompiledValidator",
+    "compile_rules",
+    "AdmissionController",
+    "AdmissionControlMiddleware",
+    "Priority",
+    "CompressionMiddleware",
+    "IdempotencyMiddleware",
+    "IdempotencyStore",
+    "add_openapi_routes",
+    "FieldProjection",
+    "compile_fields",
 ]
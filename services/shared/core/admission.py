@@ -0,0 +1,238 @@
+"""Admission control and priority load shedding."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .exception_handlers import render_error_body
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request priority classes; lower values are served first."""
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
+
+
+class ConcurrencyLimit:
+    """Concurrency limit with a bounded, priority-ordered wait queue."""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float = 5.0):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.shed_by_priority = {priority.name: 0 for priority in Priority}
+
+        # Heap of [priority, sequence, future]; entries whose future is done
+        # have already left the queue and are skipped lazily.
+        self._waiters: List[list] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests currently waiting for a slot."""
+        return self._queued
+
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> bool:
+        """Wait for a slot, returning False if the request was shed."""
+        if self.in_flight < self.max_concurrency and self._queued == 0:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+        if self._queued >= self.max_queue and not self._evict_lower_than(priority):
+            self._record_shed(priority)
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._sequence), future])
+        self._queued += 1
+
+        try:
+            await asyncio.wait((future,), timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            if future.done() and future.result():
+                # The slot was handed over just before the client went away
+                self.release()
+            elif not future.done():
+                future.cancel()
+                self._queued -= 1
+            raise
+
+        if not future.done():
+            future.cancel()
+            self._queued -= 1
+            self.timed_out += 1
+            self._record_shed(priority)
+            return False
+
+        if future.result():
+            self.admitted += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """Release a slot, handing it to the highest-priority waiter if any."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._queued -= 1
+                future.set_result(True)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters for tuning the limit."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self._queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+            "shed_by_priority": dict(self.shed_by_priority),
+        }
+
+    def _evict_lower_than(self, priority: Priority) -> bool:
+        """Shed the lowest-priority waiter to make room for a higher-priority request."""
+        worst = None
+        for entry in self._waiters:
+            if not entry[2].done() and (worst is None or entry[:2] > worst[:2]):
+                worst = entry
+
+        if worst is None or worst[0] <= priority:
+            return False
+
+        worst[2].set_result(False)
+        self._queued -= 1
+        self._record_shed(worst[0])
+
+        if len(self._waiters) > 2 * self.max_queue:
+            self._waiters = [entry for entry in self._waiters if not entry[2].done()]
+            heapq.heapify(self._waiters)
+        return True
+
+    def _record_shed(self, priority: Priority) -> None:
+        self.shed += 1
+        self.shed_by_priority[Priority(priority).name] += 1
+
+
+class AdmissionController:
+    """Maps request paths to priorities and concurrency limits."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        max_queue: int = 200,
+        queue_timeout: float = 5.0,
+        retry_after: int = 1
+    ):
+        self.default_limit = ConcurrencyLimit("default", max_concurrency, max_queue, queue_timeout)
+        self.retry_after = retry_after
+        self._limits: Dict[str, ConcurrencyLimit] = {"default": self.default_limit}
+        self._route_limits: Dict[str, ConcurrencyLimit] = {}
+        self._priorities: Dict[str, Priority] = {}
+
+    def limit_routes(
+        self,
+        name: str,
+        paths: List[str],
+        max_concurrency: int,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None
+    ) -> ConcurrencyLimit:
+        """Give a group of exact request paths a shared concurrency limit."""
+        limit = ConcurrencyLimit(
+            name,
+            max_concurrency,
+            self.default_limit.max_queue if max_queue is None else max_queue,
+            self.default_limit.queue_timeout if queue_timeout is None else queue_timeout
+        )
+        self._limits[name] = limit
+        for path in paths:
+            self._route_limits[path] = limit
+        return limit
+
+    def set_priority(self, path: str, priority: Priority) -> None:
+        """Set the priority class of an exact request path."""
+        self._priorities[path] = priority
+
+    def classify(self, path: str) -> Tuple[Priority, Optional[ConcurrencyLimit]]:
+        """Get the priority and limit for a path; critical paths have no limit."""
+        priority = self._priorities.get(path, Priority.NORMAL)
+        if priority is Priority.CRITICAL:
+            return priority, None
+        return priority, self._route_limits.get(path, self.default_limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and shed counters for every limit."""
+        return {"limits": {name: limit.stats() for name, limit in self._limits.items()}}
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware that queues or sheds requests according to an AdmissionController.
+
+    Shed requests get an immediate 503 with a Retry-After header instead of
+    piling up behind saturated handlers.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+        self._retry_after = str(controller.retry_after).encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        priority, limit = self.controller.classify(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limit.acquire(priority):
+            logger.warning(f"Request shed | Path: {scope['path']} | Limit: {limit.name} | Priority: {priority.name}")
+            await self._send_overloaded(scope, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limit.release()
+
+    async def _send_overloaded(self, scope: Scope, send: Send) -> None:
+        """Send the prerendered 503 envelope."""
+        api_version = scope.get("state", {}).get("api_version")
+        body = render_error_body(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            "Service is overloaded, please retry later",
+            api_version.value if api_version is not None else None
+        )
+        await send({
+            "type": "http.response.start",
+            "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", self._retry_after),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
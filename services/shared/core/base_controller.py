@@ -2,15 +2,27 @@
 
 from abc import ABC
 from typing import Any, Dict, Optional
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
+from starlette.responses import Response
 
 from .exceptions import ServiceException
+from .projection import compile_fields
+from .responses import (
+    COMPACT_ENVELOPE,
+    EnvelopeResponse,
+    build_envelope,
+    conditional_response,
+    wants_compact_envelope,
+)
 
 
 class BaseController(ABC):
     """Base controller class that provides common functionality for all controllers."""
     
+    # Cache-Control policies keyed by route name (the endpoint function name)
+    cache_policies: Dict[str, str] = {}
+    
     def __init__(self):
         """Initialize the base controller."""
         pass
@@ -19,19 +31,68 @@ class BaseController(ABC):
         self, 
         data: Any = None, 
         message: str = "Success", 
-        status_code: int = status.HTTP_200_OK
+        status_code: int = status.HTTP_200_OK,
+        fields: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Create a standardized success response."""
-        response = {
-            "success": True,
-            "message": message,
-            "status_code": status_code
-        }
+        """Create a standardized success response.
         
-        if data is not None:
-            response["data"] = data
-            
-        return response
+        `fields` is a comma-separated list of dotted paths into `data`
+        (e.g. `user.email,tokens`); only those fields are included.
+        """
+        return build_envelope(self.project_fields(data, fields), message, status_code)
+    
+    def project_fields(self, data: Any, fields: Optional[str]) -> Any:
+        """Project data down to a sparse fieldset before it is serialized."""
+        projection = compile_fields(fields)
+        if projection is None or data is None:
+            return data
+        return projection.apply(data)
+    
+    def envelope_response(
+        self, 
+        data: Any = None, 
+        message: str = "Success", 
+        status_code: int = status.HTTP_200_OK,
+        request: Optional[Request] = None,
+        cache_control: Optional[str] = None
+    ) -> Response:
+        """Create a pre-serialized success response for trusted service output.
+        
+        The envelope is encoded directly to bytes and skips response_model
+        re-validation. Clients sending `Prefer: envelope=compact` receive the
+        compact envelope. When the request is given, the response carries a
+        strong ETag, conditional requests are answered with 304 and a
+        `fields=` query parameter selects a sparse fieldset of `data`.
+        """
+        headers = {"Vary": "Prefer"}
+        fields = request.query_params.get("fields") if request is not None else None
+        
+        if wants_compact_envelope(request):
+            content = build_envelope(self.project_fields(data, fields), compact=True)
+            headers["Preference-Applied"] = COMPACT_ENVELOPE
+        else:
+            content = self.success_response(data, message, status_code, fields=fields)
+        
+        response = EnvelopeResponse(content=content, status_code=status_code, headers=headers)
+        return conditional_response(response, request, cache_control or self.get_cache_policy(request))
+    
+    def json_response(
+        self, 
+        content: Any, 
+        request: Optional[Request] = None,
+        status_code: int = status.HTTP_200_OK,
+        cache_control: Optional[str] = None
+    ) -> Response:
+        """Create a pre-serialized JSON response for a non-envelope payload."""
+        response = EnvelopeResponse(content=content, status_code=status_code)
+        return conditional_response(response, request, cache_control or self.get_cache_policy(request))
+    
+    def get_cache_policy(self, request: Optional[Request]) -> Optional[str]:
+        """Get the Cache-Control policy declared for the request's route."""
+        if request is None or not self.cache_policies:
+            return None
+        route = request.scope.get("route")
+        return self.cache_policies.get(getattr(route, "name", None))
     
     def error_response(
         self, 
@@ -1,10 +1,12 @@
 """Base service class with common functionality."""
 
 from abc import ABC
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import logging
+from fastapi import status
 
 from .exceptions import ServiceException, ValidationException
+from .validation import compile_rules
 
 
 class BaseService(ABC):
@@ -16,45 +18,15 @@ class BaseService(ABC):
     
     def validate_input(self, data: Dict[str, Any], validation_rules: Dict[str, Any]) -> None:
         """Validate input data against validation rules."""
-        errors = []
-        
-        for field, rules in validation_rules.items():
-            value = data.get(field)
-            
-            # Check required fields
-            if rules.get("required", False) and (value is None or value == ""):
-                errors.append(f"{field} is required")
-                continue
-            
-            # Skip validation if field is not required and not provided
-            if value is None:
-                continue
-            
-            # Check data type
-            expected_type = rules.get("type")
-            if expected_type and not isinstance(value, expected_type):
-                errors.append(f"{field} must be of type {expected_type.__name__}")
-            
-            # Check minimum length
-            min_length = rules.get("min_length")
-            if min_length and isinstance(value, str) and len(value) < min_length:
-                errors.append(f"{field} must be at least {min_length} characters long")
-            
-            # Check maximum length
-            max_length = rules.get("max_length")
-            if max_length and isinstance(value, str) and len(value) > max_length:
-                errors.append(f"{field} must be at most {max_length} characters long")
-            
-            # Check custom validation function
-            custom_validator = rules.get("validator")
-            if custom_validator and callable(custom_validator):
-                try:
-                    custom_validator(value)
-                except ValueError as e:
-                    errors.append(f"{field}: {str(e)}")
-        
-        if errors:
-            raise ValidationException("Validation failed", details={"errors": errors})
+        compile_rules(validation_rules).validate(data)
+    
+    def validate_batch(
+        self, 
+        records: List[Dict[str, Any]], 
+        validation_rules: Dict[str, Any]
+    ) -> Dict[int, List[str]]:
+        """Validate a list of records, returning errors keyed by record index."""
+        return compile_rules(validation_rules).validate_batch(records)
     
     def log_operation(self, operation: str, details: Optional[Dict[str, Any]] = None) -> None:
         """Log service operations."""
@@ -64,21 +36,33 @@ class BaseService(ABC):
         
         self.logger.info(log_message)
     
-    def log_error(self, operation: str, error: Exception, details: Optional[Dict[str, Any]] = None) -> None:
+    def log_error(
+        self, 
+        operation: str, 
+        error: Exception, 
+        details: Optional[Dict[str, Any]] = None,
+        exc_info: bool = True
+    ) -> None:
         """Log service errors."""
         log_message = f"Error in operation: {operation} | Error: {str(error)}"
         if details:
             log_message += f" | Details: {details}"
         
-        self.logger.error(log_message, exc_info=True)
+        self.logger.error(log_message, exc_info=exc_info)
     
     def handle_exception(self, operation: str, error: Exception) -> ServiceException:
         """Handle and convert exceptions to service exceptions."""
-        self.log_error(operation, error)
-        
         if isinstance(error, ServiceException):
+            # Expected domain errors (4xx) are logged without traceback capture
+            if error.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR:
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(f"Rejected operation: {operation} | Reason: {error.message}")
+            else:
+                self.log_error(operation, error)
             return error
         
+        self.log_error(operation, error)
+        
         # Convert common exceptions to service exceptions
         if isinstance(error, ValueError):
             return ValidationException(str(error))
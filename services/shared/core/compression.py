@@ -0,0 +1,245 @@
+"""Response compression with gzip/brotli negotiation."""
+
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is an optional dependency
+    brotli = None
+
+
+# Minimum body size in bytes per content type; types not listed are never compressed.
+# Entries ending in "/" apply to every subtype.
+DEFAULT_CONTENT_TYPE_RULES: Dict[str, int] = {
+    "text/": 500,
+    "application/json": 500,
+    "application/javascript": 500,
+    "application/xml": 500,
+    "image/svg+xml": 500,
+}
+
+
+def parse_accept_encoding(accept_encoding: str) -> Set[str]:
+    """Get the encodings an Accept-Encoding header accepts (q > 0)."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0 and name.strip():
+            accepted.add(name.strip())
+    return accepted
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    """Mark a strong ETag weak; strong ETags must differ between content encodings."""
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+def _gzip_compressor(level: int):
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+class _StreamEncoder:
+    """Incremental encoder that flushes after every chunk so streams stay live."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+            self._compress = self._compressor.process
+        else:
+            self._compressor = _gzip_compressor(gzip_level)
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+            self._compress = self._compressor.compress
+
+    def encode(self, chunk: bytes, final: bool) -> bytes:
+        data = self._compress(chunk)
+        return data + (self._finish() if final else self._flush())
+
+
+class CompressedBodyCache:
+    """Bounded LRU of compressed bodies keyed by content digest and encoding."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+
+    def get(self, key: Tuple[bytes, str]) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: Tuple[bytes, str], body: bytes) -> None:
+        self._entries[key] = body
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses with brotli or gzip.
+
+    Single-message bodies are compressed in one shot. Bodies of at least
+    `cache_min_size` bytes are keyed by digest, so static and repeated
+    payloads (OpenAPI specs, docs pages, cached responses) are compressed
+    once and reused. Streaming bodies are compressed chunk by chunk.
+    Strong ETags on compressed responses (and on 304s answering a request
+    that negotiated compression) are made weak, since the encoded bytes
+    differ from the identity body they were computed from.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        content_type_rules: Optional[Dict[str, int]] = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        cache_min_size: int = 16 * 1024,
+        cache: Optional[CompressedBodyCache] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_type_rules = DEFAULT_CONTENT_TYPE_RULES if content_type_rules is None else content_type_rules
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache_min_size = cache_min_size
+        self.cache = cache or CompressedBodyCache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        minimum_size: Optional[int] = None
+        encoder: Optional[_StreamEncoder] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, minimum_size, encoder
+
+            if message["type"] == "http.response.start":
+                if message["status"] == 304:
+                    # The client holds the negotiated (possibly compressed) representation
+                    headers = MutableHeaders(raw=message["headers"])
+                    _weaken_etag(headers)
+                    headers.add_vary_header("Accept-Encoding")
+                    await send(message)
+                    return
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" not in headers:
+                    minimum_size = self._minimum_size_for(headers.get("content-type", ""))
+                if minimum_size is None:
+                    await send(message)
+                else:
+                    # Hold the start message until the first body chunk decides the encoding
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+
+                if not more_body:
+                    if len(body) >= minimum_size:
+                        body = self._compress_body(body, encoding)
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(body))
+                        _weaken_etag(headers)
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    start_message = None
+                    return
+
+                encoder = _StreamEncoder(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                _weaken_etag(headers)
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await send(start_message)
+
+            await send({
+                "type": "http.response.body",
+                "body": encoder.encode(body, final=not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Pick brotli or gzip from the Accept-Encoding header."""
+        if not accept_encoding:
+            return None
+
+        accepted = parse_accept_encoding(accept_encoding)
+        if brotli is not None and ("br" in accepted or "*" in accepted):
+            return "br"
+        if "gzip" in accepted or "*" in accepted:
+            return "gzip"
+        return None
+
+    def _minimum_size_for(self, content_type: str) -> Optional[int]:
+        """Get the compression threshold for a content type, or None to skip it."""
+        mime = content_type.partition(";")[0].strip().lower()
+        if not mime:
+            return None
+
+        minimum_size = self.content_type_rules.get(mime)
+        if minimum_size is None:
+            minimum_size = self.content_type_rules.get(mime.partition("/")[0] + "/")
+        if minimum_size is None:
+            return None
+        return max(minimum_size, self.minimum_size)
+
+    def _compress_body(self, body: bytes, encoding: str) -> bytes:
+        """Compress a complete body, reusing cached output for large repeated bodies."""
+        key = None
+        if len(body) >= self.cache_min_size:
+            key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressor = _gzip_compressor(self.gzip_level)
+            compressed = compressor.compress(body) + compressor.flush()
+
+        if key is not None:
+            self.cache.put(key, compressed)
+        return compressed
@@ -0,0 +1,336 @@
+"""Async SQL connection pool with prepared statements, over SQLite or PostgreSQL."""
+
+import asyncio
+import re
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from fastapi import status
+
+from .exceptions import ServiceException
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - asyncpg is an optional dependency
+    asyncpg = None
+
+# Queries are written with PostgreSQL's numbered placeholders ($1, $2, ...)
+_PLACEHOLDER = re.compile(r"\$(\d+)")
+
+# Constraint violations raised by either driver
+INTEGRITY_ERRORS = (sqlite3.IntegrityError,) + ((asyncpg.IntegrityConstraintViolationError,) if asyncpg else ())
+
+
+class LatencyStats:
+    """Count, mean and maximum of a latency."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class SQLiteConnection:
+    """A sqlite3 connection driven from worker threads, one call at a time.
+
+    sqlite3 keeps a per-connection cache of compiled statements keyed by
+    SQL text, so every query text is compiled once per connection and then
+    reused with new parameters. Each call runs shielded, so cancelling the
+    caller does not abandon a statement that is still running in its thread.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+        self._running: Optional[asyncio.Future] = None
+
+    async def _call(self, func: Callable[[], Any]) -> Any:
+        self._running = asyncio.ensure_future(asyncio.to_thread(func))
+        return await asyncio.shield(self._running)
+
+    @classmethod
+    async def connect(cls, path: str) -> "SQLiteConnection":
+        def open_connection() -> sqlite3.Connection:
+            connection = sqlite3.connect(
+                path, uri=True, isolation_level=None, check_same_thread=False, cached_statements=256
+            )
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            return connection
+
+        return cls(await asyncio.to_thread(open_connection))
+
+    @staticmethod
+    def _sql(sql: str) -> str:
+        return _PLACEHOLDER.sub(r"?\1", sql)
+
+    async def fetch(self, sql: str, args: tuple) -> List[Dict[str, Any]]:
+        sql = self._sql(sql)
+        rows = await self._call(lambda: self._connection.execute(sql, args).fetchall())
+        return [dict(row) for row in rows]
+
+    async def fetchrow(self, sql: str, args: tuple) -> Optional[Dict[str, Any]]:
+        sql = self._sql(sql)
+        row = await self._call(lambda: self._connection.execute(sql, args).fetchone())
+        return dict(row) if row is not None else None
+
+    async def execute(self, sql: str, args: tuple) -> int:
+        sql = self._sql(sql)
+        return await self._call(lambda: self._connection.execute(sql, args).rowcount)
+
+    async def executemany(self, sql: str, args: List[tuple]) -> int:
+        sql = self._sql(sql)
+
+        def run() -> int:
+            # The connection autocommits, so group the rows explicitly
+            self._connection.execute("BEGIN")
+            try:
+                count = self._connection.executemany(sql, args).rowcount
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+            return count
+
+        return await self._call(run)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._connection.close)
+
+    async def abort(self) -> None:
+        """Close once the statement in flight, if any, has finished."""
+        if self._running is not None:
+            await asyncio.wait([self._running])
+        await self.close()
+
+
+class PostgresConnection:
+    """An asyncpg connection that prepares each query text once and reuses it."""
+
+    def __init__(self, connection: Any):
+        self._connection = connection
+        self._statements: Dict[str, Any] = {}
+
+    @classmethod
+    async def connect(cls, url: str) -> "PostgresConnection":
+        if asyncpg is None:
+            raise ImportError("asyncpg is required for PostgreSQL DATABASE_URLs")
+        return cls(await asyncpg.connect(url))
+
+    async def _prepared(self, sql: str) -> Any:
+        statement = self._statements.get(sql)
+        if statement is None:
+            statement = self._statements[sql] = await self._connection.prepare(sql)
+        return statement
+
+    async def fetch(self, sql: str, args: tuple) -> List[Dict[str, Any]]:
+        return [dict(record) for record in await (await self._prepared(sql)).fetch(*args)]
+
+    async def fetchrow(self, sql: str, args: tuple) -> Optional[Dict[str, Any]]:
+        record = await (await self._prepared(sql)).fetchrow(*args)
+        return dict(record) if record is not None else None
+
+    async def execute(self, sql: str, args: tuple) -> int:
+        statement = await self._prepared(sql)
+        await statement.fetch(*args)
+        # Status messages look like "UPDATE 3"
+        count = statement.get_statusmsg().rsplit(" ", 1)[-1]
+        return int(count) if count.isdigit() else 0
+
+    async def executemany(self, sql: str, args: List[tuple]) -> int:
+        async with self._connection.transaction():
+            await self._connection.executemany(sql, args)
+        # asyncpg does not report row counts for executemany
+        return len(args)
+
+    async def close(self) -> None:
+        await self._connection.close()
+
+    async def abort(self) -> None:
+        """Drop the connection even with an operation in progress; the server rolls it back."""
+        self._connection.terminate()
+
+
+class Database:
+    """Fixed-size async connection pool.
+
+    `start()` opens every connection up front and validates it with a
+    trivial query, so a bad URL or an undersized server fails the startup
+    rather than the first request. Callers wait at most `acquire_timeout`
+    seconds for a connection and then get a 503. Pool wait times and
+    per-statement query latencies are kept for `stats()`.
+    """
+
+    def __init__(self, url: str, size: int = 10, acquire_timeout: float = 5.0):
+        parsed = urlparse(url)
+        if parsed.scheme == "sqlite":
+            self.driver = "sqlite"
+            path = url[len("sqlite:///"):] or ":memory:"
+            # Connections to one in-memory database must share its cache
+            self._target = f"file:db{id(self)}?mode=memory&cache=shared" if path == ":memory:" else path
+        elif parsed.scheme in ("postgres", "postgresql"):
+            self.driver = "postgresql"
+            self._target = url
+        else:
+            raise ValueError(f"Unsupported database URL scheme: {parsed.scheme}")
+
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.timeouts = 0
+        self.replaced = 0
+        self._replacing: Set[asyncio.Task] = set()
+        self.acquire_wait = LatencyStats()
+        self.queries: Dict[str, LatencyStats] = {}
+        self._connections: List[Any] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._waiting = 0
+
+    async def _connect(self) -> Any:
+        if self.driver == "sqlite":
+            return await SQLiteConnection.connect(self._target)
+        return await PostgresConnection.connect(self._target)
+
+    async def start(self) -> None:
+        """Open and validate every connection in the pool."""
+        if self._idle is not None:
+            return
+
+        results = await asyncio.gather(*(self._connect() for _ in range(self.size)), return_exceptions=True)
+        connections = [result for result in results if not isinstance(result, BaseException)]
+        try:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            for connection in connections:
+                row = await connection.fetchrow("SELECT 1 AS ok", ())
+                if row is None or row["ok"] != 1:
+                    raise RuntimeError("Database connection failed validation")
+        except BaseException:
+            await asyncio.gather(*(connection.close() for connection in connections), return_exceptions=True)
+            raise
+
+        self._connections = connections
+        self._idle = asyncio.Queue()
+        for connection in connections:
+            self._idle.put_nowait(connection)
+
+    async def close(self) -> None:
+        connections, self._connections, self._idle = self._connections, [], None
+        await asyncio.gather(*(connection.close() for connection in connections), return_exceptions=True)
+        # Connections being replaced close themselves once their statement finishes
+        await asyncio.gather(*self._replacing, return_exceptions=True)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        """Borrow a connection from the pool."""
+        if self._idle is None:
+            raise RuntimeError("Database pool has not been started")
+
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            connection = await asyncio.wait_for(self._idle.get(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise ServiceException("Database is busy", status.HTTP_503_SERVICE_UNAVAILABLE)
+        finally:
+            self._waiting -= 1
+        self.acquire_wait.record(time.perf_counter() - started)
+
+        try:
+            yield connection
+        except asyncio.CancelledError:
+            # A statement may still be running on it, possibly inside an open
+            # transaction, so it is replaced rather than handed to the next borrower
+            self._replace(connection)
+            raise
+        except BaseException:
+            self._idle.put_nowait(connection)
+            raise
+        else:
+            self._idle.put_nowait(connection)
+
+    def _replace(self, connection: Any) -> None:
+        self.replaced += 1
+        if connection in self._connections:
+            self._connections.remove(connection)
+        task = asyncio.ensure_future(self._reopen(connection))
+        self._replacing.add(task)
+        task.add_done_callback(self._replacing.discard)
+
+    async def _reopen(self, connection: Any) -> None:
+        # Open the replacement first: an in-memory database lives only while a connection is open
+        idle = self._idle
+        while idle is not None and idle is self._idle:
+            try:
+                fresh = await self._connect()
+            except Exception:
+                await asyncio.sleep(1.0)
+                continue
+            if idle is self._idle:
+                self._connections.append(fresh)
+                idle.put_nowait(fresh)
+            else:
+                await fresh.close()
+            break
+        try:
+            await connection.abort()
+        except Exception:
+            pass  # it is being dropped either way
+
+    async def _run(self, method: str, name: str, sql: str, args: tuple) -> Any:
+        async with self.connection() as connection:
+            started = time.perf_counter()
+            try:
+                return await getattr(connection, method)(sql, args)
+            finally:
+                stats = self.queries.get(name)
+                if stats is None:
+                    stats = self.queries[name] = LatencyStats()
+                stats.record(time.perf_counter() - started)
+
+    async def fetch_all(self, sql: str, *args: Any, name: str = "query") -> List[Dict[str, Any]]:
+        return await self._run("fetch", name, sql, args)
+
+    async def fetch_one(self, sql: str, *args: Any, name: str = "query") -> Optional[Dict[str, Any]]:
+        return await self._run("fetchrow", name, sql, args)
+
+    async def execute(self, sql: str, *args: Any, name: str = "query") -> int:
+        """Run a statement and return the number of affected rows."""
+        return await self._run("execute", name, sql, args)
+
+    async def execute_many(self, sql: str, rows: List[tuple], name: str = "query") -> int:
+        """Run a statement once per row on one connection, in a single transaction."""
+        if not rows:
+            return 0
+        return await self._run("executemany", name, sql, rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool wait and per-statement latency counters."""
+        return {
+            "driver": self.driver,
+            "size": self.size,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "waiting": self._waiting,
+            "timeouts": self.timeouts,
+            "replaced": self.replaced,
+            "acquire_wait": self.acquire_wait.snapshot(),
+            "queries": {name: stats.snapshot() for name, stats in self.queries.items()},
+        }
@@ -0,0 +1,97 @@
+"""Application-level exception handlers for the service exception hierarchy."""
+
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import FastAPI, Request, status
+from starlette.responses import Response
+
+from .exceptions import ServiceException
+from .responses import json_dumps
+from .versioning import APIVersion
+
+logger = logging.getLogger(__name__)
+
+# Messages raised often enough that their bodies are rendered at import time
+COMMON_ERRORS = [
+    (status.HTTP_401_UNAUTHORIZED, "Authentication failed"),
+    (status.HTTP_401_UNAUTHORIZED, "Invalid credentials"),
+    (status.HTTP_401_UNAUTHORIZED, "Invalid token"),
+    (status.HTTP_401_UNAUTHORIZED, "Token has expired"),
+    (status.HTTP_403_FORBIDDEN, "Access denied"),
+    (status.HTTP_403_FORBIDDEN, "Insufficient permissions"),
+    (status.HTTP_404_NOT_FOUND, "Resource not found"),
+    (status.HTTP_404_NOT_FOUND, "User not found"),
+]
+
+_UNAUTHORIZED_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+
+@lru_cache(maxsize=512)
+def render_error_body(status_code: int, message: str, api_version: Optional[str] = None) -> bytes:
+    """Serialize a detail-less error envelope, reusing the bytes for repeated errors."""
+    body = {
+        "success": False,
+        "message": message,
+        "status_code": status_code
+    }
+    if api_version:
+        body["api_version"] = api_version
+
+    return json_dumps(body)
+
+
+def _render_error_body_with_details(exc: ServiceException, api_version: Optional[str]) -> bytes:
+    """Serialize an error envelope carrying exception details."""
+    body = {
+        "success": False,
+        "message": exc.message,
+        "status_code": exc.status_code,
+        "details": exc.details
+    }
+    if api_version:
+        body["api_version"] = api_version
+
+    return json_dumps(body)
+
+
+async def service_exception_handler(request: Request, exc: ServiceException) -> Response:
+    """Render a ServiceException as the standard error envelope."""
+    api_version = getattr(request.state, "api_version", None)
+    api_version = api_version.value if api_version is not None else None
+
+    if exc.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+        logger.error(f"Service error | Path: {request.url.path} | Error: {exc.message}", exc_info=exc)
+
+    if exc.details:
+        content = _render_error_body_with_details(exc, api_version)
+    else:
+        content = render_error_body(exc.status_code, exc.message, api_version)
+
+    headers = _UNAUTHORIZED_HEADERS if exc.status_code == status.HTTP_401_UNAUTHORIZED else None
+    if exc.headers:
+        headers = {**(headers or {}), **exc.headers}
+
+    return Response(
+        content=content,
+        status_code=exc.status_code,
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    """Register the service exception handlers on an application."""
+    app.add_exception_handler(ServiceException, service_exception_handler)
+
+
+def _prerender_common_errors() -> None:
+    """Populate the body cache with the common 401/403/404 envelopes."""
+    for status_code, message in COMMON_ERRORS:
+        render_error_body(status_code, message)
+        for version in APIVersion:
+            render_error_body(status_code, message, version.value)
+
+
+_prerender_common_errors()
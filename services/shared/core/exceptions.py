@@ -11,11 +11,13 @@ class ServiceException(Exception):
         self, 
         message: str = "A service error occurred",
         status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR,
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.message = message
         self.status_code = status_code
         self.details = details or {}
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -92,3 +94,20 @@ class ConflictException(ServiceException):
             status_code=status.HTTP_409_CONFLICT,
             details=details
         )
+
+
+class TooManyRequestsException(ServiceException):
+    """Exception for rate-limited requests."""
+    
+    def __init__(
+        self, 
+        message: str = "Too many requests",
+        details: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            details=details,
+            headers=headers
+        )
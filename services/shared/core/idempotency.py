@@ -0,0 +1,272 @@
+"""Idempotency-Key support for retried POST requests."""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .exception_handlers import render_error_body
+
+logger = logging.getLogger(__name__)
+
+IdempotencyKey = Tuple[str, bytes, str]
+
+
+class StoredResponse:
+    """A completed response kept for replay."""
+
+    __slots__ = ("fingerprint", "status", "headers", "body", "expires_at")
+
+    def __init__(self, fingerprint: bytes, status: int, headers: List[Tuple[bytes, bytes]], body: bytes, expires_at: float):
+        self.fingerprint = fingerprint
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires_at = expires_at
+
+
+class IdempotencyStore:
+    """TTL- and size-bounded response cache with in-flight request tracking."""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.replays = 0
+        self._responses: "OrderedDict[IdempotencyKey, StoredResponse]" = OrderedDict()
+        self._in_flight: Dict[IdempotencyKey, asyncio.Future] = {}
+
+    def get(self, key: IdempotencyKey) -> Optional[StoredResponse]:
+        """Get a stored response, dropping it if it has expired."""
+        stored = self._responses.get(key)
+        if stored is None:
+            return None
+        if stored.expires_at <= time.monotonic():
+            del self._responses[key]
+            return None
+        self._responses.move_to_end(key)
+        return stored
+
+    def put(self, key: IdempotencyKey, stored: StoredResponse) -> None:
+        """Store a completed response, evicting the least recently used entries."""
+        self._responses[key] = stored
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+
+    def begin(self, key: IdempotencyKey) -> Optional[asyncio.Future]:
+        """Mark a key as in flight, or return the future of the request already running it."""
+        future = self._in_flight.get(key)
+        if future is not None:
+            return future
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+        return None
+
+    def finish(self, key: IdempotencyKey, stored: Optional[StoredResponse]) -> None:
+        """Complete an in-flight key, waking any duplicates waiting on it."""
+        if stored is not None:
+            self.put(key, stored)
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(stored)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "stored": len(self._responses),
+            "in_flight": len(self._in_flight),
+            "replays": self.replays,
+        }
+
+
+class IdempotencyMiddleware:
+    """Pure ASGI middleware replaying responses for repeated Idempotency-Key requests.
+
+    Keys are scoped by route and caller (a digest of the Authorization header)
+    and bound to a fingerprint of the request body, so reusing a key with a
+    different payload is rejected with 422. Anonymous callers all share an
+    empty Authorization header, so their scope also includes the body
+    fingerprint and only a caller that sent the same payload gets the replay.
+    Duplicates that arrive while the original is still running wait for it
+    instead of executing again. Server errors are not stored, so clients can
+    retry them. Requests larger than `max_request_size` are passed through
+    without idempotency handling.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore,
+        paths: Iterable[str],
+        max_body_size: int = 64 * 1024,
+        max_request_size: int = 64 * 1024,
+        wait_timeout: float = 30.0
+    ):
+        self.app = app
+        self.store = store
+        self.paths = frozenset(paths)
+        self.max_body_size = max_body_size
+        self.max_request_size = max_request_size
+        self.wait_timeout = wait_timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_request_size:
+            await self.app(scope, receive, send)
+            return
+
+        messages, complete = await self._read_body(receive)
+        if not complete:
+            await self.app(scope, self._prepend(messages, receive), send)
+            return
+        body = b"".join(message.get("body", b"") for message in messages)
+        fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+
+        authorization = headers.get("authorization", "")
+        caller = hashlib.blake2b(authorization.encode("latin-1"), digest_size=16)
+        if not authorization:
+            caller.update(fingerprint)
+        key = (scope["path"], caller.digest(), idempotency_key)
+
+        while True:
+            stored = self.store.get(key)
+            if stored is not None:
+                await self._replay(stored, fingerprint, send)
+                return
+
+            in_flight = self.store.begin(key)
+            if in_flight is None:
+                break
+
+            try:
+                stored = await asyncio.wait_for(asyncio.shield(in_flight), self.wait_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Idempotent request still in flight | Path: {scope['path']}")
+                await self._send_error(send, status.HTTP_409_CONFLICT, "A request with this Idempotency-Key is still in progress")
+                return
+            if stored is not None:
+                await self._replay(stored, fingerprint, send)
+                return
+            # The original did not produce a storable response; run the request ourselves
+
+        await self._execute(scope, receive, key, body, fingerprint, send)
+
+    async def _execute(
+        self,
+        scope: Scope,
+        receive: Receive,
+        key: IdempotencyKey,
+        body: bytes,
+        fingerprint: bytes,
+        send: Send
+    ) -> None:
+        """Run the request once, capturing its response for later replays."""
+        body_sent = False
+        start_message: Optional[Message] = None
+        chunks: List[bytes] = []
+        size = 0
+
+        async def receive_replay() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def send_capture(message: Message) -> None:
+            nonlocal start_message, size
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] == "http.response.body" and size <= self.max_body_size:
+                chunk = message.get("body", b"")
+                chunks.append(chunk)
+                size += len(chunk)
+            await send(message)
+
+        stored = None
+        try:
+            await self.app(scope, receive_replay, send_capture)
+            if (
+                start_message is not None
+                and start_message["status"] < status.HTTP_500_INTERNAL_SERVER_ERROR
+                and size <= self.max_body_size
+            ):
+                stored = StoredResponse(
+                    fingerprint,
+                    start_message["status"],
+                    list(start_message.get("headers", [])),
+                    b"".join(chunks),
+                    time.monotonic() + self.store.ttl_seconds
+                )
+        finally:
+            self.store.finish(key, stored)
+
+    async def _replay(self, stored: StoredResponse, fingerprint: bytes, send: Send) -> None:
+        """Send a stored response, or 422 if the key was reused with another payload."""
+        if stored.fingerprint != fingerprint:
+            await self._send_error(
+                send,
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                "Idempotency-Key was already used with a different request payload"
+            )
+            return
+
+        self.store.replays += 1
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": stored.headers + [(b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+    async def _read_body(self, receive: Receive) -> Tuple[List[Message], bool]:
+        """Read the request messages; stops early (incomplete) past `max_request_size`."""
+        messages = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            messages.append(message)
+            size += len(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            if size > self.max_request_size:
+                return messages, False
+        return messages, True
+
+    @staticmethod
+    def _prepend(messages: List[Message], receive: Receive) -> Receive:
+        """A receive channel that replays already-read messages before reading on."""
+        pending = list(messages)
+
+        async def replay() -> Message:
+            if pending:
+                return pending.pop(0)
+            return await receive()
+
+        return replay
+
+    async def _send_error(self, send: Send, status_code: int, message: str) -> None:
+        body = render_error_body(status_code, message)
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
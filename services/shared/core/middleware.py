@@ -1,13 +1,21 @@
+import json
+import re
 import time
 import uuid
-from typing import Callable
+from typing import Callable, Optional, Tuple
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from fastapi.responses import JSONResponse
 import logging
 
+from .versioning import APIVersion, VersionDispatchTable
+
 logger = logging.getLogger(__name__)
 
+# Request IDs propagated by the proxy/gateway are kept if they look sane
+_REQUEST_ID = re.compile(rb"[A-Za-z0-9._-]{1,128}")
+
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """Middleware to log all requests and responses."""
@@ -64,3 +72,117 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                     "request_id": request_id
                 }
             )
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware handling request IDs, timing, versioning and errors in one pass.
+    
+    Replaces the ``RequestLoggingMiddleware``/``ErrorHandlingMiddleware``/
+    ``VersionNegotiationMiddleware`` stack. Messages are forwarded to ``send``
+    as they are produced, so streaming bodies are never buffered.
+    """
+    
+    def __init__(
+        self, 
+        app: ASGIApp, 
+        default_version: APIVersion = APIVersion.get_default(),
+        version_table: Optional[VersionDispatchTable] = None
+    ):
+        self.app = app
+        self.version_table = version_table or VersionDispatchTable(default_version=default_version)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = self._incoming_request_id(scope) or str(uuid.uuid4())
+        scope, version = self._resolve_version(scope)
+        
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["api_version"] = version
+        
+        extra_headers = [(b"x-request-id", request_id.encode("latin-1"))]
+        extra_headers.extend(self.version_table.response_headers(version))
+        
+        start_time = time.perf_counter()
+        if logger.isEnabledFor(logging.INFO):
+            client = scope.get("client")
+            logger.info(
+                f"Request started | ID: {request_id} | Method: {scope['method']} | "
+                f"URL: {scope['path']} | Client: {client[0] if client else 'unknown'}"
+            )
+        
+        response_started = False
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, status_code
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + extra_headers
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            logger.error(
+                f"Unhandled exception | Request ID: {request_id} | Error: {str(exc)}",
+                exc_info=True
+            )
+            if response_started:
+                raise
+            
+            body = json.dumps({
+                "success": False,
+                "message": "Internal server error",
+                "status_code": 500,
+                "request_id": request_id
+            }).encode("utf-8")
+            await send_wrapper({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+        finally:
+            if logger.isEnabledFor(logging.INFO):
+                process_time = time.perf_counter() - start_time
+                logger.info(
+                    f"Request completed | ID: {request_id} | Status: {status_code} | "
+                    f"Duration: {process_time:.4f}s"
+                )
+    
+    def _incoming_request_id(self, scope: Scope) -> Optional[str]:
+        """Get a well-formed X-Request-ID set upstream, so one ID follows the request across hops."""
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                return value.decode("latin-1") if _REQUEST_ID.fullmatch(value) else None
+        return None
+    
+    def _resolve_version(self, scope: Scope) -> Tuple[Scope, APIVersion]:
+        """Determine the API version from the path, then headers, then the default.
+        
+        Header-negotiated requests to unversioned paths are re-targeted at the
+        matching versioned route.
+        """
+        table = self.version_table
+        path = scope["path"]
+        
+        version = table.resolve_path(path)
+        if version:
+            return scope, version
+        
+        version = table.resolve_headers(scope["headers"])
+        if not version:
+            return scope, table.default_version
+        
+        target = table.dispatch_path(version, path)
+        if target:
+            scope = dict(scope, path=target, raw_path=target.encode("utf-8"))
+        return scope, version
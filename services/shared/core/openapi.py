@@ -0,0 +1,53 @@
+"""OpenAPI schema and documentation routes with conditional GET support."""
+
+from typing import Dict, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from starlette.responses import HTMLResponse, Response
+
+from .responses import EnvelopeResponse, compute_etag, conditional_response, json_dumps
+
+
+def add_openapi_routes(
+    app: FastAPI,
+    openapi_url: str = "/openapi.json",
+    docs_url: Optional[str] = "/docs",
+    redoc_url: Optional[str] = "/redoc",
+    cache_control: str = "public, max-age=300"
+) -> None:
+    """Serve the app's OpenAPI schema with a strong ETag, plus Swagger UI and ReDoc pages.
+    
+    Use with `FastAPI(openapi_url=None, docs_url=None, redoc_url=None)`. The
+    schema is deterministic, so it is serialized and hashed once on first use.
+    """
+    cached: Dict[str, Tuple[bytes, str]] = {}
+
+    async def openapi(request: Request) -> Response:
+        if "schema" not in cached:
+            body = json_dumps(app.openapi())
+            cached["schema"] = (body, compute_etag(body))
+
+        body, etag = cached["schema"]
+        return conditional_response(
+            Response(content=body, media_type=EnvelopeResponse.media_type),
+            request,
+            cache_control,
+            etag=etag
+        )
+
+    app.add_route(openapi_url, openapi, include_in_schema=False)
+
+    if docs_url:
+        async def swagger_ui(request: Request) -> HTMLResponse:
+            root_path = request.scope.get("root_path", "").rstrip("/")
+            return get_swagger_ui_html(openapi_url=root_path + openapi_url, title=f"{app.title} - Swagger UI")
+
+        app.add_route(docs_url, swagger_ui, include_in_schema=False)
+
+    if redoc_url:
+        async def redoc(request: Request) -> HTMLResponse:
+            root_path = request.scope.get("root_path", "").rstrip("/")
+            return get_redoc_html(openapi_url=root_path + openapi_url, title=f"{app.title} - ReDoc")
+
+        app.add_route(redoc_url, redoc, include_in_schema=False)
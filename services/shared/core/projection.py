@@ -0,0 +1,85 @@
+"""Sparse fieldsets: projecting response data down to requested fields."""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+from pydantic import BaseModel
+
+_MISSING = object()
+
+
+class FieldProjection:
+    """Compiled projection for one set of dotted field paths.
+
+    Paths select keys of dicts and fields of pydantic models; lists are
+    projected element by element. Selecting a field also selects everything
+    below it, so `user` wins over `user.email`. Unknown fields are ignored.
+    """
+
+    __slots__ = ("_children",)
+
+    def __init__(self, tree: Dict[str, Any]):
+        self._children: Dict[str, Optional[FieldProjection]] = {
+            name: None if subtree is None else FieldProjection(subtree)
+            for name, subtree in tree.items()
+        }
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str]) -> "FieldProjection":
+        """Build a projection from dotted paths such as `user.email`."""
+        tree: Dict[str, Any] = {}
+        for path in paths:
+            node = tree
+            *parents, leaf = path.split(".")
+            for part in parents:
+                node = node.setdefault(part, {})
+                if node is None:
+                    break
+            else:
+                node[leaf] = None
+        return cls(tree)
+
+    def apply(self, value: Any) -> Any:
+        """Project a value, reading only the selected fields."""
+        if isinstance(value, (list, tuple)):
+            return [self.apply(item) for item in value]
+
+        if isinstance(value, BaseModel):
+            model_fields = type(value).model_fields
+            get = lambda name: getattr(value, name) if name in model_fields else _MISSING
+        elif isinstance(value, dict):
+            get = lambda name: value.get(name, _MISSING)
+        else:
+            return value
+
+        projected = {}
+        for name, child in self._children.items():
+            field_value = get(name)
+            if field_value is _MISSING:
+                continue
+            projected[name] = field_value if child is None else child.apply(field_value)
+        return projected
+
+
+@lru_cache(maxsize=256)
+def compile_fields(fields: Optional[str]) -> Optional[FieldProjection]:
+    """Compile a `fields=` parameter (comma-separated dotted paths) into a projection.
+
+    Returns None when no fields are requested, meaning the data is sent whole.
+    """
+    if not fields:
+        return None
+
+    paths = sorted({
+        ".".join(part.strip() for part in path.split(".") if part.strip())
+        for path in fields.split(",")
+    } - {""})
+    if not paths:
+        return None
+    return _compile_paths(tuple(paths))
+
+
+@lru_cache(maxsize=256)
+def _compile_paths(paths: tuple) -> FieldProjection:
+    """Share one projection between parameters naming the same field set."""
+    return FieldProjection.from_paths(paths)
@@ -0,0 +1,139 @@
+"""Fast JSON serialization for the standard response envelope."""
+
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, status
+from pydantic import BaseModel
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+COMPACT_ENVELOPE = "envelope=compact"
+
+
+def _default(obj: Any) -> Any:
+    """Serialize values the JSON encoder does not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+if orjson is not None:
+    def json_dumps(content: Any) -> bytes:
+        """Serialize content to JSON bytes."""
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    json_loads = orjson.loads
+else:
+    def json_dumps(content: Any) -> bytes:
+        """Serialize content to JSON bytes."""
+        return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
+
+    json_loads = json.loads
+
+
+def build_envelope(
+    data: Any = None,
+    message: str = "Success",
+    status_code: int = status.HTTP_200_OK,
+    api_version: Optional[str] = None,
+    compact: bool = False
+) -> Dict[str, Any]:
+    """Build the standard success envelope, or its compact form."""
+    if compact:
+        envelope = {"success": True}
+    else:
+        envelope = {
+            "success": True,
+            "message": message,
+            "status_code": status_code
+        }
+        if api_version:
+            envelope["api_version"] = api_version
+
+    if data is not None:
+        envelope["data"] = data
+
+    return envelope
+
+
+def wants_compact_envelope(request: Optional[Request]) -> bool:
+    """Check whether the client negotiated the compact envelope via `Prefer`."""
+    if request is None:
+        return False
+    return COMPACT_ENVELOPE in request.headers.get("prefer", "")
+
+
+class EnvelopeResponse(Response):
+    """JSON response that serializes the envelope straight to bytes.
+
+    Returning this from a route bypasses response_model validation, so it
+    should only carry trusted service output.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def compute_etag(body: bytes) -> str:
+    """Compute a strong ETag from serialized body bytes."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(
+    response: Response,
+    request: Optional[Request],
+    cache_control: Optional[str] = None,
+    etag: Optional[str] = None
+) -> Response:
+    """Attach a strong ETag to a rendered response and answer 304 when the client has it.
+
+    The ETag is derived from the already-serialized body unless a precomputed
+    one is passed, so payloads are never serialized twice.
+    """
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+
+    if request is None or response.status_code != status.HTTP_200_OK:
+        return response
+
+    etag = etag or compute_etag(response.body)
+    response.headers["ETag"] = etag
+
+    if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match", ""), etag):
+        headers = {
+            name: response.headers[name]
+            for name in ("etag", "cache-control", "vary")
+            if name in response.headers
+        }
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return response
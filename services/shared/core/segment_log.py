@@ -0,0 +1,229 @@
+"""Append-only, length-prefixed binary log split into rotating segments."""
+
+import bisect
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+# Record header: payload length, payload CRC32, timestamp
+_HEADER = struct.Struct("<IId")
+# Index entry: timestamp, byte offset of the record
+_INDEX_ENTRY = struct.Struct("<dQ")
+
+SEGMENT_SUFFIX = ".log"
+INDEX_SUFFIX = ".idx"
+
+
+class Segment:
+    """One segment file with a sparse time index kept in memory.
+
+    Timestamps never decrease within a log, so the index is sorted and a
+    time range maps to a byte range with a binary search.
+    """
+
+    __slots__ = ("path", "size", "first_ts", "last_ts", "created", "_index_ts", "_index_offsets", "_since_indexed")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = 0
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.created = time.time()
+        self._index_ts: List[float] = []
+        self._index_offsets: List[int] = []
+        self._since_indexed = 0
+
+    def note(self, timestamp: float, offset: int, length: int, index_every: int) -> None:
+        """Account for a record appended at `offset`."""
+        if self.first_ts is None:
+            self.first_ts = timestamp
+        self.last_ts = timestamp
+        self.size = offset + length
+        if self._since_indexed == 0:
+            self._index_ts.append(timestamp)
+            self._index_offsets.append(offset)
+        self._since_indexed = (self._since_indexed + 1) % index_every
+
+    def start_offset(self, start: float) -> int:
+        """Offset of the last indexed record before `start`, where a scan from `start` begins."""
+        position = bisect.bisect_left(self._index_ts, start) - 1
+        return self._index_offsets[position] if position >= 0 else 0
+
+    def write_index(self) -> None:
+        with open(self.path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX, "wb") as index_file:
+            for entry in zip(self._index_ts, self._index_offsets):
+                index_file.write(_INDEX_ENTRY.pack(*entry))
+
+    def load_index(self) -> bool:
+        """Load a persisted index; returns False if there is none."""
+        try:
+            with open(self.path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX, "rb") as index_file:
+                data = index_file.read()
+        except FileNotFoundError:
+            return False
+        for timestamp, offset in _INDEX_ENTRY.iter_unpack(data[:len(data) - len(data) % _INDEX_ENTRY.size]):
+            self._index_ts.append(timestamp)
+            self._index_offsets.append(offset)
+        return True
+
+
+def _records(view, offset: int, end: int) -> Iterator[Tuple[float, bytes, int]]:
+    """Decode records from a buffer, stopping at a torn or corrupt tail."""
+    header_size = _HEADER.size
+    while offset + header_size <= end:
+        length, checksum, timestamp = _HEADER.unpack_from(view, offset)
+        body_start = offset + header_size
+        body_end = body_start + length
+        if body_end > end:
+            return
+        payload = view[body_start:body_end]
+        if zlib.crc32(payload) != checksum:
+            return
+        yield timestamp, payload, offset
+        offset = body_end
+
+
+class SegmentLog:
+    """Append-only log of timestamped binary records.
+
+    Records are length-prefixed and checksummed. The active segment is
+    rotated once it reaches `max_segment_bytes` or `max_segment_age`
+    seconds, and its sparse time index is written next to it; only the
+    newest `max_segments` segments are kept. Scans memory-map each
+    segment and start at the indexed offset nearest the requested time,
+    so a time-window query touches only the pages that hold it.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segment_age: float = 86400.0,
+        max_segments: Optional[int] = None,
+        index_every: int = 64
+    ):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.max_segments = max_segments
+        self.index_every = index_every
+        self.rotations = 0
+        self._lock = threading.Lock()
+        self._segments: List[Segment] = []
+        self._file = None
+        self._last_ts = float("-inf")
+        self._sequence = 0
+
+        os.makedirs(directory, exist_ok=True)
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(SEGMENT_SUFFIX):
+                self._segments.append(self._recover(os.path.join(directory, name)))
+                self._sequence = max(self._sequence, int(name[:-len(SEGMENT_SUFFIX)]) + 1)
+        if self._segments:
+            self._file = open(self._segments[-1].path, "ab")
+        else:
+            self._open_segment()
+
+    def _recover(self, path: str) -> Segment:
+        """Rebuild a segment's bounds (and index, if not persisted) by scanning it."""
+        segment = Segment(path)
+        has_index = segment.load_index()
+        size = os.path.getsize(path)
+        if size:
+            with open(path, "rb") as segment_file, mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for timestamp, payload, offset in _records(view, 0, size):
+                    length = _HEADER.size + len(payload)
+                    if has_index:
+                        segment.first_ts = timestamp if segment.first_ts is None else segment.first_ts
+                        segment.last_ts = timestamp
+                        segment.size = offset + length
+                    else:
+                        segment.note(timestamp, offset, length, self.index_every)
+        if segment.size < size:
+            # Drop a torn tail so later appends start on a record boundary
+            with open(path, "r+b") as segment_file:
+                segment_file.truncate(segment.size)
+        if segment.last_ts is not None:
+            segment.created = segment.first_ts
+            self._last_ts = max(self._last_ts, segment.last_ts)
+        return segment
+
+    def _open_segment(self) -> None:
+        path = os.path.join(self.directory, f"{self._sequence:012d}{SEGMENT_SUFFIX}")
+        self._sequence += 1
+        self._file = open(path, "ab")
+        self._segments.append(Segment(path))
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._segments[-1].write_index()
+        self._open_segment()
+        self.rotations += 1
+        while self.max_segments and len(self._segments) > self.max_segments:
+            expired = self._segments.pop(0)
+            for path in (expired.path, expired.path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def append_many(self, records: List[Tuple[float, bytes]]) -> None:
+        """Append (timestamp, payload) records; timestamps are clamped to never decrease."""
+        with self._lock:
+            for timestamp, payload in records:
+                active = self._segments[-1]
+                if active.size and (
+                    active.size >= self.max_segment_bytes
+                    or time.time() - active.created >= self.max_segment_age
+                ):
+                    self._rotate()
+                    active = self._segments[-1]
+
+                timestamp = max(timestamp, self._last_ts)
+                self._last_ts = timestamp
+                record = _HEADER.pack(len(payload), zlib.crc32(payload), timestamp) + payload
+                self._file.write(record)
+                active.note(timestamp, active.size, len(record), self.index_every)
+            self._file.flush()
+
+    def append(self, timestamp: float, payload: bytes) -> None:
+        self.append_many([(timestamp, payload)])
+
+    def scan(self, start: float = float("-inf"), end: float = float("inf")) -> Iterator[Tuple[float, bytes]]:
+        """Yield (timestamp, payload) for records with start <= timestamp <= end, oldest first."""
+        with self._lock:
+            segments = [
+                (segment, segment.size) for segment in self._segments
+                if segment.size and segment.first_ts <= end and segment.last_ts >= start
+            ]
+
+        for segment, size in segments:
+            try:
+                segment_file = open(segment.path, "rb")
+            except FileNotFoundError:
+                continue  # removed by retention since the snapshot
+            with segment_file, mmap.mmap(segment_file.fileno(), size, access=mmap.ACCESS_READ) as view:
+                for timestamp, payload, _offset in _records(view, segment.start_offset(start), size):
+                    if timestamp > end:
+                        break
+                    if timestamp >= start:
+                        yield timestamp, payload
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._segments[-1].write_index()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "segments": len(self._segments),
+                "bytes": sum(segment.size for segment in self._segments),
+                "rotations": self.rotations,
+            }
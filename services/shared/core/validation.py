@@ -0,0 +1,152 @@
+"""Compilation of BaseService validation rule dicts into reusable validators."""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .exceptions import ValidationException
+
+Check = Callable[[Any, List[str]], None]
+
+_CACHE_SIZE = 256
+_compiled_by_id: "OrderedDict[int, Tuple[Dict[str, Any], CompiledValidator]]" = OrderedDict()
+_compiled_by_key: "OrderedDict[Hashable, CompiledValidator]" = OrderedDict()
+
+
+class CompiledValidator:
+    """Validator specialized for one set of validation rules."""
+
+    __slots__ = ("_fields",)
+
+    def __init__(self, validation_rules: Dict[str, Dict[str, Any]]):
+        self._fields = tuple(
+            _compile_field(field, rules) for field, rules in validation_rules.items()
+        )
+
+    def errors(self, data: Dict[str, Any]) -> List[str]:
+        """Return every validation error for a record in a single pass."""
+        errors: List[str] = []
+        get = data.get
+
+        for field, required, required_message, checks in self._fields:
+            value = get(field)
+
+            if value is None or (required and value == ""):
+                if required:
+                    errors.append(required_message)
+                continue
+
+            for check in checks:
+                check(value, errors)
+
+        return errors
+
+    def validate(self, data: Dict[str, Any]) -> None:
+        """Validate a record, raising ValidationException on failure."""
+        errors = self.errors(data)
+        if errors:
+            raise ValidationException("Validation failed", details={"errors": errors})
+
+    def validate_batch(self, records: Iterable[Dict[str, Any]]) -> Dict[int, List[str]]:
+        """Validate many records, returning errors keyed by record index.
+
+        Records without errors are omitted from the result.
+        """
+        results = {}
+        errors = self.errors
+
+        for index, record in enumerate(records):
+            record_errors = errors(record)
+            if record_errors:
+                results[index] = record_errors
+
+        return results
+
+
+def _compile_field(field: str, rules: Dict[str, Any]) -> Tuple[str, bool, str, Tuple[Check, ...]]:
+    """Build the checks for a single field, skipping rules that are not set."""
+    checks: List[Check] = []
+
+    expected_type = rules.get("type")
+    if expected_type:
+        type_message = f"{field} must be of type {expected_type.__name__}"
+
+        def check_type(value: Any, errors: List[str]) -> None:
+            if not isinstance(value, expected_type):
+                errors.append(type_message)
+
+        checks.append(check_type)
+
+    min_length = rules.get("min_length")
+    if min_length:
+        min_message = f"{field} must be at least {min_length} characters long"
+
+        def check_min_length(value: Any, errors: List[str]) -> None:
+            if isinstance(value, str) and len(value) < min_length:
+                errors.append(min_message)
+
+        checks.append(check_min_length)
+
+    max_length = rules.get("max_length")
+    if max_length:
+        max_message = f"{field} must be at most {max_length} characters long"
+
+        def check_max_length(value: Any, errors: List[str]) -> None:
+            if isinstance(value, str) and len(value) > max_length:
+                errors.append(max_message)
+
+        checks.append(check_max_length)
+
+    custom_validator = rules.get("validator")
+    if custom_validator and callable(custom_validator):
+
+        def check_custom(value: Any, errors: List[str]) -> None:
+            try:
+                custom_validator(value)
+            except ValueError as e:
+                errors.append(f"{field}: {str(e)}")
+
+        checks.append(check_custom)
+
+    return field, bool(rules.get("required", False)), f"{field} is required", tuple(checks)
+
+
+def _rules_key(validation_rules: Dict[str, Dict[str, Any]]) -> Optional[Hashable]:
+    """Build a structural cache key for a rules dict, or None if it is unhashable."""
+    try:
+        key = tuple(
+            (field, tuple(sorted(rules.items())))
+            for field, rules in validation_rules.items()
+        )
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def compile_rules(validation_rules: Dict[str, Dict[str, Any]]) -> CompiledValidator:
+    """Return the compiled validator for a rules dict.
+
+    Validators are cached by the identity of the rules dict, falling back to
+    a structural key so equal rules built per call also share a validator.
+    Rules dicts must not be mutated after they have been compiled.
+    """
+    entry = _compiled_by_id.get(id(validation_rules))
+    if entry is not None and entry[0] is validation_rules:
+        _compiled_by_id.move_to_end(id(validation_rules))
+        return entry[1]
+
+    key = _rules_key(validation_rules)
+    validator = _compiled_by_key.get(key) if key is not None else None
+    if validator is None:
+        validator = CompiledValidator(validation_rules)
+        if key is not None:
+            _compiled_by_key[key] = validator
+            if len(_compiled_by_key) > _CACHE_SIZE:
+                _compiled_by_key.popitem(last=False)
+
+    # Holding a reference to the rules keeps their id from being reused
+    _compiled_by_id[id(validation_rules)] = (validation_rules, validator)
+    if len(_compiled_by_id) > _CACHE_SIZE:
+        _compiled_by_id.popitem(last=False)
+
+    return validator
@@ -2,13 +2,15 @@
 
 import re
 from enum import Enum
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Iterable, List, Pattern, Set, Tuple
 from fastapi import Request, HTTPException, status
 from fastapi.routing import APIRouter
+from starlette.routing import Route
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
 from .base_controller import BaseController
+from .responses import build_envelope
 
 
 class APIVersion(Enum):
@@ -23,10 +25,7 @@ class APIVersion(Enum):
         if not version_str.startswith('v'):
             version_str = f'v{version_str}'
         
-        for version in cls:
-            if version.value == version_str:
-                return version
-        return None
+        return cls._value2member_map_.get(version_str)
     
     @classmethod
     def get_latest(cls) -> 'APIVersion':
@@ -50,12 +49,16 @@ class VersionedController(BaseController):
         self, 
         data: Any = None, 
         message: str = "Success", 
-        status_code: int = status.HTTP_200_OK
+        status_code: int = status.HTTP_200_OK,
+        fields: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a standardized success response with version info."""
-        response = super().success_response(data, message, status_code)
-        response["api_version"] = self.version.value
-        return response
+        return build_envelope(
+            self.project_fields(data, fields),
+            message,
+            status_code,
+            api_version=self.version.value
+        )
     
     def error_response(
         self, 
@@ -102,28 +105,39 @@ class VersionNegotiationMiddleware(BaseHTTPMiddleware):
     
     def _extract_version_from_path(self, path: str) -> Optional[APIVersion]:
         """Extract API version from URL path."""
-        # Match patterns like /v1/api/, /v2/api/, etc.
-        match = re.search(r'/v(\d+)/', path)
-        if match:
-            version_num = match.group(1)
-            return APIVersion.from_string(f"v{version_num}")
-        return None
+        return extract_version_from_path(path)
     
     def _extract_version_from_headers(self, headers) -> Optional[APIVersion]:
         """Extract API version from request headers."""
-        # Check Accept header for version (e.g., application/vnd.api+json;version=1)
-        accept_header = headers.get("accept", "")
-        version_match = re.search(r'version=(\d+)', accept_header)
-        if version_match:
-            version_num = version_match.group(1)
-            return APIVersion.from_string(f"v{version_num}")
-        
-        # Check custom X-API-Version header
-        api_version_header = headers.get("x-api-version", "")
-        if api_version_header:
-            return APIVersion.from_string(api_version_header)
-        
-        return None
+        return extract_version_from_headers(
+            headers.get("accept", ""),
+            headers.get("x-api-version", "")
+        )
+
+
+def extract_version_from_path(path: str) -> Optional[APIVersion]:
+    """Extract API version from URL path."""
+    # Match patterns like /v1/api/, /v2/api/, etc.
+    match = re.search(r'/v(\d+)/', path)
+    if match:
+        version_num = match.group(1)
+        return APIVersion.from_string(f"v{version_num}")
+    return None
+
+
+def extract_version_from_headers(accept_header: str, api_version_header: str) -> Optional[APIVersion]:
+    """Extract API version from the Accept and X-API-Version header values."""
+    # Check Accept header for version (e.g., application/vnd.api+json;version=1)
+    version_match = re.search(r'version=(\d+)', accept_header)
+    if version_match:
+        version_num = version_match.group(1)
+        return APIVersion.from_string(f"v{version_num}")
+    
+    # Check custom X-API-Version header
+    if api_version_header:
+        return APIVersion.from_string(api_version_header)
+    
+    return None
 
 
 def get_api_version(request: Request) -> APIVersion:
@@ -141,22 +155,33 @@ def create_versioned_router(version: APIVersion, prefix: str = "", tags: list =
     if tags is None:
         tags = []
     
-    return APIRouter(
+    router = APIRouter(
         prefix=f"/{version.value}/api{prefix}",
         tags=tags
     )
+    # Read by VersionDispatchTable when compiling the version routes
+    router.api_version = version
+    return router
 
 
 class VersionDeprecationWarning:
     """Utility class for handling version deprecation warnings."""
     
+    @staticmethod
+    def deprecation_headers(version: APIVersion, sunset_date: str = None) -> Dict[str, str]:
+        """Get the deprecation warning headers for a version."""
+        headers = {
+            "Deprecation": "true",
+            "X-API-Deprecated-Version": version.value
+        }
+        if sunset_date:
+            headers["Sunset"] = sunset_date
+        return headers
+    
     @staticmethod
     def add_deprecation_header(response: Response, version: APIVersion, sunset_date: str = None):
         """Add deprecation warning headers to response."""
-        response.headers["Deprecation"] = "true"
-        response.headers["X-API-Deprecated-Version"] = version.value
-        if sunset_date:
-            response.headers["Sunset"] = sunset_date
+        response.headers.update(VersionDeprecationWarning.deprecation_headers(version, sunset_date))
     
     @staticmethod
     def is_deprecated(version: APIVersion) -> bool:
@@ -165,6 +190,109 @@ class VersionDeprecationWarning:
         return version == APIVersion.V1
 
 
+class VersionDispatchTable:
+    """Version resolution table compiled once at startup from versioned routers.
+    
+    Path versions are resolved from the leading path segment and header
+    versions from precomputed header values, so no regex runs per request.
+    Requests to unversioned `/api/...` paths that negotiate a version through
+    headers are dispatched to the matching versioned router.
+    """
+    
+    def __init__(
+        self, 
+        routers: Iterable[APIRouter] = (), 
+        default_version: APIVersion = APIVersion.get_default(),
+        sunset_dates: Optional[Dict[APIVersion, str]] = None
+    ):
+        self.default_version = default_version
+        sunset_dates = sunset_dates or {}
+        
+        # Leading path segment (e.g. "v1") -> version
+        self._path_segments: Dict[str, APIVersion] = {v.value: v for v in APIVersion}
+        
+        # Raw header value (e.g. b"v2", b"2", b"V2") -> version
+        self._header_values: Dict[bytes, APIVersion] = {}
+        for version in APIVersion:
+            number = version.value[1:].encode("latin-1")
+            for value in (version.value.encode("latin-1"), version.value.upper().encode("latin-1"), number):
+                self._header_values[value] = version
+        
+        # Versioned routes, split into exact paths and parameterized patterns
+        self._static_paths: Dict[APIVersion, Set[str]] = {v: set() for v in APIVersion}
+        self._dynamic_paths: Dict[APIVersion, List[Pattern]] = {v: [] for v in APIVersion}
+        for router in routers:
+            version = getattr(router, "api_version", None)
+            if version is None:
+                continue
+            for route in router.routes:
+                if not isinstance(route, Route):
+                    continue
+                if route.param_convertors:
+                    self._dynamic_paths[version].append(route.path_regex)
+                else:
+                    self._static_paths[version].add(route.path)
+        
+        # Response headers per version; a version is deprecated only once a newer one is served
+        versions = list(APIVersion)
+        served = [version for version in versions if self._static_paths[version] or self._dynamic_paths[version]]
+        self._response_headers: Dict[APIVersion, List[Tuple[bytes, bytes]]] = {}
+        for version in versions:
+            headers = [(b"x-api-version", version.value.encode("latin-1"))]
+            if any(versions.index(newer) > versions.index(version) for newer in served):
+                deprecation = VersionDeprecationWarning.deprecation_headers(version, sunset_dates.get(version))
+                headers.extend(
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in deprecation.items()
+                )
+            self._response_headers[version] = headers
+    
+    def resolve_path(self, path: str) -> Optional[APIVersion]:
+        """Resolve the version from the leading path segment."""
+        end = path.find("/", 1)
+        if end == -1:
+            return None
+        return self._path_segments.get(path[1:end])
+    
+    def resolve_headers(self, raw_headers: Iterable[Tuple[bytes, bytes]]) -> Optional[APIVersion]:
+        """Resolve the version from the Accept or X-API-Version header."""
+        accept_version = None
+        header_version = None
+        
+        for name, value in raw_headers:
+            if name == b"accept":
+                start = value.find(b"version=")
+                if start != -1:
+                    start += 8
+                    end = start
+                    while end < len(value) and 48 <= value[end] <= 57:
+                        end += 1
+                    accept_version = self._header_values.get(value[start:end])
+            elif name == b"x-api-version":
+                header_version = self._header_values.get(value)
+                if header_version is None:
+                    header_version = APIVersion.from_string(value.decode("latin-1"))
+        
+        return accept_version or header_version
+    
+    def dispatch_path(self, version: APIVersion, path: str) -> Optional[str]:
+        """Get the versioned route path for an unversioned `/api/...` path, if one exists."""
+        if not path.startswith("/api"):
+            return None
+        
+        target = f"/{version.value}{path}"
+        if target in self._static_paths[version]:
+            return target
+        for pattern in self._dynamic_paths[version]:
+            if pattern.match(target):
+                return target
+        return None
+    
+    def response_headers(self, version: APIVersion) -> List[Tuple[bytes, bytes]]:
+        """Get the precomputed version and deprecation headers for a version."""
+        return self._response_headers[version]
+
+
 def validate_version_compatibility(required_version: APIVersion, request_version: APIVersion) -> bool:
     """Validate if the request version is compatible with required version."""
     # For now, exact match is required
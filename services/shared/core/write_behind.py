@@ -0,0 +1,212 @@
+"""Write-behind queue that batches side effects off the request path."""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastapi import status
+
+from .exceptions import ServiceException
+
+logger = logging.getLogger(__name__)
+
+BatchHandler = Callable[[List[Any]], Awaitable[None]]
+
+
+class WriteBehindQueue:
+    """Collect writes and apply them in batches from a background task.
+
+    Each write has a kind, handled by one batch handler. Writes submitted
+    with a key replace a pending write of the same kind and key, so
+    repeated updates of one record are applied once. A batch is flushed
+    when `max_batch` writes are pending or the oldest has waited
+    `flush_interval` seconds. Once `max_pending` writes are queued,
+    submitters wait for a flush for up to `enqueue_timeout` seconds and
+    then get a 503; `offer()` never waits and instead drops the write and
+    counts it. `stop()` drains everything still pending.
+
+    Handlers are best effort: a failing batch is logged and dropped.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, BatchHandler],
+        max_batch: int = 100,
+        flush_interval: float = 0.5,
+        max_pending: int = 10000,
+        enqueue_timeout: float = 1.0
+    ):
+        self.handlers = handlers
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.enqueue_timeout = enqueue_timeout
+        self.submitted = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.batches = 0
+        self.failed = 0
+        self.rejected = 0
+        self.backpressure_waits = 0
+        self.dropped = 0
+        self._pending: "OrderedDict[Tuple[str, Hashable], Any]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._oldest = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._wakeup: Optional[asyncio.Future] = None
+        self._space_waiters: List[asyncio.Future] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, kind: str, value: Any, key: Optional[Hashable] = None) -> None:
+        """Queue a write, replacing any pending write of the same kind and key."""
+        entry_key = self._entry_key(kind, key)
+        if entry_key not in self._pending and len(self._pending) >= self.max_pending:
+            await self._wait_for_space()
+        self._put(entry_key, value)
+
+    def offer(self, kind: str, value: Any, key: Optional[Hashable] = None) -> bool:
+        """Queue a write without waiting; returns False if it was dropped because the queue is full."""
+        entry_key = self._entry_key(kind, key)
+        if entry_key not in self._pending and len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            self._ensure_flusher()
+            self._wake()
+            return False
+        self._put(entry_key, value)
+        return True
+
+    def _entry_key(self, kind: str, key: Optional[Hashable]) -> Tuple[str, Hashable]:
+        if kind not in self.handlers:
+            raise ValueError(f"No handler for write kind: {kind}")
+        return (kind, key if key is not None else ("seq", next(self._sequence)))
+
+    def _put(self, entry_key: Tuple[str, Hashable], value: Any) -> None:
+        self.submitted += 1
+        if entry_key in self._pending:
+            self._pending[entry_key] = value
+            self.coalesced += 1
+            return
+
+        if not self._pending:
+            self._oldest = time.monotonic()
+        self._pending[entry_key] = value
+        self._ensure_flusher()
+        if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+            self._wake()
+
+    async def _wait_for_space(self) -> None:
+        self.backpressure_waits += 1
+        deadline = time.monotonic() + self.enqueue_timeout
+        loop = asyncio.get_running_loop()
+        while len(self._pending) >= self.max_pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.rejected += 1
+                raise ServiceException("Write queue is full", status.HTTP_503_SERVICE_UNAVAILABLE)
+            self._ensure_flusher()
+            self._wake()
+            waiter = loop.create_future()
+            self._space_waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                if waiter in self._space_waiters:
+                    self._space_waiters.remove(waiter)
+
+    def _ensure_flusher(self) -> None:
+        # The flusher belongs to the loop that submits; restart it if that loop changed
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wakeup = None
+            self._task = loop.create_task(self._run())
+
+    def _wake(self) -> None:
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        self._wakeup = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self._wakeup, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._wakeup = None
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                if self._closing:
+                    return
+                await self._wait(None)
+                continue
+            while len(self._pending) < self.max_batch and not self._closing:
+                remaining = self._oldest + self.flush_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                await self._wait(remaining)
+            await self._flush_batch()
+
+    async def _flush_batch(self) -> int:
+        count = min(len(self._pending), self.max_batch)
+        batches: Dict[str, List[Any]] = {}
+        for _ in range(count):
+            (kind, _key), value = self._pending.popitem(last=False)
+            batches.setdefault(kind, []).append(value)
+        self._oldest = time.monotonic()
+
+        # Writers blocked on a full queue can continue while the batch is applied
+        waiters, self._space_waiters = self._space_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        for kind, values in batches.items():
+            try:
+                await self.handlers[kind](values)
+                self.flushed += len(values)
+            except Exception as e:
+                self.failed += len(values)
+                logger.error(f"Write-behind batch of {len(values)} {kind} writes failed: {e}", exc_info=True)
+            self.batches += 1
+        return count
+
+    async def flush(self) -> int:
+        """Apply every pending write now."""
+        total = 0
+        while self._pending:
+            total += await self._flush_batch()
+        return total
+
+    async def stop(self) -> None:
+        """Stop the background flusher and drain the pending writes."""
+        self._closing = True
+        task, self._task = self._task, None
+        try:
+            if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+                self._wake()
+                await task
+            await self.flush()
+        finally:
+            self._closing = False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "backpressure_waits": self.backpressure_waits,
+            "dropped": self.dropped,
+        }
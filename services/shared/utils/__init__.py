@@ -3,6 +3,7 @@
 from .logger import setup_logger, get_logger
 from .config import Config
 from .helpers import generate_id, hash_password, verify_password, validate_email
+from .password_pool import PasswordHashingPool, hash_password_async, verify_password_async
 
 __all__ = [
     "setup_logger",
@@ -11,5 +12,8 @@ __all__ = [
     "generate_id",
     "hash_password",
     "verify_password",
+    "PasswordHashingPool",
+    "hash_password_async",
+    "verify_password_async",
     "validate_email",
 ]
@@ -22,11 +22,26 @@ class Config:
             "DATABASE_NAME": os.getenv("DATABASE_NAME", "app_db"),
             "DATABASE_USER": os.getenv("DATABASE_USER", "postgres"),
             "DATABASE_PASSWORD": os.getenv("DATABASE_PASSWORD", ""),
+            "DATABASE_POOL_SIZE": int(os.getenv("DATABASE_POOL_SIZE", "10")),
+            "DATABASE_POOL_TIMEOUT": float(os.getenv("DATABASE_POOL_TIMEOUT", "5.0")),
             
             # JWT configuration
             "JWT_SECRET_KEY": os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production"),
             "ACCESS_TOKEN_EXPIRE_MINUTES": int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")),
             "REFRESH_TOKEN_EXPIRE_DAYS": int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")),
+            "JWT_VERIFY_CACHE_SIZE": int(os.getenv("JWT_VERIFY_CACHE_SIZE", "0")),
+            "JWT_ALGORITHM": os.getenv("JWT_ALGORITHM", "HS256"),
+            "JWT_COMPACT_CLAIMS": os.getenv("JWT_COMPACT_CLAIMS", "false").lower() == "true",
+            "TOKEN_STORE_PATH": os.getenv("TOKEN_STORE_PATH"),
+            "REVOCATION_SYNC_SECONDS": float(os.getenv("REVOCATION_SYNC_SECONDS", "1.0")),
+            
+            # Identity headers forwarded by the gateway
+            "INTERNAL_IDENTITY_KEY": os.getenv("INTERNAL_IDENTITY_KEY"),
+            "IDENTITY_TTL_SECONDS": float(os.getenv("IDENTITY_TTL_SECONDS", "30")),
+            "IDENTITY_MAX_RATE": float(os.getenv("IDENTITY_MAX_RATE", "3000")),
+            "JWT_PRIVATE_KEY_FILES": os.getenv("JWT_PRIVATE_KEY_FILES", ""),
+            "JWT_JWKS_URL": os.getenv("JWT_JWKS_URL"),
+            "JWT_JWKS_REFRESH_SECONDS": float(os.getenv("JWT_JWKS_REFRESH_SECONDS", "300")),
             
             # Application configuration
             "APP_NAME": os.getenv("APP_NAME", "Microservices App"),
@@ -34,6 +49,51 @@ class Config:
             "DEBUG": os.getenv("DEBUG", "false").lower() == "true",
             "LOG_LEVEL": os.getenv("LOG_LEVEL", "INFO"),
             
+            # Admission control
+            "ADMISSION_MAX_CONCURRENCY": int(os.getenv("ADMISSION_MAX_CONCURRENCY", "100")),
+            "ADMISSION_MAX_QUEUE": int(os.getenv("ADMISSION_MAX_QUEUE", "200")),
+            "ADMISSION_QUEUE_TIMEOUT": float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5.0")),
+            "ADMISSION_RETRY_AFTER": int(os.getenv("ADMISSION_RETRY_AFTER", "1")),
+            "LOGIN_MAX_CONCURRENCY": int(os.getenv("LOGIN_MAX_CONCURRENCY", str(os.cpu_count() or 1))),
+            "LOGIN_MAX_QUEUE": int(os.getenv("LOGIN_MAX_QUEUE", "32")),
+            
+            # Login throttling; a limit of 0 disables that scope
+            "LOGIN_THROTTLE_WINDOW_SECONDS": float(os.getenv("LOGIN_THROTTLE_WINDOW_SECONDS", "300")),
+            "LOGIN_THROTTLE_EMAIL_LIMIT": int(os.getenv("LOGIN_THROTTLE_EMAIL_LIMIT", "10")),
+            "LOGIN_THROTTLE_IP_LIMIT": int(os.getenv("LOGIN_THROTTLE_IP_LIMIT", "100")),
+            "LOGIN_THROTTLE_SUBNET_LIMIT": int(os.getenv("LOGIN_THROTTLE_SUBNET_LIMIT", "500")),
+            "LOGIN_THROTTLE_BUCKETS": int(os.getenv("LOGIN_THROTTLE_BUCKETS", "10")),
+            "LOGIN_THROTTLE_SKETCH_WIDTH": int(os.getenv("LOGIN_THROTTLE_SKETCH_WIDTH", "4096")),
+            # Reverse proxies whose X-Forwarded-For / X-Real-IP are believed, as CIDRs
+            "TRUSTED_PROXIES": os.getenv("TRUSTED_PROXIES", ""),
+            
+            # Password hashing pool
+            "PASSWORD_POOL_KIND": os.getenv("PASSWORD_POOL_KIND", "thread"),
+            "PASSWORD_POOL_WORKERS": int(os.getenv("PASSWORD_POOL_WORKERS", str(os.cpu_count() or 1))),
+            "PASSWORD_POOL_MAX_QUEUE": int(os.getenv("PASSWORD_POOL_MAX_QUEUE", "32")),
+            "PASSWORD_HASH_TIMEOUT": float(os.getenv("PASSWORD_HASH_TIMEOUT", "5.0")),
+            "PASSWORD_HASHER": os.getenv("PASSWORD_HASHER", "bcrypt"),
+            "PASSWORD_HASH_ROUNDS": int(os.getenv("PASSWORD_HASH_ROUNDS")) if os.getenv("PASSWORD_HASH_ROUNDS") else None,
+            "PASSWORD_HASH_TARGET_MS": float(os.getenv("PASSWORD_HASH_TARGET_MS", "0")),
+            
+            # Idempotency keys
+            "IDEMPOTENCY_TTL_SECONDS": float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "3600")),
+            "IDEMPOTENCY_MAX_ENTRIES": int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000")),
+            
+            # Write-behind batching of login side effects
+            "WRITE_BEHIND_MAX_BATCH": int(os.getenv("WRITE_BEHIND_MAX_BATCH", "100")),
+            "WRITE_BEHIND_FLUSH_INTERVAL": float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "0.5")),
+            "WRITE_BEHIND_MAX_PENDING": int(os.getenv("WRITE_BEHIND_MAX_PENDING", "10000")),
+            
+            # Login attempt audit log
+            "LOGIN_AUDIT_DIR": os.getenv("LOGIN_AUDIT_DIR"),
+            "LOGIN_AUDIT_SEGMENT_BYTES": int(os.getenv("LOGIN_AUDIT_SEGMENT_BYTES", str(64 * 1024 * 1024))),
+            "LOGIN_AUDIT_SEGMENT_SECONDS": float(os.getenv("LOGIN_AUDIT_SEGMENT_SECONDS", "86400")),
+            "LOGIN_AUDIT_MAX_SEGMENTS": int(os.getenv("LOGIN_AUDIT_MAX_SEGMENTS", "90")),
+            
+            # Response compression
+            "COMPRESSION_MIN_SIZE": int(os.getenv("COMPRESSION_MIN_SIZE", "500")),
+            
             # Azure configuration
             "AZURE_STORAGE_CONNECTION_STRING": os.getenv("AZURE_STORAGE_CONNECTION_STRING"),
             "AZURE_SERVICE_BUS_CONNECTION_STRING": os.getenv("AZURE_SERVICE_BUS_CONNECTION_STRING"),
@@ -0,0 +1,181 @@
+"""Password hashers with self-describing parameters and latency calibration."""
+
+import logging
+import time
+from typing import Callable, Optional
+
+import bcrypt
+
+from .config import config
+
+try:
+    import argon2
+except ImportError:  # pragma: no cover - argon2-cffi is an optional dependency
+    argon2 = None
+
+logger = logging.getLogger(__name__)
+
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+ARGON2_PREFIX = "$argon2"
+
+
+def _measure(func: Callable[[], object], repeat: int = 3) -> float:
+    """Best-of-n wall time of a call, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class BcryptHasher:
+    """bcrypt with a fixed cost; the cost is stored in every hash it produces."""
+
+    name = "bcrypt"
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.rounds)).decode("utf-8")
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether a hash was made by another algorithm or with a lower cost.
+
+        Hashes made at a higher cost are kept: rehashing them would weaken them.
+        """
+        if not hashed_password.startswith(BCRYPT_PREFIXES):
+            return True
+        try:
+            return int(hashed_password[4:6]) < self.rounds
+        except ValueError:
+            return True
+
+    @classmethod
+    def calibrate(cls, target_ms: float, min_rounds: int = 12, max_rounds: int = 16, probe_rounds: int = 8) -> "BcryptHasher":
+        """Pick the highest cost whose verification stays within `target_ms` on this machine.
+
+        Each extra round doubles the work, so one measurement at a cheap
+        probe cost predicts every other cost.
+        """
+        probe = cls(probe_rounds)
+        hashed = probe.hash("calibration")
+        seconds = _measure(lambda: probe.verify("calibration", hashed))
+
+        rounds = min_rounds
+        while rounds < max_rounds and seconds * 2 ** (rounds + 1 - probe_rounds) * 1000 <= target_ms:
+            rounds += 1
+        return cls(rounds)
+
+    def __repr__(self) -> str:
+        return f"BcryptHasher(rounds={self.rounds})"
+
+
+class Argon2Hasher:
+    """argon2id via argon2-cffi; parameters are stored in every hash it produces."""
+
+    name = "argon2"
+
+    def __init__(self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4):
+        if argon2 is None:
+            raise ImportError("argon2-cffi is required for PASSWORD_HASHER=argon2")
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+
+    @property
+    def _hasher(self):
+        # Built per call so the hasher stays picklable for process pools
+        return argon2.PasswordHasher(
+            time_cost=self.time_cost,
+            memory_cost=self.memory_cost,
+            parallelism=self.parallelism
+        )
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except (argon2.exceptions.VerificationError, argon2.exceptions.InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether a hash is not argon2id or has a parameter below the policy.
+
+        Hashes made with higher parameters are kept: rehashing them would weaken them.
+        """
+        if not hashed_password.startswith(ARGON2_PREFIX):
+            return True
+        try:
+            stored = argon2.extract_parameters(hashed_password)
+        except argon2.exceptions.InvalidHashError:
+            return True
+        return (
+            stored.type is not argon2.Type.ID
+            or stored.time_cost < self.time_cost
+            or stored.memory_cost < self.memory_cost
+            or stored.parallelism < self.parallelism
+        )
+
+    @classmethod
+    def calibrate(
+        cls,
+        target_ms: float,
+        min_time_cost: int = 3,
+        memory_cost: int = 65536,
+        parallelism: int = 4,
+        max_time_cost: int = 20
+    ) -> "Argon2Hasher":
+        """Pick the highest time cost whose verification stays within `target_ms` at a fixed memory cost.
+
+        Time is roughly linear in the time cost, so it is extrapolated from
+        a single pass. The result never drops below `min_time_cost`.
+        """
+        probe = cls(1, memory_cost, parallelism)
+        hashed = probe.hash("calibration")
+        seconds = _measure(lambda: probe.verify("calibration", hashed))
+        time_cost = int(target_ms / (seconds * 1000)) if seconds > 0 else max_time_cost
+        return cls(max(min_time_cost, min(time_cost, max_time_cost)), memory_cost, parallelism)
+
+    def __repr__(self) -> str:
+        return f"Argon2Hasher(time_cost={self.time_cost}, memory_cost={self.memory_cost}, parallelism={self.parallelism})"
+
+
+HASHERS = {"bcrypt": BcryptHasher, "argon2": Argon2Hasher}
+
+
+def check_password(password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash made by any supported hasher, whatever its parameters."""
+    if hashed_password.startswith(ARGON2_PREFIX):
+        return Argon2Hasher().verify(password, hashed_password)
+    return BcryptHasher().verify(password, hashed_password)
+
+
+def hasher_from_environment(calibrate: bool = True):
+    """Build the hashing policy from the PASSWORD_HASH* settings.
+
+    With PASSWORD_HASH_TARGET_MS set and `calibrate` true, the cost is
+    calibrated on this machine to hit that verification latency, which
+    blocks for a few hashes; otherwise PASSWORD_HASH_ROUNDS (bcrypt cost
+    or argon2 time cost) is used.
+    """
+    name = config.get("PASSWORD_HASHER")
+    if name not in HASHERS:
+        raise ValueError(f"Unsupported PASSWORD_HASHER: {name}")
+
+    target_ms = config.get("PASSWORD_HASH_TARGET_MS")
+    if calibrate and target_ms > 0:
+        hasher = HASHERS[name].calibrate(target_ms)
+        logger.info(f"Calibrated password hashing to {hasher!r} for a {target_ms:.0f}ms target")
+        return hasher
+
+    rounds: Optional[int] = config.get("PASSWORD_HASH_ROUNDS")
+    if rounds is None:
+        return HASHERS[name]()
+    return BcryptHasher(rounds) if name == "bcrypt" else Argon2Hasher(time_cost=rounds)
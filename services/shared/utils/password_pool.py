@@ -0,0 +1,139 @@
+"""Bounded executor for running password hashing off the event loop."""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import status
+
+from ..core.exceptions import ServiceException
+from .config import config
+from .hashers import check_password, hasher_from_environment
+
+
+class PasswordHashingPool:
+    """Run password hashing on a thread or process pool with a bounded backlog and per-call timeout.
+
+    Calls beyond `max_workers + max_queue` outstanding jobs are rejected
+    with a 503 instead of queueing without bound. A timed-out call stops
+    waiting but its job keeps its slot until the worker finishes, so the
+    backlog always reflects the work the pool really has.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: int = 32,
+        timeout: float = 5.0,
+        processes: bool = False,
+        hasher: Any = None
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.processes = processes
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._executor: Optional[Executor] = None
+        self._hasher = hasher
+        self._started = hasher is not None
+
+    @classmethod
+    def from_environment(cls) -> "PasswordHashingPool":
+        """Build a pool from the PASSWORD_POOL_* settings."""
+        return cls(
+            max_workers=config.get("PASSWORD_POOL_WORKERS"),
+            max_queue=config.get("PASSWORD_POOL_MAX_QUEUE"),
+            timeout=config.get("PASSWORD_HASH_TIMEOUT"),
+            processes=config.get("PASSWORD_POOL_KIND") == "process"
+        )
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            executor_class = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+            self._executor = executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    @property
+    def hasher(self) -> Any:
+        """The current hashing policy; uncalibrated until `start()` has run."""
+        if self._hasher is None:
+            self._hasher = hasher_from_environment(calibrate=False)
+        return self._hasher
+
+    async def start(self) -> None:
+        """Settle the hashing policy before serving, calibrating on a worker thread when configured to."""
+        if not self._started:
+            self._started = True
+            self._hasher = await asyncio.to_thread(hasher_from_environment)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether a stored hash was made with parameters other than the current policy."""
+        return self.hasher.needs_rehash(hashed_password)
+
+    def _release(self, _future: Any) -> None:
+        self.pending -= 1
+        self.completed += 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a picklable function on the pool."""
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ServiceException("Password hashing is saturated", status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        future = asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ServiceException("Password hashing timed out", status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    async def hash(self, password: str) -> str:
+        return await self.run(self.hasher.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self.run(check_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backlog and saturation counters."""
+        return {
+            "kind": "process" if self.processes else "thread",
+            "hasher": repr(self._hasher) if self._hasher is not None else None,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self.pending, self.max_workers),
+            "queue_depth": max(self.pending - self.max_workers, 0),
+            "saturation": round(self.pending / (self.max_workers + self.max_queue), 3),
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+# Shared by every service in the process; the executor starts on first use
+password_pool = PasswordHashingPool.from_environment()
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the shared pool."""
+    return await password_pool.hash(password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash on the shared pool."""
+    return await password_pool.verify(password, hashed_password)